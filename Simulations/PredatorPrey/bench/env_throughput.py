@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Throughput of ``PredatorPreyVecEnv`` under random actions (agent-steps/min).
+
+Counts every fish slot of every tank per ``step`` (dead slots included, as a
+trainer would batch them), and the time one ``observe`` call takes on its own.
+
+    python bench/env_throughput.py
+    python bench/env_throughput.py --envs 16 64 256 --seconds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from env import PredatorPreyVecEnv, observe  # noqa: E402
+
+
+def measure(num_envs: int, seconds: float, seed: int = 0) -> dict:
+    env = PredatorPreyVecEnv(num_envs=num_envs, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    env.step(rng.uniform(-1.0, 1.0, env.action_shape))     # warm-up
+
+    steps, episodes, t0 = 0, 0, time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        *_, info = env.step(rng.uniform(-1.0, 1.0, env.action_shape))
+        steps += 1
+        episodes += len(info["episodes"])
+    elapsed = time.perf_counter() - t0
+
+    t1 = time.perf_counter()
+    for _ in range(10):
+        observe(env.world, env.k_neighbours)
+    obs_s = (time.perf_counter() - t1) / 10
+    return {
+        "agent_steps_per_min": steps * num_envs * env.n_agents / elapsed * 60.0,
+        "ms_per_step": 1000.0 * elapsed / steps,
+        "observe_ms": 1000.0 * obs_s,
+        "episodes": episodes,
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--envs", type=int, nargs="+", default=[16, 64, 256])
+    p.add_argument("--seconds", type=float, default=10.0)
+    args = p.parse_args()
+
+    print(f"{'envs':>6} {'agent-steps/min':>16} {'ms/step':>9} {'observe ms':>11}")
+    for k in args.envs:
+        r = measure(k, args.seconds)
+        print(f"{k:>6} {r['agent_steps_per_min'] / 1e6:>14.2f} M "
+              f"{r['ms_per_step']:>9.1f} {r['observe_ms']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: memory allocated and time spent per integrator call.
+
+Runs only the motion update (``World._advance`` for the fish and the sharks)
+on fixed random actions, once per kernel and fish count.  The allocation
+figure is the ``tracemalloc`` peak above the baseline during one step, i.e.
+the temporaries alive at once.  NumPy reports its array buffers to
+``tracemalloc``.  The fused kernels should sit near zero once their scratch
+buffers exist.
+
+    python bench/integrate_alloc.py
+    python bench/integrate_alloc.py --fish 200 5000 20000 --steps 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+import kernels  # noqa: E402
+from config import SimConfig  # noqa: E402
+from physics import World  # noqa: E402
+
+
+def measure(kernel: str, n_fish: int, steps: int, seed: int = 0) -> dict:
+    """Per-step peak allocation (bytes) and wall time (s) for one kernel."""
+    cfg = dataclasses.replace(SimConfig(), n_fish=n_fish, seed=seed)
+    rng = np.random.default_rng(seed)
+    w = World(cfg, rng, kernel)
+    fish_accel = rng.normal(0.0, 40.0, (n_fish, 2))
+    fish_lunge = rng.random(n_fish) < 0.05
+    shark_accel = rng.normal(0.0, 40.0, (cfg.n_sharks, 2))
+    shark_lunge = np.zeros(cfg.n_sharks, dtype=bool)
+
+    def step():
+        w._advance("fish", w.pos, w.vel, w.alive, fish_accel, fish_lunge,
+                   w._lunge_timer, w._lunge_cd)
+        w._advance("shark", w.spos, w.svel, w._sharks_alive, shark_accel, shark_lunge,
+                   w._s_lunge_timer, w._s_lunge_cd)
+
+    for _ in range(3):  # scratch buffers, Numba compile / cache load
+        step()
+
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(steps, 50)):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        step()
+    return {"peak_bytes": float(np.median(peaks)),
+            "step_s": (time.perf_counter() - t0) / steps}
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--fish", type=int, nargs="+", default=[160, 2000, 20000])
+    p.add_argument("--steps", type=int, default=200)
+    p.add_argument("--kernels", nargs="+",
+                   default=["reference", *kernels.KERNELS])
+    args = p.parse_args()
+
+    print(f"{'kernel':>10} {'fish':>7} {'alloc/step':>12} {'us/step':>10}")
+    for n in args.fish:
+        for k in args.kernels:
+            r = measure(k, n, args.steps)
+            print(f"{k:>10} {n:>7} {r['peak_bytes'] / 1024:>9.1f} KB "
+                  f"{r['step_s'] * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Check that every optimised path still reproduces the seed-5 reference run.
+
+The calibrated demo (``SimConfig(seed=5)``, dense neighbours, reference
+integrator) has a known survivors curve.  It is stored in
+``reference_seed5.json`` as ``(step, alive)`` change points.  This script
+re-runs the episode through:
+
+* each integrator kernel (``reference`` plus everything in ``kernels.KERNELS``);
+* a one-tank ``BatchSimulation``.
+
+Each run must match the stored curve exactly, step for step.  A batch of tanks
+with mixed radii under the ``grid`` engine must also end, tank by tank, in
+exactly the state of the same configs run one at a time.
+
+The ``grid`` neighbour engine only agrees with ``dense`` to floating-point
+round-off, so a whole episode can drift apart.  It is checked the way that
+claim is meant instead: both engines must give the same neighbour sums,
+within ``--tol``, at every ``--every``-th state of the reference trajectory.
+
+    python bench/reference.py            # exit status 1 on any mismatch
+    python bench/reference.py --update   # re-record the reference curve
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import numpy as np  # noqa: E402
+
+import kernels  # noqa: E402
+from config import SimConfig  # noqa: E402
+from neighbours import dense_flock_sums, grid_flock_sums  # noqa: E402
+from sim import BatchSimulation, Simulation  # noqa: E402
+
+REFERENCE = os.path.join(HERE, "reference_seed5.json")
+
+
+def change_points(alive) -> list[list[int]]:
+    """``[[step, alive], ...]`` at step 0 and wherever the count changes."""
+    alive = np.asarray(alive)
+    steps = np.concatenate([[0], np.flatnonzero(np.diff(alive)) + 1])
+    return [[int(s), int(alive[s])] for s in steps]
+
+
+def run_curve(kernel: str) -> tuple[list[int], Simulation]:
+    sim = Simulation(SimConfig(seed=5))
+    sim.world.kernel = kernel
+    sim.run()
+    return sim.alive_history, sim
+
+
+def batch_curve() -> list[int]:
+    bs = BatchSimulation([SimConfig(seed=5)])
+    bs.run()
+    return bs.alive_history[0]
+
+
+def mixed_grid_batch() -> list[int]:
+    """Tanks of a mixed-radii ``grid`` batch whose episode differs from a lone
+    ``Simulation`` of the same config (empty when they all match)."""
+    base = SimConfig(seed=5, neighbour_engine="grid")
+    cfgs = [dataclasses.replace(base, seed=5 + k,
+                                perception_radius=base.perception_radius * per,
+                                separation_radius=base.separation_radius * sep)
+            for k, (per, sep) in enumerate([(1.0, 1.0), (0.6, 1.3), (1.5, 0.7), (0.8, 0.5)])]
+    bs = BatchSimulation(cfgs)
+    bs.run()
+    bad = []
+    for k, cfg in enumerate(cfgs):
+        sim = Simulation(cfg)
+        sim.run()
+        if (bs.alive_history[k] != sim.alive_history
+                or not np.array_equal(bs.world.pos[k], sim.world.pos)):
+            bad.append(k)
+    return bad
+
+
+def grid_vs_dense(every: int) -> float:
+    """Largest relative |grid - dense| neighbour sum of any live fish along the
+    reference trajectory."""
+    sim = Simulation(SimConfig(seed=5))
+    sim.world.kernel = "reference"
+    cfg, w, worst = sim.cfg, sim.world, 0.0
+    while True:
+        if w.step_idx % every == 0:
+            args = (w.pos, w.vel, w.alive, cfg.separation_radius,
+                    cfg.perception_radius, cfg.size)
+            for a, b in zip(dense_flock_sums(*args), grid_flock_sums(*args)):
+                a, b = a[w.alive], b[w.alive]     # dead fish's sums are never used
+                scale = np.maximum(1.0, np.abs(a))
+                worst = max(worst, float((np.abs(a - b) / scale).max()))
+        if sim.done():
+            return worst
+        sim.step()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="seed-5 reference reproduction check")
+    p.add_argument("--update", action="store_true",
+                   help="re-record reference_seed5.json with the reference kernel")
+    p.add_argument("--every", type=int, default=60,
+                   help="grid check: compare neighbour sums every N steps")
+    p.add_argument("--tol", type=float, default=1e-9,
+                   help="grid check: max relative difference allowed")
+    args = p.parse_args()
+
+    if args.update:
+        curve, sim = run_curve("reference")
+        with open(REFERENCE, "w") as f:
+            json.dump({"config": dataclasses.asdict(sim.cfg), "steps": len(curve) - 1,
+                       "survivors": curve[-1], "curve": change_points(curve)}, f, indent=1)
+        print(f"saved {REFERENCE}  ({curve[-1]} survivors after {len(curve) - 1} steps)")
+        return
+
+    with open(REFERENCE) as f:
+        ref = json.load(f)
+    ok = True
+
+    def report(name: str, curve) -> None:
+        nonlocal ok
+        same = len(curve) - 1 == ref["steps"] and change_points(curve) == ref["curve"]
+        ok &= same
+        print(f"{'ok  ' if same else 'FAIL'} {name:<18} survivors {curve[-1]:>4} "
+              f"(reference {ref['survivors']})")
+
+    for kernel in ["reference", *kernels.KERNELS]:
+        report(f"kernel={kernel}", run_curve(kernel)[0])
+    report("batch (K=1)", batch_curve())
+
+    bad = mixed_grid_batch()
+    ok &= not bad
+    print(f"{'ok  ' if not bad else 'FAIL'} {'batch grid, mixed':<18} "
+          + (f"tanks {bad} differ from serial" if bad else "every tank matches serial"))
+
+    worst = grid_vs_dense(args.every)
+    same = worst <= args.tol
+    ok &= same
+    print(f"{'ok  ' if same else 'FAIL'} {'engine=grid':<18} max rel. diff {worst:.2e} "
+          f"vs dense along the trajectory (tol {args.tol:g})")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Headless scaling benchmark: steps/sec, per-phase time and peak RSS.
+
+For every (fish, sharks, neighbour engine) point it builds a
+``Simulation`` and times the phases of ``Simulation.step``:
+
+* ``fish_act``  — ``FishBrain.fish_act`` (neighbour sums + steering);
+* ``shark_act`` — ``SharkBrain.act``;
+* ``apply``     — ``World.apply`` (integrator kernel + eating);
+* ``step``      — whole ``Simulation.step`` calls, timed separately.
+
+It also records the peak RSS.  Each point runs in its own fresh process, so
+the peaks don't leak into one another.  The tank side grows with
+``sqrt(n_fish)`` to keep the demo's fish density, so larger runs stay
+comparable.  Dense is skipped above ``--dense-max`` fish because it needs
+O(N^2) memory.
+
+Results go to a JSON file named after the current commit.  Pass an earlier
+file as ``--baseline`` to print the speed-up of each point against it.
+
+    python bench/scaling.py
+    python bench/scaling.py --fish 100 1000 10000 50000 --sharks 1 8 --steps 100
+    python bench/scaling.py --baseline bench/results/<old>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import math
+import multiprocessing as mp
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import numpy as np  # noqa: E402
+
+import kernels  # noqa: E402
+from config import SimConfig  # noqa: E402
+from neighbours import ENGINES  # noqa: E402
+from sim import Simulation  # noqa: E402
+
+PHASES = ("fish_act", "shark_act", "apply", "step")
+
+
+# ---------------------------------------------------------------------- point
+def point_config(n_fish: int, n_sharks: int, engine: str, seed: int = 0) -> SimConfig:
+    """Demo config scaled to ``n_fish`` at the demo's fish density."""
+    base = SimConfig()
+    size = base.size * math.sqrt(n_fish / base.n_fish)
+    return dataclasses.replace(base, n_fish=n_fish, n_sharks=n_sharks, size=size,
+                               neighbour_engine=engine, seed=seed)
+
+
+def run_point(n_fish: int, n_sharks: int, engine: str, steps: int, warmup: int) -> dict:
+    """Time one point (called in a fresh worker process)."""
+    cfg = point_config(n_fish, n_sharks, engine)
+    rss0 = _rss_mb()
+    sim = Simulation(cfg)
+    w = sim.world
+    for _ in range(warmup):
+        sim.step()
+
+    # Phases, in exactly the order Simulation.step runs them.
+    clock = time.perf_counter
+    spent = dict.fromkeys(PHASES[:3], 0.0)
+    for _ in range(steps):
+        t0 = clock()
+        fish_accel, fish_lunge = sim.fish_brain.fish_act(w)
+        t1 = clock()
+        shark_accel, shark_lunge = sim.shark_brain.act(w)
+        t2 = clock()
+        w.apply(fish_accel, fish_lunge, shark_accel, shark_lunge)
+        t3 = clock()
+        sim.time_history.append(w.t)
+        sim.alive_history.append(w.n_alive)
+        spent["fish_act"] += t1 - t0
+        spent["shark_act"] += t2 - t1
+        spent["apply"] += t3 - t2
+
+    t0 = clock()
+    for _ in range(steps):
+        sim.step()
+    spent["step"] = clock() - t0
+
+    ms = {k: 1000.0 * v / steps for k, v in spent.items()}
+    return {
+        "n_fish": n_fish, "n_sharks": n_sharks, "engine": engine,
+        "size": cfg.size, "steps": steps,
+        "steps_per_s": 1000.0 / ms["step"],
+        "ms_per_step": ms,
+        "peak_rss_mb": _rss_mb(),
+        "base_rss_mb": rss0,
+    }
+
+
+def _rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+# -------------------------------------------------------------------- output
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "kernel": kernels.DEFAULT,
+    }
+
+
+def print_table(results, baseline=None) -> None:
+    ref = {}
+    for r in baseline or []:
+        ref[(r["n_fish"], r["n_sharks"], r["engine"])] = r["steps_per_s"]
+    print(f"{'fish':>7} {'sharks':>6} {'engine':>6} {'steps/s':>9} "
+          + " ".join(f"{p:>9}" for p in PHASES) + f" {'rss MB':>8}"
+          + (f" {'vs base':>8}" if ref else ""))
+    for r in results:
+        line = (f"{r['n_fish']:>7} {r['n_sharks']:>6} {r['engine']:>6} "
+                f"{r['steps_per_s']:>9.1f} "
+                + " ".join(f"{r['ms_per_step'][p]:>7.2f}ms" for p in PHASES)
+                + f" {r['peak_rss_mb']:>8.0f}")
+        old = ref.get((r["n_fish"], r["n_sharks"], r["engine"]))
+        if ref:
+            line += f" {r['steps_per_s'] / old:>7.2f}x" if old else f" {'-':>8}"
+        print(line)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="PredatorPrey scaling benchmark")
+    p.add_argument("--fish", type=int, nargs="+", default=[100, 1000, 5000, 20000, 50000])
+    p.add_argument("--sharks", type=int, nargs="+", default=[1, 8])
+    p.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    p.add_argument("--dense-max", type=int, default=2000,
+                   help="skip the dense engine above this many fish (O(N^2) memory)")
+    p.add_argument("--steps", type=int, default=50, help="timed steps per phase pass")
+    p.add_argument("--warmup", type=int, default=5)
+    p.add_argument("--out", help="JSON results (default bench/results/<commit>.json)")
+    p.add_argument("--baseline", help="earlier results JSON to compare against")
+    args = p.parse_args()
+
+    points = [(n, m, e) for n in args.fish for m in args.sharks for e in args.engines
+              if not (e == "dense" and n > args.dense_max)]
+    env = environment()
+    results = []
+    # One fresh process per point: clean peak RSS, no warm caches carried over.
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for n, m, e in points:
+            print(f"[bench] fish={n} sharks={m} engine={e} ...", flush=True)
+            results.append(pool.apply(run_point, (n, m, e, args.steps, args.warmup)))
+
+    out = args.out or os.path.join(HERE, "results", f"{env['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"env": env, "results": results}, f, indent=1)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    print()
+    print_table(results, baseline)
+    print(f"\nsaved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,9 @@ Phase 1 ships two hand-coded brains:
   free from the local rules.
 * ``SharkBrain`` — greedy pursuit of the nearest fish with a lunge when close.
 
+Both are written over the trailing ``(N, 2)`` axes, so the same brain also
+drives a ``BatchWorld`` of ``K`` stacked tanks (``BatchSimulation``).
+
 The RL engine (Phase 2) will add a ``NeuroFishBrain`` implementing the same
 ``fish_act`` signature, so it drops straight into ``Simulation``.
 """
@@ -20,124 +23,142 @@ from __future__ import annotations
 import numpy as np
 
 from config import SimConfig
-from physics import World, unit
+from neighbours import flock_sums
+from physics import World, pair_dist, unit
 
 
 class FishBrain:
-    """Hand-coded boids + evasion. Stateless; reads everything from the world."""
+    """Hand-coded boids + evasion. Stateless; reads everything from the world.
+
+    Works on a ``World`` or, unchanged, on a ``BatchWorld`` (every array gains a
+    leading tank axis and ``world.param`` hands back per-tank columns).
+    """
 
     def fish_act(self, world: World):
         cfg: SimConfig = world.cfg
+        p = world.param
         pos, vel, alive = world.pos, world.vel, world.alive
-        n = pos.shape[0]
+        n = pos.shape[-2]
 
-        # ---- pairwise fish-fish geometry (O(N^2), cheap for a few hundred) --
-        diff = pos[None, :, :] - pos[:, None, :]          # (N, N, 2): i -> j
-        dist2 = np.einsum("ijk,ijk->ij", diff, diff)
-        np.fill_diagonal(dist2, np.inf)
-        alive_j = alive[None, :]
+        # ---- neighbour sums (dense O(N^2) or grid, see neighbours.py) ------
+        sep_sum, cnt, sum_pos, sum_vel = flock_sums(
+            pos, vel, alive, cfg, p("separation_radius"), p("perception_radius"))
+        have = cnt[..., 0] > 0
 
         # Separation: push away from neighbours that are too close, ~1/d^2.
-        sep_mask = (dist2 < cfg.separation_radius ** 2) & alive_j
-        inv = np.where(sep_mask, 1.0 / np.maximum(dist2, 1e-6), 0.0)
-        sep = unit(-np.einsum("ij,ijk->ik", inv, diff))
+        sep = unit(-sep_sum)
 
-        # Perception neighbourhood for alignment + cohesion.
-        per_mask = ((dist2 < cfg.perception_radius ** 2) & alive_j).astype(float)
-        cnt = per_mask.sum(1, keepdims=True)
-        have = cnt[:, 0] > 0
-
-        mean_pos = np.einsum("ij,jk->ik", per_mask, pos) / np.maximum(cnt, 1.0)
+        # Alignment + cohesion over the perception neighbourhood.
+        mean_pos = sum_pos / np.maximum(cnt, 1.0)
         coh = unit(mean_pos - pos)
         coh[~have] = 0.0
 
-        mean_vel = np.einsum("ij,jk->ik", per_mask, vel) / np.maximum(cnt, 1.0)
+        mean_vel = sum_vel / np.maximum(cnt, 1.0)
         ali = unit(mean_vel)
         ali[~have] = 0.0
 
         # ---- evade the nearest shark, harder the closer it is --------------
-        sdiff = world.spos[None, :, :] - pos[:, None, :]  # (N, M, 2): fish -> shark
-        sd2 = np.einsum("ijk,ijk->ij", sdiff, sdiff)
-        nearest = np.argmin(sd2, axis=1)
-        rows = np.arange(n)
-        nd = np.sqrt(sd2[rows, nearest])
-        to_shark = sdiff[rows, nearest]
-        prox = np.clip(1.0 - nd / cfg.shark_sense_radius, 0.0, 1.0)[:, None]
+        sdiff = world.spos[..., None, :, :] - pos[..., :, None, :]  # (N, M, 2): fish -> shark
+        sd2 = np.einsum("...ijk,...ijk->...ij", sdiff, sdiff)
+        nearest = np.argmin(sd2, axis=-1)[..., None]
+        nd = np.sqrt(np.take_along_axis(sd2, nearest, axis=-1))[..., 0]
+        to_shark = np.take_along_axis(sdiff, nearest[..., None], axis=-2)[..., 0, :]
+        prox = np.clip(1.0 - nd / p("shark_sense_radius"), 0.0, 1.0)[..., None]
         evade = unit(-to_shark) * prox
 
         # ---- steer away from walls when near them --------------------------
-        wall = self._wall_force(pos, cfg)
+        wall = _wall_force(pos, p("wall_margin"), cfg.size)
 
         # ---- a little wander so calm schools still drift ------------------
         wander = unit(world.rng.normal(size=(n, 2)))
 
         steer = (
-            cfg.w_separation * sep
-            + cfg.w_alignment * ali
-            + cfg.w_cohesion * coh
-            + cfg.w_evade * evade
-            + cfg.w_wall * wall
-            + cfg.w_wander * wander
+            _vec(p("w_separation")) * sep
+            + _vec(p("w_alignment")) * ali
+            + _vec(p("w_cohesion")) * coh
+            + _vec(p("w_evade")) * evade
+            + _vec(p("w_wall")) * wall
+            + _vec(p("w_wander")) * wander
         )
 
         # Lunge (escape burst) when a shark breaches the trigger distance.
-        lunge = nd < cfg.fish_lunge_trigger
-        target_speed = np.where(lunge, cfg.fish_burst, cfg.fish_cruise)[:, None]
+        lunge = nd < p("fish_lunge_trigger")
+        target_speed = np.where(lunge, p("fish_burst"), p("fish_cruise"))[..., None]
         desired = unit(steer) * target_speed
         accel = (desired - vel) * 4.0
         return accel, lunge
 
-    @staticmethod
-    def _wall_force(pos: np.ndarray, cfg: SimConfig) -> np.ndarray:
-        m, s = cfg.wall_margin, cfg.size
-        left = np.clip((m - pos[:, 0]) / m, 0.0, 1.0)
-        right = np.clip((pos[:, 0] - (s - m)) / m, 0.0, 1.0)
-        bottom = np.clip((m - pos[:, 1]) / m, 0.0, 1.0)
-        top = np.clip((pos[:, 1] - (s - m)) / m, 0.0, 1.0)
-        return np.stack([left - right, bottom - top], axis=1)
-
 
 class SharkBrain:
-    """Greedy hunter: chase the nearest fish, lunge when it gets close."""
+    """Greedy hunter: chase the nearest fish, lunge when it gets close.
+
+    All sharks are handled at once from one ``(M, N)`` distance matrix (dead
+    fish at infinity); only the five nearest fish per shark are ranked
+    (``argpartition``).  Like ``FishBrain`` it also accepts a ``BatchWorld``.
+    """
 
     def act(self, world: World):
         cfg: SimConfig = world.cfg
-        m = cfg.n_sharks
-        accel = np.zeros((m, 2))
-        lunge = np.zeros(m, dtype=bool)
-        alive_idx = np.where(world.alive)[0]
-
-        for k in range(m):
-            spos, svel = world.spos[k], world.svel[k]
-            if alive_idx.size == 0:
-                # Nothing left to hunt: coast and avoid walls.
-                accel[k] = -svel + cfg.shark_wall_weight * self._wall_force(spos, cfg)
-                continue
-
-            d = np.linalg.norm(world.pos[alive_idx] - spos, axis=1)
-            order = np.argsort(d)
-            # Confusion: occasionally lock onto a nearby (not nearest) fish.
-            if world.rng.random() < cfg.shark_target_jitter and order.size > 1:
-                pick = order[world.rng.integers(1, min(5, order.size))]
-            else:
-                pick = order[0]
-
-            target = world.pos[alive_idx[pick]]
-            to_target = target - spos
-            dist = float(np.linalg.norm(to_target))
-            lunge[k] = dist < cfg.shark_lunge_trigger
-
-            speed = cfg.shark_burst if lunge[k] else cfg.shark_cruise
-            desired = unit(to_target) * speed
-            steer = (desired - svel) * 4.0
-            steer += cfg.shark_wall_weight * cfg.shark_max_force * self._wall_force(spos, cfg)
-            accel[k] = steer
-
-        return accel, lunge
-
-    @staticmethod
-    def _wall_force(spos: np.ndarray, cfg: SimConfig) -> np.ndarray:
-        m, s = cfg.wall_margin, cfg.size
-        fx = np.clip((m - spos[0]) / m, 0.0, 1.0) - np.clip((spos[0] - (s - m)) / m, 0.0, 1.0)
-        fy = np.clip((m - spos[1]) / m, 0.0, 1.0) - np.clip((spos[1] - (s - m)) / m, 0.0, 1.0)
-        return np.array([fx, fy])
+        p = world.param
+        spos, svel, alive = world.spos, world.svel, world.alive
+        m = spos.shape[-2]
+        wall = _wall_force(spos, p("wall_margin"), cfg.size)
+
+        # Nothing left to hunt: coast and avoid walls.
+        coast = -svel + _vec(p("shark_wall_weight")) * wall
+        if not alive.any():
+            return coast, np.zeros(spos.shape[:-1], dtype=bool)
+
+        d = np.where(alive[..., None, :], pair_dist(spos, world.pos), np.inf)
+        k = min(5, d.shape[-1])
+        near = np.argpartition(d, k - 1, axis=-1)[..., :k]  # k nearest, unordered
+        order = np.argsort(np.take_along_axis(d, near, axis=-1), axis=-1)
+        near = np.take_along_axis(near, order, axis=-1)      # ... nearest first
+
+        # Confusion: occasionally lock onto a nearby (not nearest) fish.
+        n_alive = alive.sum(-1)
+        jitter_p = p("shark_target_jitter")
+        if alive.ndim == 1:
+            rank = _pick_rank(world.rng, m, min(5, int(n_alive)), jitter_p)
+        else:
+            rank = np.stack([
+                _pick_rank(rng, m, min(5, int(na)), float(jp[0])) if na else np.zeros(m, int)
+                for rng, na, jp in zip(world.rng.rngs, n_alive, jitter_p)
+            ])
+        pick = np.take_along_axis(near, rank[..., None], axis=-1)   # (M, 1)
+
+        to_target = np.take_along_axis(world.pos, pick, axis=-2) - spos
+        dist = np.take_along_axis(d, pick, axis=-1)[..., 0]
+        lunge = dist < p("shark_lunge_trigger")
+
+        speed = np.where(lunge, p("shark_burst"), p("shark_cruise"))[..., None]
+        desired = unit(to_target) * speed
+        accel = (desired - svel) * 4.0
+        accel += _vec(p("shark_wall_weight")) * _vec(p("shark_max_force")) * wall
+
+        hunting = (n_alive > 0)[..., None]
+        return np.where(hunting[..., None], accel, coast), lunge & hunting
+
+
+def _pick_rank(rng, m: int, k: int, jitter_p: float) -> np.ndarray:
+    """Which of its ``k`` nearest fish each of ``m`` sharks targets (0 = nearest)."""
+    rank = np.zeros(m, dtype=int)
+    jitter = (rng.random(m) < jitter_p) & (k > 1)
+    if jitter.any():
+        rank[jitter] = rng.integers(1, k, size=int(jitter.sum()))
+    return rank
+
+
+def _wall_force(pos: np.ndarray, margin, size: float) -> np.ndarray:
+    """Push back from any wall closer than ``margin`` (0 -> 1 at the wall)."""
+    m, s = margin, size
+    left = np.clip((m - pos[..., 0]) / m, 0.0, 1.0)
+    right = np.clip((pos[..., 0] - (s - m)) / m, 0.0, 1.0)
+    bottom = np.clip((m - pos[..., 1]) / m, 0.0, 1.0)
+    top = np.clip((pos[..., 1] - (s - m)) / m, 0.0, 1.0)
+    return np.stack([left - right, bottom - top], axis=-1)
+
+
+def _vec(x):
+    """Lift a per-tank ``(K, 1)`` parameter to broadcast over ``(K, N, 2)``."""
+    return x[..., None] if np.ndim(x) else x
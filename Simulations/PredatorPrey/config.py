@@ -32,6 +32,7 @@ class SimConfig:
     perception_radius: float = 11.0   # neighbours used for align / cohesion
     separation_radius: float = 4.5    # neighbours that feel "too close"
     shark_sense_radius: float = 28.0  # how far a fish can see a shark
+    neighbour_engine: str = "dense"   # "dense" O(N^2) | "grid" (thousands of fish)
 
     # ---- Fish behaviour weights (hand-coded brain, Phase 1) --------------
     w_separation: float = 1.7
@@ -0,0 +1,186 @@
+"""Vectorised RL environment: every fish of ``K`` parallel tanks is an agent.
+
+``PredatorPreyVecEnv`` wraps a ``BatchWorld``.  The policy steers the fish, and
+the sharks keep their hand-coded ``SharkBrain``.  It follows the Gymnasium
+vector-env contract:
+
+* ``reset(seed=None) -> (obs, info)``;
+* ``step(actions) -> (obs, reward, terminated, truncated, info)``.
+
+The difference is that each tank holds ``N`` agents, so per-agent arrays
+carry an extra fish axis:
+
+* ``obs``     — ``(K, N, obs_dim)`` float32, from ``observe`` (below);
+* ``actions`` — ``(K, N, 2)`` steering in units of ``fish_max_force``, or
+  ``(K, N, 3)`` where a positive third channel asks for a lunge;
+* ``reward``  — ``(K, N)``: ``alive_reward`` per step survived,
+  ``death_penalty`` on the step a fish is eaten, 0 once dead;
+* ``terminated`` / ``truncated`` — ``(K,)``: every fish eaten / time is up.
+
+Finished tanks reset themselves within the same ``step``.  The returned
+``obs`` already belongs to the new episode.  The last observation of the old
+one is in ``info["final_obs"]`` and its summary in ``info["episodes"]``.
+``info["alive"]`` masks the agents that are still in play.
+
+``observe`` is shape-generic like the brains, so a learned ``NeuroFishBrain``
+can build the same observation from a single ``World``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+
+import numpy as np
+
+from brains import SharkBrain
+from config import SimConfig
+from physics import BatchWorld, World, pair_dist
+
+
+def obs_dim(k_neighbours: int) -> int:
+    """Length of one fish's observation vector."""
+    return 2 + 5 * k_neighbours + 5 + 4 + 2
+
+
+def observe(world: World, k_neighbours: int = 6) -> np.ndarray:
+    """Per-fish local observations, ``(..., N, obs_dim)`` float32.
+
+    Features, each normalised to roughly ``[-1, 1]``:
+
+    * own velocity / ``fish_burst``;
+    * the ``k`` nearest live neighbours within ``perception_radius``, nearest
+      first: relative position / radius, relative velocity / ``fish_burst``
+      and a present flag (absent slots are all zero);
+    * the nearest shark: relative position and distance / ``shark_sense_radius``
+      and relative velocity / ``shark_burst``;
+    * distances to the left / right / bottom / top walls / ``size``;
+    * lunge ready (off cooldown) and lunging flags.
+    """
+    cfg = world.cfg
+    p = world.param
+    pos, vel, alive = world.pos, world.vel, world.alive
+    n = pos.shape[-2]
+    burst = _col(p("fish_burst"))
+    sight = _col(p("perception_radius"))
+    sense = _col(p("shark_sense_radius"))
+
+    # ---- k nearest live neighbours within sight -------------------------
+    # Only fish within ``perception_radius`` are reported, so rank just those
+    # candidate pairs (a few per fish) instead of partitioning whole rows;
+    # float32 is plenty for ranking and halves the (..., N, N) traffic.
+    x, y = pos[..., 0].astype(np.float32), pos[..., 1].astype(np.float32)
+    d2 = x[..., None, :] - x[..., :, None]
+    d2 *= d2
+    dy = y[..., None, :] - y[..., :, None]
+    dy *= dy
+    d2 += dy
+    d2 /= sight * sight                                       # < 1: within sight
+    d2[..., np.arange(n), np.arange(n)] = np.inf
+    pair = np.flatnonzero((d2 < 1.0) & alive[..., None, :])
+    row, col = pair // n, pair % n                            # row: flat fish index
+    # Sort by fish, nearest first (row + d2 never reaches the next row).
+    order = np.argsort(row + d2.ravel()[pair], kind="stable")
+    row, col = row[order], col[order]
+    first = np.searchsorted(row, row, side="left")
+    rank = np.arange(row.size) - first
+    keep = rank < k_neighbours
+    row, rank, mate = row[keep], rank[keep], (row[keep] // n) * n + col[keep]
+    tank = row // n if pos.ndim == 3 else ...
+    flat_pos, flat_vel = pos.reshape(-1, 2), vel.reshape(-1, 2)
+    mates = np.zeros((flat_pos.shape[0], k_neighbours, 5))
+    mates[row, rank, 0:2] = (flat_pos[mate] - flat_pos[row]) / _flat(sight, tank)
+    mates[row, rank, 2:4] = (flat_vel[mate] - flat_vel[row]) / _flat(burst, tank)
+    mates[row, rank, 4] = 1.0
+    mates = mates.reshape(*pos.shape[:-1], 5 * k_neighbours)
+
+    # ---- nearest shark ---------------------------------------------------
+    sd = pair_dist(pos, world.spos)                              # (..., N, M)
+    ns = np.argmin(sd, axis=-1)[..., None]
+    to_shark = np.take_along_axis(world.spos[..., None, :, :], ns[..., None], -2)[..., 0, :] - pos
+    shark_vel = np.take_along_axis(world.svel[..., None, :, :], ns[..., None], -2)[..., 0, :]
+    shark = np.concatenate([
+        to_shark / sense,
+        np.take_along_axis(sd, ns, -1) / sense,
+        (shark_vel - vel) / _col(p("shark_burst")),
+    ], axis=-1)
+
+    # ---- walls and lunge state ------------------------------------------
+    s = cfg.size
+    walls = np.stack([pos[..., 0], s - pos[..., 0], pos[..., 1], s - pos[..., 1]], -1) / s
+    state = np.stack([(world._lunge_cd <= 0) & (world._lunge_timer <= 0),
+                      world.fish_bursting], -1)
+
+    obs = np.concatenate([vel / burst, mates, shark, walls, state], axis=-1)
+    obs[~alive] = 0.0
+    return obs.astype(np.float32)
+
+
+class PredatorPreyVecEnv:
+    """``num_envs`` parallel tanks of the simulator, every fish an agent."""
+
+    def __init__(self, num_envs: int = 16, cfg: SimConfig | None = None, seed: int = 0,
+                 k_neighbours: int = 6, alive_reward: float = 0.01,
+                 death_penalty: float = -1.0, shark_brain=None):
+        self.cfg = cfg or SimConfig()
+        self.num_envs = num_envs
+        self.k_neighbours = k_neighbours
+        self.alive_reward = alive_reward
+        self.death_penalty = death_penalty
+        self.shark_brain = shark_brain or SharkBrain()
+        self.n_agents = self.cfg.n_fish
+        self.obs_shape = (num_envs, self.n_agents, obs_dim(k_neighbours))
+        self.action_shape = (num_envs, self.n_agents, 3)
+        self.seed = seed
+        self.world: BatchWorld | None = None
+
+    def reset(self, seed: int | None = None):
+        """Start every tank afresh (tank ``k`` is seeded ``seed + k``)."""
+        if seed is not None:
+            self.seed = seed
+        cfgs = [dataclasses.replace(self.cfg, seed=self.seed + k) for k in range(self.num_envs)]
+        self.world = BatchWorld(cfgs, [np.random.default_rng(c.seed) for c in cfgs])
+        return self._observe(), {"alive": self.world.alive.copy()}
+
+    def step(self, actions):
+        w = self.world
+        actions = np.asarray(actions, dtype=float)
+        fish_accel = actions[..., :2] * _col(w.param("fish_max_force"))
+        fish_lunge = actions[..., 2] > 0 if actions.shape[-1] > 2 else np.zeros(w.alive.shape, bool)
+        shark_accel, shark_lunge = self.shark_brain.act(w)
+
+        was_alive = w.alive.copy()
+        w.apply(fish_accel, fish_lunge, shark_accel, shark_lunge)
+        eaten = was_alive & ~w.alive
+        reward = np.where(w.alive, self.alive_reward, 0.0)
+        reward[eaten] = self.death_penalty
+
+        n_alive = w.n_alive
+        terminated = n_alive == 0
+        truncated = ~terminated & (w.t >= w.param("max_seconds")[:, 0])
+        obs = self._observe()
+        info = {"eaten": eaten, "final_obs": None, "episodes": {}}
+        done = np.flatnonzero(terminated | truncated)
+        if done.size:
+            info["final_obs"] = obs[done]
+            info["episodes"] = {
+                int(k): {"survivors": int(n_alive[k]), "eaten": self.n_agents - int(n_alive[k]),
+                         "duration_s": float(w.t[k]), "seed": w.cfgs[k].seed}
+                for k in done
+            }
+            w.reset_tanks(done)
+            obs[done] = self._observe()[done]
+        info["alive"] = w.alive.copy()
+        return obs, reward.astype(np.float32), terminated, truncated, info
+
+    def _observe(self) -> np.ndarray:
+        return observe(self.world, self.k_neighbours)
+
+
+def _flat(col, tank):
+    """Per-pair values of a ``_col`` parameter (``tank``: each pair's tank)."""
+    return col.reshape(-1, 1)[tank] if np.ndim(col) else col
+
+
+def _col(x, depth: int = 1):
+    """Lift a per-tank ``(K, 1)`` parameter to broadcast over ``depth`` more axes."""
+    return np.reshape(x, np.shape(x) + (1,) * depth) if np.ndim(x) else x
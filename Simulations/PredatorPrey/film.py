@@ -3,6 +3,8 @@
 Each piece is rendered separately (matplotlib), then concatenated in a single
 ffmpeg pass with a short fade to/from black between pieces. All pieces are forced
 to 1920x1080 / 30 fps / yuv420p / SAR 1:1 so the concat filter joins them cleanly.
+The simulation is recorded once and rendered in parallel chunks on every core
+(see ``viz.render_parallel``).
 """
 
 from __future__ import annotations
@@ -20,15 +22,20 @@ def _fade(dur, fin=0.4, fout=0.4):
 
 
 def build_film(cfg, out_path, workdir, dpi=120, fps=30,
-               intro_s=5.0, rules_s=9.0, outro_s=5.0, ffmpeg="ffmpeg"):
+               intro_s=5.0, rules_s=9.0, outro_s=5.0, ffmpeg="ffmpeg", workers=None):
     os.makedirs(workdir, exist_ok=True)
+    episode = os.path.join(workdir, "episode.npy")
     sim_mp4 = os.path.join(workdir, "sim.mp4")
     intro_png = os.path.join(workdir, "intro.png")
     rules_png = os.path.join(workdir, "rules.png")
     outro_png = os.path.join(workdir, "outro.png")
 
-    print("[film] 1/3  rendering simulation ...")
-    viz.animate(Simulation(cfg), save=sim_mp4, dpi=dpi, fps=fps)
+    print("[film] 1/3  simulating + rendering in parallel ...")
+    # Simulate once into an episode file, then render it in chunks on every
+    # core. Frames 1..steps match what ``viz.animate`` would show.
+    Simulation(cfg, record=episode).run()
+    viz.render_parallel(episode, sim_mp4, workers=workers, fps=fps, dpi=dpi,
+                        start=1, stop=cfg.steps_per_episode + 1, ffmpeg=ffmpeg)
 
     print("[film] 2/3  rendering cards ...")
     cards.intro_card(cfg, intro_png, dpi=dpi)
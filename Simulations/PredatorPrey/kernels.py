@@ -0,0 +1,185 @@
+"""Fused integrators for ``World.apply``: one pass, no per-step temporaries.
+
+A kernel advances one kind of agent (fish or sharks) by ``dt``.  In order, it
+runs the lunge state machine, clamps the steering force, integrates and clamps
+velocity, moves live agents, reflects them off the walls and ticks the timers.
+``World._integrate`` is the readable reference.  The kernels here reproduce it
+bit for bit and update the state arrays in place:
+
+* ``numpy`` — the same maths spelled with ``out=`` / ``where=`` ufunc calls
+  into scratch buffers kept on the ``World`` (one set per array shape), so a
+  step allocates no arrays once the buffers exist;
+* ``numba`` — a compiled per-agent loop, available when Numba is installed.
+
+Every kernel takes the state reshaped to ``(K, N, 2)`` / ``(K, N)`` (``K = 1``
+for a lone ``World``) and its parameters as a ``(6, K)`` array, rows in
+``PARAMS`` order.  ``DEFAULT`` is Numba when importable, else NumPy; set
+``PREDPREY_KERNEL`` (or ``world.kernel``) to pick one, ``reference``
+included.
+"""
+
+from __future__ import annotations
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional: the NumPy kernel needs nothing extra
+    numba = None
+
+EPS = 1e-9
+
+# Per-agent-kind SimConfig fields, as ``<fish|shark>_<name>``.
+PARAMS = ("max_force", "cruise", "burst", "min_speed", "lunge_time", "lunge_cooldown")
+
+
+# --------------------------------------------------------------------- numpy
+def _buffers(shape: tuple) -> SimpleNamespace:
+    return SimpleNamespace(
+        acc=np.empty(shape + (2,)),
+        sp=np.empty(shape), ratio=np.empty(shape), vmax=np.empty(shape),
+        mask=np.empty(shape, bool), mask2=np.empty(shape, bool),
+        bursting=np.empty(shape, bool),
+    )
+
+
+def _clamp_speed(v, vmin, vmax, w) -> None:
+    """In-place ``physics.clamp_speed`` on ``v (K, N, 2)`` using scratch ``w``."""
+    x, y, sp, r, m = v[..., 0], v[..., 1], w.sp, w.ratio, w.mask
+    np.multiply(x, x, out=sp)
+    np.multiply(y, y, out=r)
+    sp += r
+    np.sqrt(sp, out=sp)
+    np.greater(sp, vmax, out=m)
+    np.divide(vmax, sp, out=r, where=m)
+    np.multiply(x, r, out=x, where=m)
+    np.multiply(y, r, out=y, where=m)
+    np.less(sp, vmin, out=m)
+    np.greater(sp, EPS, out=w.mask2)
+    m &= w.mask2
+    np.divide(vmin, sp, out=r, where=m)
+    np.multiply(x, r, out=x, where=m)
+    np.multiply(y, r, out=y, where=m)
+
+
+def integrate_numpy(pos, vel, alive, accel, lunge, timer, cd, prm, dt, size, work) -> None:
+    w = work.get(alive.shape)
+    if w is None:
+        w = work[alive.shape] = _buffers(alive.shape)
+    max_force, cruise, burst, min_speed, lunge_time, lunge_cd_time = prm[:, :, None]
+    m, bursting = w.mask, w.bursting
+    live = alive[..., None]
+
+    # --- lunge state machine: start new bursts that are off cooldown ---
+    np.less_equal(cd, 0.0, out=m)
+    np.less_equal(timer, 0.0, out=w.mask2)
+    m &= w.mask2
+    m &= alive
+    np.logical_and(m, lunge, out=m)
+    np.copyto(timer, lunge_time, where=m)
+    np.greater(timer, 0.0, out=bursting)
+
+    # --- integrate velocity with a capped steering force ---------------
+    np.copyto(w.acc, accel)
+    _clamp_speed(w.acc, 0.0, max_force, w)
+    w.acc *= dt
+    np.add(vel, w.acc, out=vel, where=live)
+    np.copyto(w.vmax, cruise)
+    np.copyto(w.vmax, burst, where=bursting)
+    _clamp_speed(vel, min_speed, w.vmax, w)
+
+    # --- integrate position (dead agents freeze) -----------------------
+    np.multiply(vel, dt, out=w.acc)
+    np.add(pos, w.acc, out=pos, where=live)
+
+    # --- walls ------------------------------------------------------------
+    for d in (0, 1):
+        p, v = pos[..., d], vel[..., d]
+        for hit, edge in ((np.less, 0.0), (np.greater, size)):
+            hit(p, edge, out=m)
+            np.copyto(p, edge, where=m)
+            np.multiply(v, -0.5, out=v, where=m)
+
+    # --- advance timers -------------------------------------------------
+    timer -= dt
+    np.maximum(timer, 0.0, out=timer)
+    np.less_equal(timer, 0.0, out=m)
+    m &= bursting
+    np.copyto(cd, lunge_cd_time, where=m)
+    cd -= dt
+    np.maximum(cd, 0.0, out=cd)
+
+
+# --------------------------------------------------------------------- numba
+def _fused(pos, vel, alive, accel, lunge, timer, cd, prm, dt, size):
+    for k in range(alive.shape[0]):
+        max_force, cruise, burst = prm[0, k], prm[1, k], prm[2, k]
+        min_speed, lunge_time, lunge_cd_time = prm[3, k], prm[4, k], prm[5, k]
+        for i in range(alive.shape[1]):
+            live = alive[k, i]
+            if lunge[k, i] and cd[k, i] <= 0.0 and timer[k, i] <= 0.0 and live:
+                timer[k, i] = lunge_time
+            bursting = timer[k, i] > 0.0
+
+            ax, ay = accel[k, i, 0], accel[k, i, 1]
+            sp = np.sqrt(ax * ax + ay * ay)
+            if sp > max_force:
+                r = max_force / sp
+                ax *= r
+                ay *= r
+            vx, vy = vel[k, i, 0], vel[k, i, 1]
+            if live:
+                vx += ax * dt
+                vy += ay * dt
+            vmax = burst if bursting else cruise
+            sp = np.sqrt(vx * vx + vy * vy)
+            if sp > vmax:
+                r = vmax / sp
+                vx *= r
+                vy *= r
+            if sp < min_speed and sp > EPS:
+                r = min_speed / sp
+                vx *= r
+                vy *= r
+
+            px, py = pos[k, i, 0], pos[k, i, 1]
+            if live:
+                px += vx * dt
+                py += vy * dt
+            if px < 0.0:
+                px = 0.0
+                vx *= -0.5
+            if px > size:
+                px = size
+                vx *= -0.5
+            if py < 0.0:
+                py = 0.0
+                vy *= -0.5
+            if py > size:
+                py = size
+                vy *= -0.5
+            pos[k, i, 0], pos[k, i, 1] = px, py
+            vel[k, i, 0], vel[k, i, 1] = vx, vy
+
+            t = max(timer[k, i] - dt, 0.0)
+            timer[k, i] = t
+            c = lunge_cd_time if bursting and t <= 0.0 else cd[k, i]
+            cd[k, i] = max(c - dt, 0.0)
+
+
+def integrate_numba(pos, vel, alive, accel, lunge, timer, cd, prm, dt, size, work) -> None:
+    _fused(pos, vel, alive,
+           np.asarray(accel, dtype=float).reshape(vel.shape),
+           np.asarray(lunge, dtype=bool).reshape(alive.shape),
+           timer, cd, prm, float(dt), float(size))
+
+
+KERNELS = {"numpy": integrate_numpy}
+if numba is not None:
+    _fused = numba.njit(cache=True, nogil=True)(_fused)
+    KERNELS["numba"] = integrate_numba
+
+DEFAULT = os.environ.get("PREDPREY_KERNEL") or ("numba" if numba is not None else "numpy")
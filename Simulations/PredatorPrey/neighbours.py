@@ -0,0 +1,188 @@
+"""Neighbour sums for the boids rules: a dense O(N^2) path and a uniform grid.
+
+Both engines return the same four per-fish sums, which ``FishBrain`` turns into
+the separation / alignment / cohesion steering terms:
+
+* ``sep``     — ``sum_j (pos_j - pos_i) / d_ij^2`` over neighbours closer than
+  ``separation_radius`` (the brain negates and normalises it);
+* ``cnt``     — number of live neighbours within ``perception_radius``;
+* ``sum_pos`` / ``sum_vel`` — their summed positions and velocities.
+
+``dense`` builds the full ``(N, N, 2)`` pairwise tensor; it is what the
+calibrated demo uses and is cheapest for a few hundred fish.  ``grid`` buckets
+the live fish into square cells of side ``perception_radius`` (rebuilt every
+step from ``World.pos``) and only visits the 3x3 block of cells around each
+fish, each pair once, so memory grows with ``N * neighbours`` instead of
+``N^2``.  The two agree to floating-point round-off.
+
+Both also accept a stacked batch of tanks — ``pos`` of shape ``(K, N, 2)`` and
+per-tank radii of shape ``(K,)`` — for ``BatchWorld``; tanks never see each
+other's fish.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from config import SimConfig
+
+# Half of the 3x3 block of cells a fish can see into (cell side = perception
+# radius).  Every pair is symmetric, so each one is visited once and credited
+# to both fish; the own-cell offset keeps only ``a < b``.
+_HALF_OFFSETS = [(0, 0), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def dense_flock_sums(pos, vel, alive, separation_radius, perception_radius, size):
+    """All-pairs neighbour sums (O(N^2) time and memory)."""
+    sep_r2 = _per_tank(separation_radius) ** 2
+    per_r2 = _per_tank(perception_radius) ** 2
+
+    diff = pos[..., None, :, :] - pos[..., :, None, :]   # (N, N, 2): i -> j
+    dist2 = np.einsum("...ijk,...ijk->...ij", diff, diff)
+    diag = np.arange(pos.shape[-2])
+    dist2[..., diag, diag] = np.inf
+    alive_j = alive[..., None, :]
+
+    # Separation: push away from neighbours that are too close, ~1/d^2.
+    sep_mask = (dist2 < sep_r2) & alive_j
+    inv = np.where(sep_mask, 1.0 / np.maximum(dist2, 1e-6), 0.0)
+    sep = np.einsum("...ij,...ijk->...ik", inv, diff)
+
+    # Perception neighbourhood for alignment + cohesion.
+    per_mask = ((dist2 < per_r2) & alive_j).astype(float)
+    cnt = per_mask.sum(-1, keepdims=True)
+    sum_pos = np.einsum("...ij,...jk->...ik", per_mask, pos)
+    sum_vel = np.einsum("...ij,...jk->...ik", per_mask, vel)
+    return sep, cnt, sum_pos, sum_vel
+
+
+class CellGrid:
+    """Live fish bucketed into square cells, sorted so each cell is a slice.
+
+    ``order`` lists fish indices grouped by cell; cell ``c`` owns the sorted
+    slots ``start[c]:start[c + 1]``.  Dead fish are left out entirely, so they
+    are never anyone's neighbour.  ``tank`` (optional, one id per fish) keeps
+    several tanks in one grid without their cells touching; ``cell`` may then
+    be one side length per tank, so each tank is bucketed (and its slots
+    ordered) exactly as it would be in a grid of its own.
+    """
+
+    def __init__(self, pos: np.ndarray, alive: np.ndarray, cell, size: float,
+                 tank: np.ndarray | None = None):
+        cell = np.atleast_1d(np.asarray(cell, float))
+        sides = np.maximum(1, np.ceil(size / cell).astype(np.intp))
+        base = np.concatenate([[0], np.cumsum(sides * sides)])   # first cell of each tank
+        idx = np.flatnonzero(alive)
+        tk = np.zeros(idx.size, np.intp) if tank is None else tank[idx]
+        side = sides[tk]
+        cxy = np.clip((pos[idx] // cell[tk][:, None]).astype(np.intp), 0, side[:, None] - 1)
+        key = base[tk] + cxy[:, 0] * side + cxy[:, 1]
+        sort = np.argsort(key, kind="stable")
+        self.order = idx[sort]
+        self.tank = tk[sort]                              # tank of each slot
+        self.side = side[sort]                            # cells per row in its tank
+        self.base = base
+        self.cx, self.cy = cxy[sort, 0], cxy[sort, 1]     # cell of each slot
+        counts = np.bincount(key, minlength=base[-1])
+        self.start = np.concatenate([[0], np.cumsum(counts)])
+
+    def candidate_pairs(self, dx: int, dy: int):
+        """Slot pairs ``(a, b)``: every live fish ``a`` against cell ``a + (dx, dy)``."""
+        nx, ny = self.cx + dx, self.cy + dy
+        ok = (nx >= 0) & (nx < self.side) & (ny >= 0) & (ny < self.side)
+        a = np.flatnonzero(ok)
+        key = self.base[self.tank[a]] + nx[a] * self.side[a] + ny[a]
+        lo = self.start[key]
+        n = self.start[key + 1] - lo
+        total = int(n.sum())
+        if total == 0:
+            return a[:0], a[:0]
+        # Expand each fish's [lo, hi) slice without a Python loop.
+        shift = np.repeat(np.cumsum(n) - n - lo, n)
+        return np.repeat(a, n), np.arange(total) - shift
+
+
+def grid_flock_sums(pos, vel, alive, separation_radius, perception_radius, size):
+    """Neighbour sums via a uniform grid (O(N * neighbours) time and memory)."""
+    shape = pos.shape[:-1]
+    sep_r2 = np.asarray(separation_radius, float) ** 2
+    per_r2 = np.asarray(perception_radius, float) ** 2
+    reach2 = np.maximum(sep_r2, per_r2)
+    tank = None
+    if pos.ndim == 3:
+        # Flatten the batch into one grid; radii become per-tank lookups.  Each
+        # tank keeps its own cell size, so its pairs come out in the same order
+        # (and its sums with the same round-off) as a lone ``World``'s.
+        tank = np.repeat(np.arange(shape[0]), shape[1])
+        pos, vel, alive = pos.reshape(-1, 2), vel.reshape(-1, 2), alive.reshape(-1)
+    grid = CellGrid(pos, alive, np.sqrt(reach2), size, tank)
+
+    # Work in sorted-slot space on flat 1-D columns: cheaper gathers.
+    m = grid.order.size
+    px, py = pos[grid.order, 0], pos[grid.order, 1]
+    vx, vy = vel[grid.order, 0], vel[grid.order, 1]
+    acc = np.zeros((7, m))  # sep x/y, count, pos x/y, vel x/y
+    for dx, dy in _HALF_OFFSETS:
+        a, b = grid.candidate_pairs(dx, dy)
+        ta = ... if tank is None else grid.tank[a]
+        ddx = px[b] - px[a]
+        ddy = py[b] - py[a]
+        d2 = ddx * ddx + ddy * ddy
+        near = d2 < reach2[ta]
+        if dx == dy == 0:
+            near &= a < b
+        keep = np.flatnonzero(near)
+        a, b, ddx, ddy, d2 = a[keep], b[keep], ddx[keep], ddy[keep], d2[keep]
+        if tank is not None:
+            ta = ta[keep]
+
+        inv = np.where(d2 < sep_r2[ta], 1.0 / np.maximum(d2, 1e-6), 0.0)
+        per = (d2 < per_r2[ta]).astype(float)
+        ab = np.concatenate([a, b])
+        for row, w in enumerate((
+            np.concatenate([inv * ddx, -inv * ddx]),
+            np.concatenate([inv * ddy, -inv * ddy]),
+            np.concatenate([per, per]),
+            np.concatenate([per * px[b], per * px[a]]),
+            np.concatenate([per * py[b], per * py[a]]),
+            np.concatenate([per * vx[b], per * vx[a]]),
+            np.concatenate([per * vy[b], per * vy[a]]),
+        )):
+            acc[row] += np.bincount(ab, w, minlength=m)
+
+    out = np.zeros((pos.shape[0], 7))
+    out[grid.order] = acc.T
+    out = out.reshape(*shape, 7)
+    return out[..., 0:2], out[..., 2:3], out[..., 3:5], out[..., 5:7]
+
+
+ENGINES = {"dense": dense_flock_sums, "grid": grid_flock_sums}
+
+
+def flock_sums(pos, vel, alive, cfg: SimConfig, separation_radius=None,
+               perception_radius=None):
+    """Dispatch to the neighbour engine named by ``cfg.neighbour_engine``.
+
+    The radii default to ``cfg``'s; ``BatchWorld`` passes per-tank columns
+    instead (any shape with ``K`` entries).
+    """
+    try:
+        engine = ENGINES[cfg.neighbour_engine]
+    except KeyError:
+        raise ValueError(
+            f"unknown neighbour_engine {cfg.neighbour_engine!r}; "
+            f"expected one of {sorted(ENGINES)}"
+        ) from None
+    if separation_radius is None:
+        separation_radius = cfg.separation_radius
+    if perception_radius is None:
+        perception_radius = cfg.perception_radius
+    radii = [np.ravel(r) if np.ndim(r) else r
+             for r in (separation_radius, perception_radius)]
+    return engine(pos, vel, alive, *radii, cfg.size)
+
+
+def _per_tank(value):
+    """Scalar stays scalar; a per-tank ``(K,)`` array broadcasts over ``(K, N, N)``."""
+    value = np.asarray(value, float)
+    return value[:, None, None] if value.ndim else value
@@ -7,16 +7,18 @@ decide to move — those decisions arrive as acceleration vectors from a "brain"
 what lets the RL engine reuse this file untouched.
 
 All state is stored as NumPy arrays and every update is vectorised, so a few
-hundred fish over thousands of steps stays cheap.
+hundred fish over thousands of steps stays cheap.  The motion update itself runs
+through a fused, in-place kernel (``kernels.py``); ``World._integrate`` is the
+plain reference it must match.
 """
 
 from __future__ import annotations
 
 import numpy as np
 
+import kernels
 from config import SimConfig
-
-EPS = 1e-9
+from kernels import EPS
 
 
 def unit(v: np.ndarray, eps: float = EPS) -> np.ndarray:
@@ -25,28 +27,38 @@ def unit(v: np.ndarray, eps: float = EPS) -> np.ndarray:
     return v / np.maximum(n, eps)
 
 
-def clamp_speed(v: np.ndarray, vmin: float, vmax) -> np.ndarray:
-    """Clamp the speed (row-wise magnitude) of an ``(N, 2)`` velocity array.
+def clamp_speed(v: np.ndarray, vmin, vmax) -> np.ndarray:
+    """Clamp the speed (row-wise magnitude) of an ``(..., 2)`` velocity array.
 
-    ``vmax`` may be a scalar or a per-row array so lunging agents can be given a
-    higher ceiling than cruising ones.
+    ``vmin`` / ``vmax`` may be scalars or arrays broadcastable to ``v.shape[:-1]``
+    so lunging agents (or whole tanks of a batch) get their own limits.
     """
     out = v.copy()
-    sp = np.linalg.norm(out, axis=1)
-    vmax = np.broadcast_to(np.asarray(vmax, float), (out.shape[0],))
+    sp = np.linalg.norm(out, axis=-1)
+    vmax = np.broadcast_to(np.asarray(vmax, float), sp.shape)
     fast = sp > vmax
     out[fast] *= (vmax[fast] / sp[fast])[:, None]
+    vmin = np.broadcast_to(np.asarray(vmin, float), sp.shape)
     slow = (sp < vmin) & (sp > EPS)
-    out[slow] *= (vmin / sp[slow])[:, None]
+    out[slow] *= (vmin[slow] / sp[slow])[:, None]
     return out
 
 
+def pair_dist(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distances between every row of ``a (..., M, 2)`` and ``b (..., N, 2)`` -> ``(..., M, N)``."""
+    diff = b[..., None, :, :] - a[..., :, None, :]
+    return np.sqrt((diff * diff).sum(-1))
+
+
 class World:
     """Mutable state of the tank plus the ``apply`` step that advances physics."""
 
-    def __init__(self, cfg: SimConfig, rng: np.random.Generator):
+    def __init__(self, cfg: SimConfig, rng: np.random.Generator, kernel: str | None = None):
         self.cfg = cfg
         self.rng = rng
+        self.kernel = kernel or kernels.DEFAULT   # see kernels.py; "reference" too
+        self._work: dict = {}                      # kernel scratch, by array shape
+        self._kernel_params: dict[str, np.ndarray] = {}
         self.reset()
 
     # ------------------------------------------------------------------ reset
@@ -72,6 +84,7 @@ class World:
         self.shark_bursting = np.zeros(cfg.n_sharks, dtype=bool)
         self._s_lunge_timer = np.zeros(cfg.n_sharks)
         self._s_lunge_cd = np.zeros(cfg.n_sharks)
+        self._sharks_alive = np.ones(cfg.n_sharks, dtype=bool)
 
         self.t = 0.0
         self.step_idx = 0
@@ -82,47 +95,63 @@ class World:
     def n_alive(self) -> int:
         return int(self.alive.sum())
 
+    def param(self, name: str):
+        """``cfg.<name>`` — a scalar here, a per-tank column in ``BatchWorld``."""
+        return getattr(self.cfg, name)
+
     # --------------------------------------------------------------- one step
     def apply(self, fish_accel, fish_lunge, shark_accel, shark_lunge) -> None:
         """Advance the world one ``dt`` given the agents' chosen accelerations."""
-        cfg, dt = self.cfg, self.cfg.dt
+        self._advance("fish", self.pos, self.vel, self.alive, fish_accel, fish_lunge,
+                      self._lunge_timer, self._lunge_cd)
+        np.greater(self._lunge_timer, 0.0, out=self.fish_bursting)
 
-        self._integrate(
-            self.pos, self.vel, self.alive, fish_accel, fish_lunge,
-            self._lunge_timer, self._lunge_cd,
-            cfg.fish_max_force, cfg.fish_cruise, cfg.fish_burst, cfg.fish_min_speed,
-            cfg.fish_lunge_time, cfg.fish_lunge_cooldown,
-        )
-        self.fish_bursting = self._lunge_timer > 0
-
-        shark_alive = np.ones(cfg.n_sharks, dtype=bool)
-        self._integrate(
-            self.spos, self.svel, shark_alive, shark_accel, shark_lunge,
-            self._s_lunge_timer, self._s_lunge_cd,
-            cfg.shark_max_force, cfg.shark_cruise, cfg.shark_burst, cfg.shark_min_speed,
-            cfg.shark_lunge_time, cfg.shark_lunge_cooldown,
-        )
-        self.shark_bursting = self._s_lunge_timer > 0
+        self._advance("shark", self.spos, self.svel, self._sharks_alive, shark_accel,
+                      shark_lunge, self._s_lunge_timer, self._s_lunge_cd)
+        np.greater(self._s_lunge_timer, 0.0, out=self.shark_bursting)
 
         self._eat()
 
-        self.t += dt
+        self.t += self.cfg.dt
         self.step_idx += 1
 
     # ---------------------------------------------------------- physics core
-    def _integrate(self, pos, vel, alive, accel, lunge,
-                   lunge_timer, lunge_cd,
-                   max_force, cruise, burst, min_speed,
-                   lunge_time, lunge_cd_time) -> None:
-        cfg, dt, s = self.cfg, self.cfg.dt, self.cfg.size
+    def _advance(self, who, pos, vel, alive, accel, lunge, lunge_timer, lunge_cd,
+                 tanks=slice(None)) -> None:
+        """Run the selected kernel on one kind of agent (``who``: fish / shark)."""
+        if self.kernel == "reference":
+            integrate = self._integrate
+        else:
+            try:
+                integrate = kernels.KERNELS[self.kernel]
+            except KeyError:
+                raise ValueError(
+                    f"unknown kernel {self.kernel!r}; expected one of "
+                    f"{sorted(['reference', *kernels.KERNELS])}"
+                ) from None
+        prm = self._kernel_params.get(who)
+        if prm is None:
+            prm = self._kernel_params[who] = np.array(
+                [np.ravel(self.param(f"{who}_{name}")) for name in kernels.PARAMS])
+        shape = (-1, alive.shape[-1])
+        integrate(
+            pos.reshape(*shape, 2), vel.reshape(*shape, 2), alive.reshape(shape),
+            accel, lunge, lunge_timer.reshape(shape), lunge_cd.reshape(shape),
+            prm[:, tanks], self.cfg.dt, self.cfg.size, self._work,
+        )
+
+    @staticmethod
+    def _integrate(pos, vel, alive, accel, lunge, lunge_timer, lunge_cd,
+                   prm, dt, s, work=None) -> None:
+        max_force, cruise, burst, min_speed, lunge_time, lunge_cd_time = prm[:, :, None]
 
         # --- lunge state machine: start new bursts that are off cooldown ---
         want = np.asarray(lunge, dtype=bool) & (lunge_cd <= 0) & (lunge_timer <= 0) & alive
-        lunge_timer[want] = lunge_time
+        lunge_timer[:] = np.where(want, lunge_time, lunge_timer)
         bursting = lunge_timer > 0
 
         # --- integrate velocity with a capped steering force ---------------
-        acc = clamp_speed(np.asarray(accel, float), 0.0, max_force)
+        acc = clamp_speed(np.broadcast_to(np.asarray(accel, float), vel.shape), 0.0, max_force)
         vel[alive] += acc[alive] * dt
 
         vmax = np.where(bursting, burst, cruise)
@@ -133,29 +162,149 @@ class World:
 
         # --- soft-ish walls: clamp inside the tank and bleed off outward speed
         for d in (0, 1):
-            low = pos[:, d] < 0.0
-            pos[low, d] = 0.0
-            vel[low, d] *= -0.5
-            high = pos[:, d] > s
-            pos[high, d] = s
-            vel[high, d] *= -0.5
+            p, v = pos[..., d], vel[..., d]
+            low = p < 0.0
+            p[low] = 0.0
+            v[low] *= -0.5
+            high = p > s
+            p[high] = s
+            v[high] *= -0.5
 
         # --- advance timers -------------------------------------------------
         lunge_timer[:] = np.maximum(0.0, lunge_timer - dt)
         just_ended = bursting & (lunge_timer <= 0)
-        lunge_cd[just_ended] = lunge_cd_time
+        lunge_cd[:] = np.where(just_ended, lunge_cd_time, lunge_cd)
         lunge_cd[:] = np.maximum(0.0, lunge_cd - dt)
 
     def _eat(self) -> None:
-        cfg = self.cfg
-        for m in range(cfg.n_sharks):
-            if not self.alive.any():
-                break
-            d = np.linalg.norm(self.pos - self.spos[m], axis=1)
-            hit = self.alive & (d <= cfg.eat_radius)
-            for i in np.where(hit)[0]:
-                self.eat_events.append((float(self.pos[i, 0]),
-                                        float(self.pos[i, 1]),
-                                        self.step_idx))
-            self.alive[hit] = False
-            self.death_step[hit] = self.step_idx
+        """Every live fish within ``eat_radius`` of any shark dies, in one pass."""
+        alive_idx = np.flatnonzero(self.alive)
+        if alive_idx.size == 0:
+            return
+        d = pair_dist(self.spos, self.pos[alive_idx])     # (M, N_alive)
+        hit = alive_idx[(d <= self.cfg.eat_radius).any(axis=0)]
+        if hit.size == 0:
+            return
+        self.eat_events.extend(
+            (x, y, self.step_idx) for x, y in self.pos[hit].tolist()
+        )
+        self.alive[hit] = False
+        self.death_step[hit] = self.step_idx
+
+
+# SimConfig fields that fix array shapes or the clock: every tank of a batch must
+# agree on them.  Everything else (weights, speeds, radii, seed, episode length)
+# may differ per tank.
+SHARED_FIELDS = ("size", "dt", "n_fish", "n_sharks", "neighbour_engine")
+
+# Per-agent state arrays; ``BatchWorld`` stacks each along a leading tank axis.
+_STATE = (
+    "pos", "vel", "alive", "fish_bursting", "_lunge_timer", "_lunge_cd",
+    "death_step", "spos", "svel", "shark_bursting", "_s_lunge_timer", "_s_lunge_cd",
+)
+
+
+class BatchRNG:
+    """One generator per tank behind the ``Generator`` calls the brains make.
+
+    ``normal(size=...)`` stacks one draw per tank, so every tank consumes its own
+    stream exactly as a lone ``World`` would.
+    """
+
+    def __init__(self, rngs: list[np.random.Generator]):
+        self.rngs = rngs
+
+    def normal(self, size):
+        return np.stack([r.normal(size=size) for r in self.rngs])
+
+
+class BatchWorld(World):
+    """``K`` independent tanks stacked on a leading axis (``pos`` is ``(K, N, 2)``).
+
+    Each tank is built by a plain ``World`` from its own config and RNG, so tank
+    ``k`` starts exactly where ``World(cfgs[k], rngs[k])`` would.  ``t``,
+    ``step_idx`` and ``n_alive`` become ``(K,)`` arrays and ``eat_events`` one
+    list per tank.  Tanks cleared from ``active`` are skipped by ``apply``: their
+    episode is over and their state stays frozen.
+    """
+
+    def __init__(self, cfgs: list[SimConfig], rngs: list[np.random.Generator],
+                 kernel: str | None = None):
+        if len(cfgs) != len(rngs) or not cfgs:
+            raise ValueError("BatchWorld needs one RNG per config (and at least one)")
+        for name in SHARED_FIELDS:
+            if len({getattr(c, name) for c in cfgs}) > 1:
+                raise ValueError(f"all tanks of a batch must share SimConfig.{name}")
+        self.cfgs = list(cfgs)
+        self._params: dict[str, np.ndarray] = {}
+        super().__init__(self.cfgs[0], BatchRNG(list(rngs)), kernel)
+
+    # ------------------------------------------------------------------ reset
+    def reset(self) -> None:
+        worlds = [World(c, r) for c, r in zip(self.cfgs, self.rng.rngs)]
+        for name in _STATE:
+            setattr(self, name, np.stack([getattr(w, name) for w in worlds]))
+        self.k = len(worlds)
+        self.t = np.zeros(self.k)
+        self.step_idx = np.zeros(self.k, dtype=int)
+        self.eat_events = [[] for _ in worlds]
+        self.active = np.ones(self.k, dtype=bool)
+
+    def reset_tanks(self, idx) -> None:
+        """Start a fresh episode in tanks ``idx``; each keeps drawing from its own RNG."""
+        for k in np.atleast_1d(idx):
+            w = World(self.cfgs[k], self.rng.rngs[k])
+            for name in _STATE:
+                getattr(self, name)[k] = getattr(w, name)
+            self.t[k] = 0.0
+            self.step_idx[k] = 0
+            self.eat_events[k] = []
+            self.active[k] = True
+
+    # ------------------------------------------------------------- properties
+    @property
+    def n_alive(self) -> np.ndarray:
+        return self.alive.sum(-1)
+
+    def param(self, name: str) -> np.ndarray:
+        """``cfg.<name>`` of every tank as a ``(K, 1)`` column."""
+        if name not in self._params:
+            self._params[name] = np.array([getattr(c, name) for c in self.cfgs], float)[:, None]
+        return self._params[name]
+
+    # --------------------------------------------------------------- one step
+    def apply(self, fish_accel, fish_lunge, shark_accel, shark_lunge) -> None:
+        """Advance every active tank one ``dt``; actions are ``(K, ...)`` stacks."""
+        idx = np.flatnonzero(self.active)
+        if idx.size == 0:
+            return
+        sub = slice(None) if idx.size == self.k else idx
+        st = {name: getattr(self, name)[sub] for name in _STATE}
+        eat_radius = self.param("eat_radius")[sub]
+
+        self._advance("fish", st["pos"], st["vel"], st["alive"],
+                      np.asarray(fish_accel)[sub], np.asarray(fish_lunge)[sub],
+                      st["_lunge_timer"], st["_lunge_cd"], sub)
+        st["fish_bursting"] = st["_lunge_timer"] > 0
+
+        shark_alive = np.ones(st["spos"].shape[:-1], dtype=bool)
+        self._advance("shark", st["spos"], st["svel"], shark_alive,
+                      np.asarray(shark_accel)[sub], np.asarray(shark_lunge)[sub],
+                      st["_s_lunge_timer"], st["_s_lunge_cd"], sub)
+        st["shark_bursting"] = st["_s_lunge_timer"] > 0
+
+        # --- eating: one (K, M, N) distance pass over the active tanks -----
+        d = pair_dist(st["spos"], st["pos"])
+        hit = st["alive"] & (d <= eat_radius[..., None]).any(axis=-2)
+        steps = self.step_idx[idx]
+        for row in np.flatnonzero(hit.any(axis=1)):
+            self.eat_events[idx[row]].extend(
+                (x, y, int(steps[row])) for x, y in st["pos"][row, hit[row]].tolist()
+            )
+        st["alive"] &= ~hit
+        st["death_step"][:] = np.where(hit, steps[:, None], st["death_step"])
+
+        for name, arr in st.items():
+            getattr(self, name)[sub] = arr
+        self.t[idx] += self.cfg.dt
+        self.step_idx[idx] += 1
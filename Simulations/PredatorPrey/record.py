@@ -0,0 +1,151 @@
+"""Record an episode to disk once, replay (render) it as often as you like.
+
+An episode file is a structured ``.npy`` with one row per frame (frame 0 is the
+initial state, frame ``i`` the state after ``i`` steps) plus a small ``.json``
+sidecar holding the ``SimConfig`` and the frame count:
+
+* ``t``                              — float64 simulation time;
+* ``pos`` / ``vel`` / ``spos`` / ``svel`` — float32 ``(N, 2)`` / ``(M, 2)``;
+* ``alive`` / ``fish_bursting`` / ``shark_bursting`` — bit-packed flags.
+
+``Recorder`` preallocates the whole file with ``open_memmap`` and writes each
+frame straight into it, so recording costs no RAM beyond one frame.
+``Episode`` memory-maps it back read-only: ``episode.frame(i)`` is a
+``World``-shaped snapshot that ``viz.ArenaView`` can draw, in any order, so
+frames can be re-rendered (different dpi / fps, or ranges in parallel) without
+re-running the physics.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import math
+import os
+
+import numpy as np
+
+from config import SimConfig
+from physics import World
+
+
+def frame_dtype(n_fish: int, n_sharks: int) -> np.dtype:
+    nb, mb = (n_fish + 7) // 8, (n_sharks + 7) // 8
+    return np.dtype([
+        ("t", "f8"),
+        ("pos", "f4", (n_fish, 2)),
+        ("vel", "f4", (n_fish, 2)),
+        ("spos", "f4", (n_sharks, 2)),
+        ("svel", "f4", (n_sharks, 2)),
+        ("alive", "u1", (nb,)),
+        ("fish_bursting", "u1", (nb,)),
+        ("shark_bursting", "u1", (mb,)),
+    ])
+
+
+def _meta_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".json"
+
+
+class Recorder:
+    """Writes one frame per ``capture`` into a preallocated memory-mapped file."""
+
+    def __init__(self, path: str, world: World):
+        cfg = world.cfg
+        self.path = path
+        self.cfg = cfg
+        # The clock is a float sum of dt, so allow a step of slack past the end.
+        capacity = math.ceil(cfg.max_seconds / cfg.dt) + 2
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.frames = np.lib.format.open_memmap(
+            path, mode="w+", dtype=frame_dtype(cfg.n_fish, cfg.n_sharks), shape=(capacity,))
+        self.n = 0
+        self._write_meta()
+        self.capture(world)
+
+    def capture(self, world: World) -> None:
+        if self.n >= self.frames.shape[0]:
+            raise RuntimeError(f"episode file {self.path} is full ({self.n} frames)")
+        row = self.frames[self.n]
+        row["t"] = world.t
+        row["pos"] = world.pos
+        row["vel"] = world.vel
+        row["spos"] = world.spos
+        row["svel"] = world.svel
+        row["alive"] = np.packbits(world.alive)
+        row["fish_bursting"] = np.packbits(world.fish_bursting)
+        row["shark_bursting"] = np.packbits(world.shark_bursting)
+        self.n += 1
+
+    def close(self) -> None:
+        self.frames.flush()
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        with open(_meta_path(self.path), "w") as f:
+            json.dump({"n_frames": self.n, "config": dataclasses.asdict(self.cfg)}, f, indent=1)
+
+
+@dataclasses.dataclass
+class Frame:
+    """One recorded frame, shaped like the ``World`` attributes the views read."""
+
+    cfg: SimConfig
+    step_idx: int
+    t: float
+    pos: np.ndarray
+    vel: np.ndarray
+    alive: np.ndarray
+    fish_bursting: np.ndarray
+    spos: np.ndarray
+    svel: np.ndarray
+    shark_bursting: np.ndarray
+    eat_events: list
+
+    @property
+    def n_alive(self) -> int:
+        return int(self.alive.sum())
+
+
+class Episode:
+    """Read-only, memory-mapped recorded episode with random access to frames."""
+
+    def __init__(self, path: str):
+        with open(_meta_path(path)) as f:
+            meta = json.load(f)
+        self.cfg = SimConfig(**meta["config"])
+        self.frames = np.load(path, mmap_mode="r")[: meta["n_frames"]]
+        # Survivors curve and eat events, decoded once from the packed alive bits.
+        bits = np.asarray(self.frames["alive"])                # (T, N / 8)
+        self.times = np.asarray(self.frames["t"])
+        self.alive_counts = _POPCOUNT[bits].sum(1)
+        gone = bits[:-1] & ~bits[1:]                           # eaten during step f
+        rows = np.flatnonzero(gone.any(1))
+        sub, fish = np.nonzero(_unpack(gone[rows], self.cfg.n_fish))
+        steps = rows[sub]
+        xy = self.frames["pos"][steps + 1, fish]
+        self.eat_events = [(float(x), float(y), int(s))
+                           for (x, y), s in zip(xy.tolist(), steps)]
+
+    def __len__(self) -> int:
+        return self.frames.shape[0]
+
+    def frame(self, i: int) -> Frame:
+        row = self.frames[i]
+        n, m = self.cfg.n_fish, self.cfg.n_sharks
+        return Frame(
+            cfg=self.cfg, step_idx=i, t=float(row["t"]),
+            pos=row["pos"].astype(float), vel=row["vel"].astype(float),
+            alive=_unpack(row["alive"], n),
+            fish_bursting=_unpack(row["fish_bursting"], n),
+            spos=row["spos"].astype(float), svel=row["svel"].astype(float),
+            shark_bursting=_unpack(row["shark_bursting"], m),
+            eat_events=self.eat_events,
+        )
+
+
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(1)
+
+
+def _unpack(bits: np.ndarray, count: int) -> np.ndarray:
+    return np.unpackbits(bits, axis=-1, count=count).astype(bool)
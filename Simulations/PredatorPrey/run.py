@@ -4,9 +4,12 @@
 Examples
 --------
     python run.py --headless                 # run once, print survival stats
+    python run.py --headless --episodes 32   # seeds 5..36 as one batched run
     python run.py --save media/demo.mp4      # render an mp4 of one episode
     python run.py --snapshot media/frame.png # single preview frame
     python run.py --watch                    # live window (needs a display)
+    python run.py --record media/ep.npy      # simulate once, save every frame
+    python run.py --replay media/ep.npy --save media/demo.mp4   # render it
 """
 
 from __future__ import annotations
@@ -17,6 +20,8 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import numpy as np  # noqa: E402
+
 from config import SimConfig  # noqa: E402
 
 
@@ -32,9 +37,25 @@ def build_config(args) -> SimConfig:
         cfg.max_seconds = args.seconds
     if args.seed is not None:
         cfg.seed = None if args.seed < 0 else args.seed
+    if args.neighbours is not None:
+        cfg.neighbour_engine = args.neighbours
     return cfg
 
 
+def run_batch(cfg: SimConfig, episodes: int) -> None:
+    """Run ``episodes`` consecutive seeds side by side on one ``BatchWorld``."""
+    import dataclasses
+
+    from sim import BatchSimulation
+
+    base = cfg.seed if cfg.seed is not None else int(np.random.SeedSequence().entropy % 2**31)
+    cfgs = [dataclasses.replace(cfg, seed=base + k) for k in range(episodes)]
+    summaries = BatchSimulation(cfgs).run(verbose=True)
+    rates = [s["survival_rate"] for s in summaries]
+    print(f"{episodes} episodes  mean survival_rate={np.mean(rates):.0%}  "
+          f"(min {min(rates):.0%}, max {max(rates):.0%})")
+
+
 def main() -> None:
     p = argparse.ArgumentParser(description="Predator / prey vector simulator")
     p.add_argument("--fish", type=int, help="number of fish")
@@ -42,6 +63,8 @@ def main() -> None:
     p.add_argument("--size", type=float, help="tank side length")
     p.add_argument("--seconds", type=float, help="episode length in seconds")
     p.add_argument("--seed", type=int, help="RNG seed (<0 for random)")
+    p.add_argument("--neighbours", choices=["dense", "grid"],
+                   help="boids neighbour engine (grid for thousands of fish)")
 
     p.add_argument("--film", metavar="PATH",
                    help="render the full bookended film (intro + rules + sim + outro) to PATH")
@@ -52,7 +75,18 @@ def main() -> None:
     p.add_argument("--watch", action="store_true", help="open a live window")
     p.add_argument("--headless", action="store_true",
                    help="run with no rendering and print stats")
+    p.add_argument("--episodes", type=int, default=1,
+                   help="with --headless: run this many seeds (seed, seed+1, ...) as one batch")
+    p.add_argument("--record", metavar="PATH",
+                   help="run one episode headless, recording every frame to PATH (.npy)")
+    p.add_argument("--replay", metavar="PATH",
+                   help="render a recorded episode (with --save / --watch) instead of simulating")
+    p.add_argument("--frames", metavar="A:B",
+                   help="with --replay: only frames A..B-1")
     p.add_argument("--fps", type=int, help="frames per second for --save")
+    p.add_argument("--workers", type=int,
+                   help="render processes for --film / --replay --save "
+                        "(--film default: all cores; 1 = render in-process)")
     p.add_argument("--dpi", type=int, default=120, help="dpi for --save / --snapshot (120 -> 1080p)")
     args = p.parse_args()
 
@@ -65,17 +99,36 @@ def main() -> None:
 
     from sim import Simulation  # noqa: E402
 
+    if args.record:
+        Simulation(cfg, record=args.record).run(verbose=True)
+        print(f"recorded {args.record}")
+        return
+
     if args.headless:
-        Simulation(cfg).run(verbose=True)
+        if args.episodes > 1:
+            run_batch(cfg, args.episodes)
+        else:
+            Simulation(cfg).run(verbose=True)
         return
 
     import viz  # noqa: E402
 
+    if args.replay:
+        start, _, stop = (args.frames or ":").partition(":")
+        start, stop = int(start or 0), int(stop) if stop else None
+        if args.save and args.workers and args.workers > 1:
+            viz.render_parallel(args.replay, args.save, workers=args.workers,
+                                fps=args.fps, dpi=args.dpi, start=start, stop=stop)
+        else:
+            viz.replay(args.replay, save=args.save, show=args.watch, fps=args.fps,
+                       dpi=args.dpi, start=start, stop=stop)
+        return
+
     if args.film:
         import tempfile
         from film import build_film
-        build_film(cfg, args.film,
-                   workdir=tempfile.mkdtemp(prefix="predprey_film_"), dpi=args.dpi)
+        build_film(cfg, args.film, workdir=tempfile.mkdtemp(prefix="predprey_film_"),
+                   dpi=args.dpi, workers=args.workers)
     if args.snapshot:
         viz.snapshot(Simulation(cfg), args.snap_steps, args.snapshot, dpi=args.dpi)
     if args.save:
@@ -11,16 +11,22 @@ import numpy as np
 
 from brains import FishBrain, SharkBrain
 from config import SimConfig
-from physics import World
+from physics import BatchWorld, World
+from record import Recorder
 
 
 class Simulation:
-    def __init__(self, cfg: SimConfig | None = None, fish_brain=None, shark_brain=None):
+    """One episode.  Pass ``record=path`` to write every frame to an episode file
+    (see ``record.py``) that ``viz.replay`` can render without re-simulating."""
+
+    def __init__(self, cfg: SimConfig | None = None, fish_brain=None, shark_brain=None,
+                 record: str | None = None):
         self.cfg = cfg or SimConfig()
         self.rng = np.random.default_rng(self.cfg.seed)
         self.world = World(self.cfg, self.rng)
         self.fish_brain = fish_brain or FishBrain()
         self.shark_brain = shark_brain or SharkBrain()
+        self.recorder = Recorder(record, self.world) if record else None
 
         # Time series of survivors, for the "collective intelligence" panel.
         self.time_history = [0.0]
@@ -34,26 +40,90 @@ class Simulation:
         w.apply(fish_accel, fish_lunge, shark_accel, shark_lunge)
         self.time_history.append(w.t)
         self.alive_history.append(w.n_alive)
+        if self.recorder is not None:
+            self.recorder.capture(w)
+            if self.done():
+                self.close()
 
     def done(self) -> bool:
         return self.world.n_alive == 0 or self.world.t >= self.cfg.max_seconds
 
+    def close(self) -> None:
+        """Finalise the episode file early (called automatically at the end)."""
+        if self.recorder is not None:
+            self.recorder.close()
+
     # --------------------------------------------------------------- headless
     def run(self, verbose: bool = False):
         """Run a whole episode with no rendering; return a small summary dict."""
         while not self.done():
             self.step()
-        summary = {
-            "survivors": self.world.n_alive,
-            "eaten": self.cfg.n_fish - self.world.n_alive,
-            "duration_s": self.world.t,
-            "survival_rate": self.world.n_alive / self.cfg.n_fish,
-        }
-        if verbose:
-            print(
-                f"t={summary['duration_s']:.1f}s  "
-                f"survivors={summary['survivors']}/{self.cfg.n_fish}  "
-                f"eaten={summary['eaten']}  "
-                f"survival_rate={summary['survival_rate']:.0%}"
-            )
-        return summary
+        return _summary(self.cfg, self.world.n_alive, self.world.t, verbose)
+
+
+class BatchSimulation:
+    """``K`` independent episodes advanced together on one ``BatchWorld``.
+
+    ``cfgs`` may differ in seed and in any per-tank ``SimConfig`` field (weights,
+    speeds, radii, ``max_seconds``; see ``physics.SHARED_FIELDS`` for the ones
+    that must match).  Each brain call and physics step covers every tank at
+    once, and episode ``k`` plays out exactly like ``Simulation(cfgs[k])`` —
+    finished tanks simply stop advancing while the rest run on.
+    """
+
+    def __init__(self, cfgs: list[SimConfig], fish_brain=None, shark_brain=None):
+        self.cfgs = list(cfgs)
+        rngs = [np.random.default_rng(c.seed) for c in self.cfgs]
+        self.world = BatchWorld(self.cfgs, rngs)
+        self.fish_brain = fish_brain or FishBrain()
+        self.shark_brain = shark_brain or SharkBrain()
+        self.max_seconds = np.array([c.max_seconds for c in self.cfgs])
+
+        # One survivors time series per episode.
+        self.time_history = [[0.0] for _ in self.cfgs]
+        self.alive_history = [[int(n)] for n in self.world.n_alive]
+
+    # ------------------------------------------------------------------ step
+    def step(self) -> None:
+        w = self.world
+        w.active = ~self.episode_done()
+        fish_accel, fish_lunge = self.fish_brain.fish_act(w)
+        shark_accel, shark_lunge = self.shark_brain.act(w)
+        w.apply(fish_accel, fish_lunge, shark_accel, shark_lunge)
+        n_alive = w.n_alive
+        for k in np.flatnonzero(w.active):
+            self.time_history[k].append(float(w.t[k]))
+            self.alive_history[k].append(int(n_alive[k]))
+
+    def episode_done(self) -> np.ndarray:
+        """Per-episode ``Simulation.done``."""
+        return (self.world.n_alive == 0) | (self.world.t >= self.max_seconds)
+
+    def done(self) -> bool:
+        return bool(self.episode_done().all())
+
+    # --------------------------------------------------------------- headless
+    def run(self, verbose: bool = False) -> list[dict]:
+        """Run every episode to the end; one ``Simulation.run`` summary per episode."""
+        while not self.done():
+            self.step()
+        w = self.world
+        return [_summary(cfg, int(n), float(t), verbose)
+                for cfg, n, t in zip(self.cfgs, w.n_alive, w.t)]
+
+
+def _summary(cfg: SimConfig, n_alive: int, t: float, verbose: bool) -> dict:
+    summary = {
+        "survivors": n_alive,
+        "eaten": cfg.n_fish - n_alive,
+        "duration_s": t,
+        "survival_rate": n_alive / cfg.n_fish,
+    }
+    if verbose:
+        print(
+            f"t={summary['duration_s']:.1f}s  "
+            f"survivors={summary['survivors']}/{cfg.n_fish}  "
+            f"eaten={summary['eaten']}  "
+            f"survival_rate={summary['survival_rate']:.0%}"
+        )
+    return summary
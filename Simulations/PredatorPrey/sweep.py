@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Parameter sweeps over ``SimConfig``: many headless episodes on every core.
+
+Each axis is ``field=values``; every episode is one full ``SimConfig``, run
+headless and summarised exactly like ``Simulation.run()``.
+
+* grid search   — ``field=a,b,c`` axes are crossed (a single value just fixes
+  the field);
+* random search — with ``--samples N`` each axis is sampled instead: lists
+  uniformly, ``field=lo:hi`` ranges uniformly (integers inclusive).
+
+Every config is crossed with ``--seeds``.  Episodes are grouped into chunks of
+configs that share array shapes and each chunk runs as one ``BatchSimulation``
+inside a ``ProcessPoolExecutor`` worker, so per-episode Python overhead is paid
+once per chunk.  Results stream into an append-only CSV keyed by a hash of the
+full config: rerunning the same command after an interruption skips every
+episode already on disk.
+
+Examples
+--------
+    python sweep.py shark_cruise=16,18,20,22 w_evade=3,3.7,4.5 --seeds 20 \\
+        --out sweeps/cruise.csv
+    python sweep.py shark_cruise=16:24 fish_burst=30:40 --samples 500 --seeds 4 \\
+        --out sweeps/random.csv --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+
+from config import SimConfig  # noqa: E402
+from physics import SHARED_FIELDS  # noqa: E402
+
+FIELDS = [f.name for f in dataclasses.fields(SimConfig)]
+SUMMARY = ["survivors", "eaten", "duration_s", "survival_rate"]
+COLUMNS = ["key"] + FIELDS + SUMMARY
+
+
+# ------------------------------------------------------------------- configs
+def config_key(cfg: SimConfig) -> str:
+    """Stable hash of every field of ``cfg`` (the store's primary key)."""
+    blob = json.dumps(dataclasses.asdict(cfg), sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def parse_axis(spec: str):
+    """``'name=a,b'`` -> (name, [a, b]);  ``'name=lo:hi'`` -> (name, (lo, hi))."""
+    name, sep, values = spec.partition("=")
+    if not sep or name not in FIELDS:
+        raise ValueError(f"bad axis {spec!r}: expected <SimConfig field>=<values>")
+    kind = type(getattr(SimConfig(), name))
+    if ":" in values:
+        lo, hi = values.split(":")
+        return name, (kind(lo), kind(hi))
+    return name, [kind(v) for v in values.split(",")]
+
+
+def build_configs(axes, samples: int | None, seeds, sweep_seed: int = 0):
+    """Expand the axes (grid, or ``samples`` random draws) and cross with ``seeds``."""
+    if samples is None:
+        ranged = [name for name, vals in axes if isinstance(vals, tuple)]
+        if ranged:
+            raise ValueError(f"lo:hi ranges need --samples (got {', '.join(ranged)})")
+        points = [dict(zip([n for n, _ in axes], combo))
+                  for combo in itertools.product(*[v for _, v in axes])]
+    else:
+        rng = np.random.default_rng(sweep_seed)
+        points = []
+        for _ in range(samples):
+            point = {}
+            for name, vals in axes:
+                if isinstance(vals, list):
+                    point[name] = vals[rng.integers(len(vals))]
+                elif isinstance(vals[0], int):
+                    point[name] = int(rng.integers(vals[0], vals[1] + 1))
+                else:
+                    point[name] = float(rng.uniform(*vals))
+            points.append(point)
+    return [dataclasses.replace(SimConfig(), **{"seed": seed, **point})
+            for point in points for seed in seeds]
+
+
+def chunk(cfgs, size: int):
+    """Group configs that can share a ``BatchWorld``, ``size`` at a time."""
+    groups: dict[tuple, list[SimConfig]] = {}
+    for cfg in cfgs:
+        groups.setdefault(tuple(getattr(cfg, f) for f in SHARED_FIELDS), []).append(cfg)
+    for group in groups.values():
+        for i in range(0, len(group), size):
+            yield group[i:i + size]
+
+
+# --------------------------------------------------------------------- store
+def load_done(path: str) -> set[str]:
+    """Keys already in the store (a torn last line from a crash is ignored)."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline="") as f:
+        return {row["key"] for row in csv.DictReader(f)
+                if row.get(SUMMARY[-1]) not in (None, "")}
+
+
+def open_store(path: str):
+    """Open the CSV for appending, writing the header on first use."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fresh = not os.path.exists(path) or os.path.getsize(path) == 0
+    if not fresh:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+    f = open(path, "a", newline="")
+    if not fresh and torn:
+        f.write("\n")
+    writer = csv.DictWriter(f, fieldnames=COLUMNS)
+    if fresh:
+        writer.writeheader()
+    return f, writer
+
+
+# ------------------------------------------------------------------- workers
+def _run_chunk(cfgs):
+    """Worker body: run one chunk as a single batch; return store rows."""
+    from sim import BatchSimulation
+
+    summaries = BatchSimulation(cfgs).run()
+    return [{"key": config_key(cfg), **dataclasses.asdict(cfg), **s}
+            for cfg, s in zip(cfgs, summaries)]
+
+
+def run_sweep(cfgs, out: str, workers: int | None = None, batch: int = 16) -> int:
+    """Run every config not yet in ``out``; return how many episodes ran."""
+    done = load_done(out)
+    todo = list({config_key(c): c for c in cfgs if config_key(c) not in done}.values())
+    print(f"[sweep] {len(cfgs)} episodes, {len(cfgs) - len(todo)} already in {out}, "
+          f"{len(todo)} to run")
+    if not todo:
+        return 0
+
+    f, writer = open_store(out)
+    t0, finished = time.perf_counter(), 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_chunk, c) for c in chunk(todo, batch)]
+            for fut in as_completed(futures):
+                rows = fut.result()
+                writer.writerows(rows)
+                f.flush()
+                finished += len(rows)
+                rate = finished / (time.perf_counter() - t0) * 3600
+                print(f"[sweep] {finished}/{len(todo)}  ({rate:,.0f} episodes/h)")
+    finally:
+        f.close()
+    return finished
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Parameter sweep over SimConfig")
+    p.add_argument("axes", nargs="*", metavar="FIELD=VALUES",
+                   help="a,b,c (grid / choices) or lo:hi (random range)")
+    p.add_argument("--seeds", type=int, default=1,
+                   help="episodes per config, seeds 0..N-1 (default 1)")
+    p.add_argument("--samples", type=int,
+                   help="random search: draw this many configs instead of a grid")
+    p.add_argument("--sweep-seed", type=int, default=0, help="RNG seed for --samples")
+    p.add_argument("--out", required=True, help="CSV result store (appended to)")
+    p.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    p.add_argument("--batch", type=int, default=16,
+                   help="episodes per worker task, run as one batch (default 16)")
+    args = p.parse_args()
+
+    try:
+        axes = [parse_axis(a) for a in args.axes]
+        cfgs = build_configs(axes, args.samples, range(args.seeds), args.sweep_seed)
+    except ValueError as e:
+        p.error(str(e))
+    run_sweep(cfgs, args.out, workers=args.workers, batch=args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ Two views share the figure:
 * ``StatsView``  — survivors over time, i.e. the "# of surviving fish" curve
   the RL engine will grow across generations.
 
+``animate`` drives a live ``Simulation``; ``replay`` and ``render_parallel``
+draw a recorded episode file (``record.py``) instead, so no physics is re-run.
+
 Nothing here imports ``pyplot`` at module load beyond the standard alias, so the
 caller can pick the backend (Agg for saving, an interactive one for a window)
 before importing this module.
@@ -15,13 +18,25 @@ before importing this module.
 
 from __future__ import annotations
 
+import contextlib
+import os
+import shutil
+import subprocess
+import tempfile
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import matplotlib as mpl
 import matplotlib.pyplot as plt
-from matplotlib.animation import FFMpegWriter, FuncAnimation
+from matplotlib.animation import FuncAnimation
+from matplotlib.axis import Axis
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.colors import LinearSegmentedColormap, to_rgba
-from matplotlib.patches import Circle, Rectangle
+from matplotlib.patches import Circle, Polygon, Rectangle
 
 from physics import World
+from record import Episode
 
 # --- palette ------------------------------------------------------------------
 BG = "#0b1020"
@@ -44,8 +59,6 @@ class ArenaView:
         self.fish_len = 0.022 * s
         self.shark_len = 0.045 * s
         self.flash_life = int(round(0.6 / cfg.dt))
-        self._flash_ptr = 0
-        self._flashes: list[tuple[float, float, int]] = []
 
         ax.set_xlim(0, s)
         ax.set_ylim(0, s)
@@ -91,6 +104,9 @@ class ArenaView:
             color=TEXT, fontsize=15, family="monospace",
             bbox=dict(boxstyle="round,pad=0.5", fc=PANEL, ec=GRID, alpha=0.85),
         )
+        # Everything ``update`` touches; the rest of the axes is static.
+        self.artists = (self.fish_q, *self.kill_rings, *self.sense_rings,
+                        self.shark_q, self.flash, self.hud)
 
     def update(self, world: World):
         cfg = world.cfg
@@ -111,16 +127,18 @@ class ArenaView:
             sr.center = tuple(world.spos[k])
 
         # --- eat flashes (expand + fade) -----------------------------------
-        while self._flash_ptr < len(world.eat_events):
-            self._flashes.append(world.eat_events[self._flash_ptr])
-            self._flash_ptr += 1
+        # Events are in step order, so the live window is one bisect away; no
+        # state is kept between frames, which lets a replay draw any frame.
         now = world.step_idx
-        self._flashes = [f for f in self._flashes if now - f[2] < self.flash_life]
-        if self._flashes:
-            age = np.array([(now - f[2]) / self.flash_life for f in self._flashes])
-            xy = np.array([[f[0], f[1]] for f in self._flashes])
+        events = world.eat_events
+        lo = bisect_left(events, now - self.flash_life + 1, key=_event_step)
+        hi = bisect_right(events, now, key=_event_step)
+        flashes = events[lo:hi]
+        if flashes:
+            age = np.array([(now - f[2]) / self.flash_life for f in flashes])
+            xy = np.array([[f[0], f[1]] for f in flashes])
             sizes = 40.0 + age * 520.0
-            colors = np.tile(to_rgba(EAT), (len(self._flashes), 1))
+            colors = np.tile(to_rgba(EAT), (len(flashes), 1))
             colors[:, 3] = (1.0 - age) * 0.65
             self.flash.set_offsets(xy)
             self.flash.set_sizes(sizes)
@@ -163,17 +181,37 @@ class StatsView:
                 color=MUTED, fontsize=11, va="bottom", ha="left")
 
         (self.line,) = ax.plot([], [], color="#39c5bb", lw=2.6)
+        self.fill = ax.add_patch(Polygon(np.zeros((1, 2)), color="#39c5bb", alpha=0.16))
         self.tip = ax.scatter([], [], s=64, color="#ffd23f", zorder=5)
         self.tip_txt = ax.text(0, 0, "", color=TEXT, fontsize=13, weight="bold",
                                va="center", ha="left")
-        self.fill = None
+        self.artists = (self.fill, self.line, self.tip_txt, self.tip)
+        self._xs = self._ys = np.empty(0)
+        self._seen = 0
 
     def update(self, times, alive):
-        self.line.set_data(times, alive)
-        if self.fill is not None:
-            self.fill.remove()
-        self.fill = self.ax.fill_between(times, alive, color="#39c5bb", alpha=0.16)
-        tx, ty = times[-1], alive[-1]
+        # The curve is a step function, so only the samples either side of a
+        # change are vertices — the drawn shape is identical and it grows with
+        # the number of fish eaten, not with time.  New samples are folded in
+        # incrementally; a shorter history (a replay jumping back) starts over.
+        n = len(alive)
+        if n < self._seen or self._seen == 0:
+            self._xs, self._ys = np.array([times[0]], float), np.array([alive[0]], float)
+            self._seen = 1
+        if n > self._seen:
+            lo = self._seen - 1
+            ts = np.asarray(times[lo:n], float)
+            ys = np.asarray(alive[lo:n], float)
+            k = np.flatnonzero(np.diff(ys)) + 1
+            keep = np.column_stack([k - 1, k]).ravel()
+            self._xs = np.concatenate([self._xs, ts[keep]])
+            self._ys = np.concatenate([self._ys, ys[keep]])
+            self._seen = n
+        tx, ty = float(times[n - 1]), float(alive[n - 1])
+        xs, ys = np.append(self._xs, tx), np.append(self._ys, ty)
+        self.line.set_data(xs, ys)
+        self.fill.set_xy(np.column_stack([np.r_[xs[0], xs, tx], np.r_[0.0, ys, 0.0]]))
+
         self.tip.set_offsets([[tx, ty]])
         near_edge = tx > 0.85 * self.xmax
         self.tip_txt.set_position((tx - 0.015 * self.xmax if near_edge else tx + 0.015 * self.xmax,
@@ -211,7 +249,6 @@ def animate(sim, seconds=None, save=None, show=False, fps=None, dpi=120):
     fig, arena, stats = make_figure(sim.world)
     seconds = seconds if seconds is not None else sim.cfg.max_seconds
     total = int(round(seconds / sim.cfg.dt))
-    fps = fps or int(round(1.0 / sim.cfg.dt))
 
     def frame(_):
         if not sim.done():
@@ -220,22 +257,186 @@ def animate(sim, seconds=None, save=None, show=False, fps=None, dpi=120):
         stats.update(sim.time_history, sim.alive_history)
         return ()
 
-    anim = FuncAnimation(fig, frame, frames=total, interval=1000 * sim.cfg.dt, blit=False)
+    return _finish(fig, (arena, stats), frame, range(total), sim.cfg, save, show, fps, dpi)
+
+
+def replay(path, save=None, show=False, fps=None, dpi=120, start=0, stop=None,
+           verbose=True, ffmpeg=None):
+    """Render a recorded episode file (see ``record.py``) without re-simulating.
+
+    ``start`` / ``stop`` pick a frame range; any frame can be drawn directly.
+    Frames past the end of a short episode hold its final state, as ``animate``
+    does.
+    """
+    ep = Episode(path)
+    stop = len(ep) if stop is None else stop
+    fig, arena, stats = make_figure(ep.frame(start))
+
+    def frame(i):
+        i = min(i, len(ep) - 1)
+        arena.update(ep.frame(i))
+        stats.update(ep.times[: i + 1], ep.alive_counts[: i + 1])
+        return ()
+
+    return _finish(fig, (arena, stats), frame, range(start, stop), ep.cfg, save, show,
+                   fps, dpi, verbose, ffmpeg)
+
+
+def render_parallel(path, save, workers=None, chunks=None, fps=None, dpi=120,
+                    start=0, stop=None, ffmpeg="ffmpeg"):
+    """Render a recorded episode to the mp4 ``save`` on several cores.
+
+    The frame range is cut into ``chunks`` contiguous pieces (default: one per
+    worker).  Each worker process draws its piece through ``replay`` with its
+    own Agg figure — the survivors panel still gets the full history up to each
+    frame — and encodes a segment; ffmpeg's concat demuxer then joins the
+    segments without re-encoding.  ``ffmpeg`` is used for the segments too.
+    """
+    stop = len(Episode(path)) if stop is None else stop
+    if stop <= start:
+        raise ValueError(f"empty frame range {start}:{stop}")
+    workers = workers or os.cpu_count() or 1
+    chunks = max(1, min(chunks or workers, stop - start))
+    bounds = np.linspace(start, stop, chunks + 1).round().astype(int)
+    workdir = tempfile.mkdtemp(prefix="predprey_render_")
+    segments = [os.path.join(workdir, f"seg{k:04d}.mp4") for k in range(chunks)]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_render_segment, [path] * chunks, segments,
+                          bounds[:-1].tolist(), bounds[1:].tolist(),
+                          [fps] * chunks, [dpi] * chunks, [ffmpeg] * chunks))
+        listing = os.path.join(workdir, "segments.txt")
+        with open(listing, "w") as f:
+            f.writelines(f"file '{seg}'\n" for seg in segments)
+        subprocess.run([
+            ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+            "-i", listing, "-c", "copy", "-movflags", "+faststart", save,
+        ], check=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(f"saved {save}  ({stop - start} frames, {chunks} chunks on {workers} workers)")
+    return save
+
+
+def _render_segment(path, seg, start, stop, fps, dpi, ffmpeg):
+    plt.switch_backend("Agg")
+    replay(path, save=seg, fps=fps, dpi=dpi, start=start, stop=stop, verbose=False,
+           ffmpeg=ffmpeg)
+
+
+def _finish(fig, views, frame, frames, cfg, save, show, fps, dpi, verbose=True,
+            ffmpeg=None):
+    anim = None
     if save:
-        # High-quality H.264: crf 18 is visually near-lossless; yuv420p plays everywhere.
-        writer = FFMpegWriter(
-            fps=fps, codec="libx264",
-            extra_args=["-pix_fmt", "yuv420p", "-crf", "18", "-preset", "medium"],
-            metadata={"artist": "PredatorPrey"},
-        )
-        anim.save(save, writer=writer, dpi=dpi)
-        print(f"saved {save}")
+        write_video(fig, views, frame, frames, save, fps or int(round(1.0 / cfg.dt)), dpi,
+                    ffmpeg)
+        if verbose:
+            print(f"saved {save}")
     if show:
+        anim = FuncAnimation(fig, frame, frames=frames, interval=1000 * cfg.dt, blit=False)
         plt.show()
     plt.close(fig)
     return anim
 
 
+def write_video(fig, views, frame, frames, save, fps, dpi, ffmpeg=None):
+    """Encode ``frame(i)`` for every ``i`` in ``frames`` to the mp4 ``save``.
+
+    The static parts of the figure (axes, labels, rules key) are drawn once and
+    cached; each frame restores that background, redraws the views' layers
+    (see ``_blit_layers``) in z-order and pipes the raw RGBA canvas into
+    ffmpeg's stdin — no per-frame ``savefig`` or PNG round trip.  ``ffmpeg``
+    defaults to matplotlib's ``animation.ffmpeg_path``.
+    """
+    fig.set_dpi(dpi)
+    canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+    artists, gridlines = _blit_layers(views)
+    # Ticks draw their gridlines even when animated, so those are hidden instead.
+    for a in artists:
+        a.set_animated(True)
+    try:
+        for g in gridlines:
+            g.set_visible(False)
+        try:
+            canvas.draw()
+        finally:
+            for g in gridlines:
+                g.set_visible(True)
+        background = canvas.copy_from_bbox(fig.bbox)
+
+        def draw(i):
+            frame(i)
+            canvas.restore_region(background)
+            for a in artists:
+                fig.draw_artist(a)
+            return canvas.buffer_rgba()
+
+        _pipe_frames(draw, frames, canvas.get_width_height(), save, fps,
+                     ffmpeg or mpl.rcParams["animation.ffmpeg_path"])
+    finally:
+        for a in artists:
+            a.set_animated(False)
+
+
+def _pipe_frames(draw, frames, size, save, fps, ffmpeg):
+    """Write the RGBA buffer ``draw(i)`` of every ``i`` in ``frames`` into an
+    ffmpeg encoding ``save``.  An error while drawing is raised as is; ffmpeg's
+    exit status is checked once every frame has been written, or when it broke
+    the pipe by exiting early."""
+    width, height = size
+    # High-quality H.264: crf 18 is visually near-lossless; yuv420p plays everywhere.
+    proc = subprocess.Popen([
+        ffmpeg, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps),
+        "-i", "-", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", "18", "-preset", "medium",
+        "-metadata", "artist=PredatorPrey", save,
+    ], stdin=subprocess.PIPE)
+    try:
+        for i in frames:
+            proc.stdin.write(draw(i))
+    except BaseException as exc:
+        with contextlib.suppress(OSError):
+            proc.stdin.close()
+        if proc.wait() and isinstance(exc, BrokenPipeError):
+            raise subprocess.CalledProcessError(proc.returncode, proc.args) from exc
+        raise
+    with contextlib.suppress(BrokenPipeError):   # ffmpeg gone: its status says why
+        proc.stdin.close()
+    if proc.wait():
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+
+def _blit_layers(views):
+    """Per view, its ``artists`` plus every static artist of its axes drawn at
+    or above the lowest of them, in the order ``Axes.draw`` uses.
+
+    Static decorations stacked over a moving artist (the survivors fill sits
+    under the grid, spines and ½-population line) must be redrawn over it each
+    frame, so they are left out of the cached background as well.  Of an
+    ``Axis`` only the gridlines reach inside the axes, where the views draw;
+    its ticks and labels stay in the background.  Returns the layers and, of
+    those, the gridlines.
+    """
+    layers, gridlines = [], []
+    for v in views:
+        moving = set(v.artists)
+        lowest = min(a.get_zorder() for a in moving)
+        layer = []
+        for a in v.ax.get_children():
+            if a is v.ax.patch or not a.get_visible():
+                continue
+            if a in moving or a.get_zorder() >= lowest:
+                if isinstance(a, Axis):
+                    parts = [g for g in a.get_gridlines() if g.get_visible()]
+                    gridlines.extend(parts)
+                else:
+                    parts = [a]
+                layer.extend((a.get_zorder(), p) for p in parts)
+        layers.extend(p for _, p in sorted(layer, key=lambda zp: zp[0]))
+    return layers, gridlines
+
+
 def snapshot(sim, steps, path, dpi=120):
     """Advance ``steps`` steps and save a single PNG (for previews / checks)."""
     fig, arena, stats = make_figure(sim.world)
@@ -250,6 +451,10 @@ def snapshot(sim, steps, path, dpi=120):
     print(f"saved {path}")
 
 
+def _event_step(event):
+    return event[2]
+
+
 def _dir(v, eps=1e-9):
     n = np.linalg.norm(v, axis=-1, keepdims=True)
     return v / np.maximum(n, eps)
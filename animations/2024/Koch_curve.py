@@ -1,5 +1,7 @@
 from manim import *
 
+from fractal_geometry import koch_points
+
 class KochCurve(Scene):
     def construct(self):
         intro_group = self.introduction("Koch Curve Animation", 
@@ -21,43 +23,15 @@ class KochCurve(Scene):
         self.play(Create(triangle))
         self.wait(1)
 
-        lines = [Line(A, B), Line(B, C), Line(C, A)]
-        for i in range(iterations):
-            new_lines = []
-            for line in lines:
-                segments = self.koch_segment(line.get_start_and_end())
-                self.play(Transform(line, segments[0]))
-                self.add(*segments[1:])  
-                new_lines.extend(segments)
-            lines = new_lines
-    
-    def koch_segment(self, segment):
-        """
-        Generates the four segments of the Koch curve for a given line segment.
-        :param segment: a tuple of two points (start, end)
-        :returns: list of Line objects representing the Koch segment
-        """
-        start, end = segment
-        
-        A = start
-        E = end
-        B = A + (E - A) / 3
-        D = E - (E - A) / 3
-
-        angle = -np.pi / 3 
-        rotation_matrix = np.array([
-            [np.cos(angle), -np.sin(angle), 0],
-            [np.sin(angle), np.cos(angle), 0],
-            [0, 0, 1]
-        ])
-        C = B + np.dot(rotation_matrix, D - B)
-
-        return [
-            Line(A, B),
-            Line(B, C),
-            Line(C, D),
-            Line(D, E)
-        ]
+        # The whole curve is one VMobject. Each iteration first swaps in the
+        # next iteration's points laid flat on the current segments (same
+        # shape), then transforms them into the real bumps.
+        curve = VMobject().set_points_as_corners(koch_points([A, B, C], 0))
+        self.add(curve)
+        for i in range(1, iterations + 1):
+            curve.set_points_as_corners(koch_points([A, B, C], i, flat=True))
+            bumps = curve.copy().set_points_as_corners(koch_points([A, B, C], i))
+            self.play(Transform(curve, bumps), run_time=2)
 
     def introduction(self, title1, title2):
         header = Tex(title1)
@@ -1,50 +1,18 @@
 from manim import *
 import numpy as np
 
+from fractal_geometry import sierpinski_points
+
 class SierpinskiCurve(VMobject):
     def __init__(self, order=1, scale_factor=1, **kwargs):
         super().__init__(**kwargs)
         self.order = order
         self.scale_factor = scale_factor
-        self.angle = 45 * DEGREES
         self.create_curve()
 
     def create_curve(self):
-        instructions = self.generate_l_system(self.order)
-        self.build_path(instructions)
-
-    def generate_l_system(self, order):
-        if order == 0:
-            return "X"
-        else:
-            prev = self.generate_l_system(order - 1)
-            return prev.replace("X", "XF+G+XF--F--XF+G+X").replace("G", "GG")
-
-    def build_path(self, instructions):
-        current_point = ORIGIN
-        direction = np.array(RIGHT)  # Convert to numpy array for manipulation
-        path_points = [current_point]
-
-        for command in instructions:
-            if command in "FG":
-                next_point = current_point + direction * self.scale_factor
-                path_points.append(next_point)
-                current_point = next_point
-            elif command == "+":
-                direction = self.rotate_vector(direction, self.angle)  # Rotate by +45 degrees
-            elif command == "-":
-                direction = self.rotate_vector(direction, -self.angle)  # Rotate by -45 degrees
-
-        self.set_points_as_corners(path_points)
-
-    def rotate_vector(self, vector, angle):
-        """Rotate a 3D vector by a given angle around the z-axis."""
-        rotation_matrix = np.array([
-            [np.cos(angle), -np.sin(angle), 0],
-            [np.sin(angle), np.cos(angle), 0],
-            [0, 0, 1]
-        ])
-        return rotation_matrix @ vector  # Apply rotation to the vector
+        # Expanded and walked as arrays (see fractal_geometry.sierpinski_points).
+        self.set_points_as_corners(sierpinski_points(self.order) * self.scale_factor)
 
 class SierpinskiCurveScene(Scene):
     def construct(self):
@@ -0,0 +1,117 @@
+"""Double-pendulum trajectories, integrated ahead of time.
+
+The scenes in ``pendulum.py`` never integrate inside an updater: the run is
+solved once before rendering into a time-indexed table, and each frame only
+looks up (and linearly interpolates) the state at its scene time.  The
+picture is then the same at any frame rate, and the per-frame cost is a
+lookup.
+
+* ``trajectory``   one pendulum, adaptive ``solve_ivp`` (DOP853), sampled on a
+                   fixed time grid;
+* ``integrate``    fixed-step RK4 on a whole batch of pendulums at once,
+                   ``(K, 4)`` arrays, for the chaos fan-out.
+
+A state is ``[theta1, theta2, omega1, omega2]``; angles are measured from the
+downward vertical and are not wrapped, so interpolation between samples is
+safe.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+L1 = 1
+L2 = 1
+m1 = 1
+m2 = 1
+g = 9.8
+
+DT = 0.0025  # Integration / sampling step, in simulated seconds
+
+
+def derivs(state):
+    """Time derivative of one ``(4,)`` state or a batch ``(..., 4)`` of them."""
+    theta1, theta2, omega1, omega2 = np.moveaxis(np.asarray(state), -1, 0)
+    delta = theta2 - theta1
+    sin_d, cos_d = np.sin(delta), np.cos(delta)
+    w1_sq, w2_sq = omega1 * omega1, omega2 * omega2
+
+    den1 = (m1 + m2) * L1 - m2 * L1 * cos_d * cos_d
+    den2 = (L2 / L1) * den1
+
+    domega1 = ((m2 * L1 * w1_sq * sin_d * cos_d
+                + m2 * g * np.sin(theta2) * cos_d
+                + m2 * L2 * w2_sq * sin_d
+                - (m1 + m2) * g * np.sin(theta1))
+               / den1)
+
+    domega2 = ((- m2 * L2 * w2_sq * sin_d * cos_d
+                + (m1 + m2) * (g * np.sin(theta1) * cos_d
+                               - L1 * w1_sq * sin_d
+                               - g * np.sin(theta2)))
+               / den2)
+
+    return np.stack([omega1, omega2, domega1, domega2], axis=-1)
+
+
+def rk4_step(state, dt):
+    """One classical Runge-Kutta step, for a single state or a batch."""
+    k1 = derivs(state)
+    k2 = derivs(state + 0.5 * dt * k1)
+    k3 = derivs(state + 0.5 * dt * k2)
+    k4 = derivs(state + dt * k3)
+    return state + (k1 + 2 * k2 + 2 * k3 + k4) * (dt / 6)
+
+
+@dataclass
+class Trajectory:
+    """States sampled every ``dt`` simulated seconds from t = 0.
+
+    ``states`` is ``(samples, 4)`` for one pendulum or ``(samples, K, 4)`` for
+    a batch.
+    """
+    dt: float
+    states: np.ndarray
+
+    @property
+    def duration(self):
+        return (len(self.states) - 1) * self.dt
+
+    def at(self, t):
+        """State(s) at time ``t``, linearly interpolated between samples
+        (clamped to the simulated span)."""
+        x = min(max(t / self.dt, 0.0), len(self.states) - 1)
+        i = min(int(x), len(self.states) - 2)
+        frac = x - i
+        return self.states[i] * (1.0 - frac) + self.states[i + 1] * frac
+
+
+def trajectory(state0, duration, dt=DT, rtol=1e-10, atol=1e-10):
+    """Solve one pendulum with ``solve_ivp`` and sample it every ``dt``."""
+    times = np.arange(int(np.ceil(duration / dt)) + 1) * dt
+    sol = solve_ivp(lambda t, y: derivs(y), (0.0, times[-1]), np.asarray(state0, dtype=float),
+                    method="DOP853", t_eval=times, rtol=rtol, atol=atol)
+    return Trajectory(dt, sol.y.T.copy())
+
+
+def integrate(states0, duration, dt=DT, sample_every=1):
+    """Advance a ``(K, 4)`` batch with fixed-step RK4, keeping every
+    ``sample_every``-th step; the returned table is sampled every
+    ``dt * sample_every``."""
+    state = np.array(states0, dtype=float)
+    samples = int(np.ceil(duration / (dt * sample_every)))
+    states = np.empty((samples + 1,) + state.shape)
+    states[0] = state
+    for i in range(1, samples + 1):
+        for _ in range(sample_every):
+            state = rk4_step(state, dt)
+        states[i] = state
+    return Trajectory(dt * sample_every, states)
+
+
+def bob_positions(state):
+    """``(..., 2, 2)`` positions of the two bobs relative to the pivot."""
+    theta1, theta2 = state[..., 0], state[..., 1]
+    p1 = np.stack([L1 * np.sin(theta1), -L1 * np.cos(theta1)], axis=-1)
+    p2 = p1 + np.stack([L2 * np.sin(theta2), -L2 * np.cos(theta2)], axis=-1)
+    return np.stack([p1, p2], axis=-2)
@@ -0,0 +1,97 @@
+"""Fractal curves as NumPy point arrays, for ``Koch_curve.py`` and ``Sierpinski.py``.
+
+L-systems are expanded on integer symbol arrays: every symbol's replacement is
+gathered at once, so a generation is a couple of array operations rather than a
+``str.replace`` per rule. A turtle walk becomes a cumulative sum: the heading
+at each step is the running sum of the turns before it, and the positions are
+the running sum of the steps. Headings are multiples of the turn angle, so the
+unit steps come from a lookup table and do not drift the way a rotation matrix
+applied once per turn would.
+
+The scenes then draw a whole curve as one ``VMobject`` (``set_points_as_corners``)
+rather than one ``Line`` per segment.
+"""
+import numpy as np
+
+
+def l_system(axiom, rules, order):
+    """Expand ``axiom`` ``order`` times; returns the result as a ``uint8`` array
+    of character codes. ``rules`` maps a character to its replacement, and
+    characters without a rule are copied unchanged."""
+    replacement = [bytes([c]) for c in range(256)]
+    for symbol, text in rules.items():
+        replacement[ord(symbol)] = text.encode()
+    lengths = np.array([len(r) for r in replacement])
+    table = np.zeros((256, lengths.max()), dtype=np.uint8)
+    for c, r in enumerate(replacement):
+        table[c, :len(r)] = np.frombuffer(r, dtype=np.uint8)
+
+    symbols = np.frombuffer(axiom.encode(), dtype=np.uint8)
+    for _ in range(order):
+        counts = lengths[symbols]
+        source = np.repeat(symbols, counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        symbols = table[source, offset]
+    return symbols
+
+
+def turtle_points(symbols, angle_steps, forward="F", left="+", right="-", start_heading=0):
+    """Corners visited by a turtle reading ``symbols``, as an ``(n + 1, 3)`` array.
+
+    Each ``forward`` character moves one unit, and ``left`` / ``right`` turn by
+    ``2*pi / angle_steps`` counterclockwise / clockwise. ``start_heading``
+    counts those turns from the +x axis. Every other character is ignored.
+    """
+    symbols = np.asarray(symbols)
+    turn_of = np.zeros(256, dtype=np.int64)
+    turn_of[list(left.encode())] = 1
+    turn_of[list(right.encode())] = -1
+    move_of = np.zeros(256, dtype=bool)
+    move_of[list(forward.encode())] = True
+    moves = move_of[symbols]
+    heading = (start_heading + np.cumsum(turn_of[symbols])[moves]) % angle_steps
+
+    phi = 2 * np.pi * np.arange(angle_steps) / angle_steps
+    unit = np.column_stack([np.cos(phi), np.sin(phi), np.zeros(angle_steps)])
+    unit[np.abs(unit) < 1e-15] = 0.0
+    points = np.zeros((moves.sum() + 1, 3))
+    np.cumsum(unit[heading], axis=0, out=points[1:])
+    return points
+
+
+def sierpinski_points(order):
+    """The Sierpinski curve of ``Sierpinski.py``, ``X -> XF+G+XF--F--XF+G+X``
+    and then ``G -> GG`` each generation, with 45-degree turns and unit steps.
+
+    The scene applies the two rules one after the other, so the ``G`` just
+    written by the ``X`` rule is doubled at once too. One pass with
+    ``X -> XF+GG+XF--F--XF+GG+X`` and ``G -> GG`` does the same."""
+    symbols = l_system("X", {"X": "XF+GG+XF--F--XF+GG+X", "G": "GG"}, order)
+    return turtle_points(symbols, 8, forward="FG")
+
+
+def koch_points(corners, iterations, flat=False):
+    """Koch curve on the closed polygon ``corners``, as an ``(n + 1, 3)`` array
+    of corners that ends where it starts.
+
+    Every segment A -> E becomes A, B, C, D, E: B and D at its thirds, and C
+    the peak of an equilateral bump, turned clockwise from the segment as in
+    ``KochCurve.koch_segment``. With ``flat`` the last iteration leaves each
+    peak on the segment, so the curve has the next iteration's point count but
+    the previous one's shape, and the bumps can grow out of it with
+    ``Transform``.
+    """
+    points = np.asarray(corners, dtype=float)
+    points = np.vstack([points, points[:1]])
+    peak = np.exp(-1j * np.pi / 3)                     # rotation by -60 degrees
+    for i in range(iterations):
+        a, e = points[:-1], points[1:]
+        b = a + (e - a) / 3
+        d = e - (e - a) / 3
+        if flat and i == iterations - 1:
+            c = (a + e) / 2
+        else:
+            bd = (d - b)[:, 0] + 1j * (d - b)[:, 1]
+            c = b + np.column_stack([(bd * peak).real, (bd * peak).imag, np.zeros(len(bd))])
+        points = np.vstack([np.stack([a, b, c, d], axis=1).reshape(-1, 3), points[-1:]])
+    return points
@@ -1,11 +1,13 @@
 from manim import *
-import random
+import math
+
+import numpy as np
 
 class GaltonBoard(Scene):
     config = {
         "runTime": 60,
-        "itemsTotal": 200,
-        "itemDelayFrames": 10,
+        "itemsTotal": 10000,
+        "releaseSeconds": 50,
         "hexSize": 0.2,
         "hexVerticalShift": 0.6,
         "hexGorizontalShift": 0.4,
@@ -14,57 +16,70 @@ class GaltonBoard(Scene):
         "firstHexCenterY": 3,
         "durationSeconds": 2,
         "circleRadius": 0.05,
-        "firstDot": [-3, 4.3, 0]
+        "firstDot": [-3, 4.3, 0],
+        "pathSamples": 256,
+        "stackWidth": 0.3,
+        "stackHeight": 2.2,
+        "seed": None
     }
-    
-    frameNumber = 0
 
     def construct(self):
         table = self.createTable()
         counter = self.createCounter()
         hexagons = self.createHexagons()
         vertices = self.createVertices()
-        items = self.createItems(vertices)
-
-        def updateFrameFunction(table):
-            durationSeconds = GaltonBoard.config["durationSeconds"]
-            durationFrames = durationSeconds * self.camera.frame_rate
-            self.frameNumber += 1
-            for item in items:
-                if item.isActive and self.frameNumber > item.startFrame:
-                    alpha = (self.frameNumber - item.startFrame) / durationFrames
-                    if alpha <= 1.0:
-                        point = item.path.point_from_proportion(rate_functions.linear(alpha))
-                        item.circle.move_to(point)
-                    else:
-                        updateCounter()
-                        updateStackValue(item.stackIndex)
-                        item.isActive = False
-
-        def updateCounter():
-            val = counter[0].get_value()
-            val += 1
-            counter[0].set_value(val)
-
-        def updateStackValue(stackValueIndex):
-            cell = table.get_entries((1, stackValueIndex + 1))
-            val = cell.get_value()
-            val += 1
-            cell.set_value(val)
+        pathTable, pathLength = self.createPathTable(vertices)
+        balls = self.createBalls(vertices)
+        dots = self.createDots(balls)
+
+        durationSeconds = GaltonBoard.config["durationSeconds"]
+        runTime = GaltonBoard.config["runTime"]
+        samples = pathTable.shape[1]
+        lastStart = pathTable[balls.pathIndex, -1]
+        lastLength = np.linalg.norm(balls.end - lastStart, axis=1)
+        totalLength = pathLength[balls.pathIndex] + lastLength
+
+        def ballPositions(time):
+            """Every ball's position at ``time``: one gather into the path table."""
+            alpha = np.clip((time - balls.startTime) / durationSeconds, 0.0, 1.0)
+            distance = alpha * totalLength
+            onPegs = distance < pathLength[balls.pathIndex]
+            x = np.minimum(distance / pathLength[balls.pathIndex], 1.0) * (samples - 1)
+            i = np.minimum(x.astype(int), samples - 2)
+            frac = (x - i)[:, None]
+            onPath = pathTable[balls.pathIndex, i] * (1 - frac) + pathTable[balls.pathIndex, i + 1] * frac
+            tail = ((distance - pathLength[balls.pathIndex]) / np.maximum(lastLength, 1e-12))[:, None]
+            onTail = lastStart + (balls.end - lastStart) * tail
+            return np.where(onPegs[:, None], onPath, onTail)
+
+        stackValues = np.zeros(GaltonBoard.config["hexRowsCount"] + 1, dtype=int)
+
+        def updateFrameFunction(wrapper, alpha):
+            time = alpha * runTime
+            dots.points = ballPositions(time)
+            landed = np.flatnonzero(~balls.counted & (time >= balls.startTime + durationSeconds))
+            if landed.size:
+                balls.counted[landed] = True
+                updateCounts(np.bincount(balls.stackIndex[landed], minlength=len(stackValues)))
+
+        def updateCounts(landedPerStack):
+            """Add one frame's landings; only the cells that changed are redrawn."""
+            stackValues[:] += landedPerStack
+            for stackValueIndex in np.flatnonzero(landedPerStack):
+                table.get_entries((1, stackValueIndex + 1)).set_value(stackValues[stackValueIndex])
+            counter[0].set_value(int(stackValues.sum()))
 
         self.play(FadeIn(hexagons, run_time=1))
         self.play(FadeIn(table, run_time=1))
         self.play(FadeIn(counter, run_time=1))
-        wrapper = VGroup(table, counter)
-        for item in items:
-            wrapper.add(item.circle)
-        runTime = GaltonBoard.config["runTime"]
-        self.play(UpdateFromFunc(wrapper, updateFrameFunction), run_time=runTime)
+        wrapper = Group(table, counter, dots)
+        self.play(UpdateFromAlphaFunc(wrapper, updateFrameFunction), run_time=runTime, rate_func=linear)
         self.wait(3)
 
     def createTable(self):
-        table = IntegerTable(
+        table = Table(
             [[0, 0, 0, 0, 0, 0, 0, 0]],
+            element_to_mobject=GlyphNumber,
             line_config={"stroke_width": 1, "color": YELLOW},
             include_outer_lines=False
         )
@@ -73,7 +88,7 @@ class GaltonBoard(Scene):
         return table
 
     def createCounter(self):
-        counter = Integer(0).shift(RIGHT * 4).shift(DOWN * 0.6)
+        counter = GlyphNumber(0).shift(RIGHT * 4).shift(DOWN * 0.6)
         text = Text("Items count:", font_size=28)
         text.next_to(counter, LEFT)
         return VGroup(counter, text)
@@ -117,68 +132,93 @@ class GaltonBoard(Scene):
                 vertices[row][elem] = [elemShiftRight, currentRowShiftUp + hexSize + 0.1, 0]
         return vertices
 
-    def createItems(self, vertices):
+    def createPathTable(self, vertices):
+        """All 128 peg paths (firstDot, then one quarter arc per row), each
+        sampled at ``pathSamples`` points evenly spaced along its length.
+        Returns the (128, samples, 3) table and the (128,) path lengths."""
+        rows = GaltonBoard.config["hexRowsCount"]
+        samples = GaltonBoard.config["pathSamples"]
+        firstDot = np.array(GaltonBoard.config["firstDot"], dtype=float)
+        vertices = np.array([[v if v is not None else [0, 0, 0] for v in row] for row in vertices], dtype=float)
+
+        pathIndex = np.arange(2 ** rows)
+        bits = (pathIndex[:, None] >> np.arange(rows - 1, -1, -1)) & 1  # first row = highest bit
+        cols = np.concatenate([np.zeros((len(pathIndex), 1), dtype=int), np.cumsum(bits, axis=1)], axis=1)
+        corners = vertices[np.arange(rows + 1), cols]                     # (128, rows + 1, 3)
+
+        # Quarter arcs as in ArcBetweenPoints: counterclockwise for a step to the
+        # left (angle PI/2), clockwise for a step to the right (angle -PI/2).
+        angle = np.where(bits == 0, PI / 2, -PI / 2)[..., None]           # (128, rows, 1)
+        start, end = corners[:, :-1], corners[:, 1:]
+        chord = end - start
+        normal = np.stack([-chord[..., 1], chord[..., 0], chord[..., 2]], axis=-1)
+        center = (start + end) / 2 + normal / (2 * np.tan(angle / 2))
+        phi = angle * np.linspace(0.0, 1.0, 33)                            # (128, rows, 33)
+        offset = (start - center)[..., None, :]
+        cos, sin = np.cos(phi)[..., None], np.sin(phi)[..., None]
+        arcs = center[..., None, :] + np.concatenate([
+            offset[..., :1] * cos - offset[..., 1:2] * sin,
+            offset[..., :1] * sin + offset[..., 1:2] * cos,
+            np.zeros_like(cos),
+        ], axis=-1)                                                        # (128, rows, 33, 3)
+
+        dense = np.concatenate([np.broadcast_to(firstDot, (len(pathIndex), 1, 3)),
+                                arcs.reshape(len(pathIndex), -1, 3)], axis=1)
+        steps = np.linalg.norm(np.diff(dense, axis=1), axis=2)
+        along = np.concatenate([np.zeros((len(pathIndex), 1)), np.cumsum(steps, axis=1)], axis=1)
+        pathLength = along[:, -1]
+        table = np.empty((len(pathIndex), samples, 3))
+        for k in pathIndex:
+            target = np.linspace(0.0, pathLength[k], samples)
+            for axis in range(3):
+                table[k, :, axis] = np.interp(target, along[k], dense[k, :, axis])
+        return table, pathLength
+
+    def createBalls(self, vertices):
+        """Draw every ball's path and its resting place in the bin."""
+        rows = GaltonBoard.config["hexRowsCount"]
         itemsTotal = GaltonBoard.config["itemsTotal"]
-        circleRadius = GaltonBoard.config["circleRadius"]
-        itemDelayFrames = GaltonBoard.config["itemDelayFrames"]
-        firstDot = GaltonBoard.config["firstDot"]
+        releaseSeconds = GaltonBoard.config["releaseSeconds"]
+        rng = np.random.default_rng(GaltonBoard.config["seed"])
+
+        balls = Balls()
+        balls.pathIndex = rng.integers(0, 2 ** rows, itemsTotal)
+        balls.stackIndex = np.array([int(i).bit_count() for i in balls.pathIndex])
+        balls.startTime = np.arange(itemsTotal) * (releaseSeconds / itemsTotal)
+        balls.counted = np.zeros(itemsTotal, dtype=bool)
 
-        items = []
-        startFrame = 0
-        stackValues = [0, 0, 0, 0, 0, 0, 0, 0]
-
-        for k in range(itemsTotal):
-            item = Item()
-            circle = Circle(radius=circleRadius, color=DARK_BLUE, fill_opacity=1)
-            pathIndex = self.createPathIndex()
-            stackIndex = pathIndex.bit_count()
-            stackValues[stackIndex] += 1
-            path = self.createPath(vertices, pathIndex, stackValues[stackIndex])
-            item.path = path
-            item.circle = circle
-            item.stackIndex = stackIndex
-            item.startFrame = startFrame
-            startFrame += itemDelayFrames
-            self.add(circle)
-            circle.move_to(firstDot)
-            items.append(item)
-        return items
-
-    def createPathIndex(self):
-        pathIndex = random.randrange(128)
-        return pathIndex
-
-    def createPath(self, vertices, pathIndex, itemsCountInStack):
+        # Position of each ball within its bin, in landing order.
+        order = np.argsort(balls.stackIndex, kind="stable")
+        binStart = np.searchsorted(balls.stackIndex[order], np.arange(rows + 1))
+        slot = np.empty(itemsTotal, dtype=int)
+        slot[order] = np.arange(itemsTotal) - binStart[balls.stackIndex[order]]
+        pitch, columns = self.stackLayout()
+        bottom = np.array([vertices[rows][i] for i in range(rows + 1)], dtype=float)[balls.stackIndex]
+        balls.end = bottom.copy()
+        balls.end[:, 0] += (slot % columns - (columns - 1) / 2) * pitch
+        balls.end[:, 1] += -2.4 + (slot // columns) * pitch
+        return balls
+
+    def stackLayout(self):
+        """Spacing and columns of balls in a bin, so the fullest bin one
+        expects fits in ``stackHeight`` (never coarser than three abreast)."""
+        rows = GaltonBoard.config["hexRowsCount"]
+        itemsTotal = GaltonBoard.config["itemsTotal"]
+        stackWidth = GaltonBoard.config["stackWidth"]
+        stackHeight = GaltonBoard.config["stackHeight"]
+        fullest = 1.15 * itemsTotal * math.comb(rows, rows // 2) / 2 ** rows
+        pitch = min(stackWidth / 3, np.sqrt(stackWidth * stackHeight / fullest))
+        return pitch, max(1, round(stackWidth / pitch))
+
+    def createDots(self, balls):
+        """One point cloud for all the balls, waiting at ``firstDot``."""
         firstDot = GaltonBoard.config["firstDot"]
-        rowCapacity = 3
-        lastDotRowIndex = (itemsCountInStack - 1) // rowCapacity
-        lastDotColIndex = (itemsCountInStack - 1) % rowCapacity
-        path = Line(firstDot, vertices[0][0], stroke_width=1)
-        previousDot = vertices[0][0]
-        binary = bin(pathIndex)[2:].zfill(7)
-        rowIndex = 1
-        colIndex = 0
-        for digit in binary:
-            if digit == "0":
-                pathTmp = ArcBetweenPoints(previousDot, vertices[rowIndex][colIndex], angle=PI/2, stroke_width=1)
-                previousDot = vertices[rowIndex][colIndex]
-            else:
-                colIndex += 1
-                pathTmp = ArcBetweenPoints(previousDot, vertices[rowIndex][colIndex], angle=-PI/2, stroke_width=1)
-                previousDot = vertices[rowIndex][colIndex]
-            path.append_vectorized_mobject(pathTmp)
-            rowIndex += 1
-        lastDotWidth = 0.1
-        lastDotHeight = 0.1
-        lastDotX = previousDot[0]
-        if lastDotColIndex == 0:
-            lastDotX = lastDotX - lastDotWidth
-        elif lastDotColIndex == 2:
-            lastDotX = lastDotX + lastDotWidth
-        lastDotY = previousDot[1] - 2.4 + lastDotHeight * lastDotRowIndex
-        pathLast = Line(previousDot, [lastDotX, lastDotY, 0], stroke_width=1)
-        path.append_vectorized_mobject(pathLast)
-        return path
+        pitch, _ = self.stackLayout()
+        size = max(1.0, min(pitch, 2 * GaltonBoard.config["circleRadius"])
+                   * config.pixel_height / config.frame_height)
+        dots = PMobject(stroke_width=size)
+        dots.add_points(np.tile(firstDot, (len(balls.pathIndex), 1)).astype(float), color=DARK_BLUE)
+        return dots
 
     def showDotMap(self, showAxes):
         for x in range(-7, 8):
@@ -189,9 +229,54 @@ class GaltonBoard(Scene):
             ax = Axes(x_range=[-7, 7], y_range=[-4, 4], x_length=14, y_length=8)
             self.add(ax)
 
-class Item:
-    circle = None
-    path = None
-    startFrame = 0
-    stackIndex = 0
-    isActive = True
\ No newline at end of file
+class Balls:
+    pathIndex = None
+    stackIndex = None
+    startTime = None
+    end = None
+    counted = None
+
+
+class GlyphNumber(VGroup):
+    """Non-negative integer assembled from ten cached digit glyphs.
+
+    Laid out like ``Integer`` (digits side by side, bottoms aligned, left edge
+    kept in place as the number grows), but
+    ``set_value`` only copies the cached glyphs instead of building a new
+    number mobject, and does nothing when the value is unchanged.
+    """
+    glyphs = None
+    digitBuff = 0.001 * DEFAULT_FONT_SIZE
+
+    def __init__(self, number=0, **kwargs):
+        super().__init__(**kwargs)
+        if GlyphNumber.glyphs is None:
+            GlyphNumber.glyphs = [Integer(digit)[0] for digit in range(10)]
+        self.number = None
+        self.add(*self.digitMobjects(number, 1.0))
+        self.number = number
+
+    def digitMobjects(self, number, ratio):
+        digits = []
+        for char in str(int(number)):
+            digit = GlyphNumber.glyphs[int(char)].copy().scale(ratio)
+            digit.digit = int(char)
+            digits.append(digit)
+        VGroup(*digits).arrange(RIGHT, buff=self.digitBuff * ratio, aligned_edge=DOWN)
+        return digits
+
+    def get_value(self):
+        return self.number
+
+    def set_value(self, number):
+        if number == self.number:
+            return self
+        first = self.submobjects[0]
+        ratio = first.height / GlyphNumber.glyphs[first.digit].height  # follows any later scaling
+        left, bottom = self.get_left(), self.get_bottom()[1]
+        digits = VGroup(*self.digitMobjects(number, ratio)).set_color(first.get_color())
+        digits.move_to(left, LEFT)
+        digits.shift(UP * (bottom - digits.get_bottom()[1]))
+        self.submobjects = digits.submobjects
+        self.number = number
+        return self
@@ -1,16 +1,17 @@
 from manim import *
 import numpy as np
 
+from double_pendulum import L1, L2, bob_positions, integrate, trajectory
+
 BLACK = "#000000"
 WHITE = "#FFFFFF"
 W = config.frame_width
 H = config.frame_height
 
-L1 = 1
-L2 = 1
-m1 = 1
-m2 = 1
-g = 9.8
+# Simulated seconds per second of film. The pace the scene has always played at:
+# the old updater sat on both rods and advanced the state twice per frame.
+SPEED = 2.0
+SCENE_TIME = 140
 
 # Initial conditions
 theta1 = -PI / 2
@@ -18,35 +19,12 @@ theta2 = -PI / 2
 omega1 = 0
 omega2 = 0
 
-def derivs(state, t):
-    dtheta1 = state[2]
-    dtheta2 = state[3]
-    delta = state[1] - state[0]
-
-    den1 = (m1 + m2) * L1 - m2 * L1 * np.cos(delta) * np.cos(delta)
-    den2 = (L2 / L1) * den1
-
-    domega1 = ((m2 * L1 * state[2] * state[2] * np.sin(delta) * np.cos(delta)
-                + m2 * g * np.sin(state[1]) * np.cos(delta)
-                + m2 * L2 * state[3] * state[3] * np.sin(delta)
-                - (m1 + m2) * g * np.sin(state[0]))
-               / den1)
-
-    domega2 = ((- m2 * L2 * state[3] * state[3] * np.sin(delta) * np.cos(delta)
-                + (m1 + m2) * (g * np.sin(state[0]) * np.cos(delta)
-                               - L1 * state[2] * state[2] * np.sin(delta)
-                               - g * np.sin(state[1])))
-               / den2)
-
-    return np.array([dtheta1, dtheta2, domega1, domega2])
-
-# RK4 method for solving ODEs
-def rk4_step(state, t, dt):
-    k1 = derivs(state, t)
-    k2 = derivs(state + 0.5 * k1 * dt, t + 0.5 * dt)
-    k3 = derivs(state + 0.5 * k2 * dt, t + 0.5 * dt)
-    k4 = derivs(state + k3 * dt, t + dt)
-    return state + (k1 + 2 * k2 + 2 * k3 + k4) * dt / 6
+# Chaos fan-out: a bundle of pendulums whose first angles differ by a hair
+FAN_COUNT = 1000
+FAN_SPREAD = 1e-6  # Total spread of theta1 across the bundle, in radians
+FAN_TIME = 30
+FAN_SAMPLE_EVERY = 8  # Keep every 8th RK4 step (0.02 simulated seconds)
+FAN_SCALE = 1.6  # Rod length on screen
 
 class DoublePendulumScene(Scene):
     def construct(self):
@@ -78,19 +56,22 @@ class DoublePendulumScene(Scene):
 
         self.add(anchor, rod1, rod2, mass1, mass2)
 
-        state = np.array([theta1, theta2, omega1, omega2])
-        dt = 0.0025  # Smaller dt to slow down the pendulum
+        # The whole run is solved before rendering; the updater only looks up
+        # the state at the current scene time, so it plays the same at any fps.
+        run = trajectory([theta1, theta2, omega1, omega2], SCENE_TIME * SPEED)
+        state = run.states[0]
+        elapsed = 0.0
 
         def update_pendulums(mob, dt):
-            nonlocal state
-            state = rk4_step(state, 0, dt)
+            nonlocal state, elapsed
+            elapsed += dt
+            state = run.at(elapsed * SPEED)
             rod1.put_start_and_end_on(ORIGIN + anchor_offset, ORIGIN + anchor_offset + [L1 * np.sin(state[0]), -L1 * np.cos(state[0]), 0])
             rod2.put_start_and_end_on(rod1.get_end(), rod1.get_end() + [L2 * np.sin(state[1]), -L2 * np.cos(state[1]), 0])
             mass1.move_to(rod1.get_end())
             mass2.move_to(rod2.get_end())
 
         rod1.add_updater(update_pendulums)
-        rod2.add_updater(update_pendulums)
         mass1.add_updater(lambda mob, dt: mass1.move_to(rod1.get_end()))
         mass2.add_updater(lambda mob, dt: mass2.move_to(rod2.get_end()))
 
@@ -139,7 +120,7 @@ class DoublePendulumScene(Scene):
         theta1_display.add_updater(lambda d: d.set_value(np.degrees(state[0]) % 360))
         theta2_display.add_updater(lambda d: d.set_value(np.degrees(state[1]) % 360))
 
-        self.wait(140)
+        self.wait(SCENE_TIME)
 
     def introduction(self):
         header = Tex("Double Pendulum Animation | Manim CE")
@@ -159,6 +140,46 @@ class DoublePendulumScene(Scene):
         
         return VGroup(header, writer, line)
 
+class DoublePendulumFanOut(Scene):
+    """FAN_COUNT pendulums started FAN_SPREAD radians apart: they swing as one,
+    then chaos spreads them over the whole disc."""
+
+    def construct(self):
+        self.camera.background_color = BLACK
+
+        header = Tex(f"{FAN_COUNT} pendulums, {FAN_SPREAD:g} rad apart").set_width(7).to_edge(UP)
+        self.add(header)
+
+        starts = np.tile([theta1, theta2, omega1, omega2], (FAN_COUNT, 1)).astype(float)
+        starts[:, 0] += np.linspace(0.0, FAN_SPREAD, FAN_COUNT)
+        run = integrate(starts, FAN_TIME * SPEED, sample_every=FAN_SAMPLE_EVERY)
+
+        pivot = DOWN * 0.4
+        arms = VMobject(stroke_color=WHITE, stroke_width=1).set_stroke(opacity=0.06)
+        bobs = PMobject(stroke_width=5)
+        rgbas = np.array([color_to_rgba(c) for c in color_gradient([BLUE, YELLOW, RED], FAN_COUNT)])
+        bobs.add_points(np.zeros((FAN_COUNT, 3)), rgbas=rgbas)
+        # Each pendulum is one subpath of ``arms``: pivot -> bob 1 -> bob 2, two
+        # straight cubic curves, their handles at a third and two thirds.
+        handles = np.array([0.0, 1 / 3, 2 / 3, 1.0])[None, None, :, None]
+        elapsed = 0.0
+
+        def update_fan(mob, dt):
+            nonlocal elapsed
+            elapsed += dt
+            joints = np.zeros((FAN_COUNT, 3, 3))
+            joints[:, 1:, :2] = FAN_SCALE * bob_positions(run.at(elapsed * SPEED))
+            joints += pivot
+            start, end = joints[:, :-1, None, :], joints[:, 1:, None, :]
+            arms.points = (start + (end - start) * handles).reshape(-1, 3)
+            bobs.points = joints[:, 2].copy()
+
+        arms.add_updater(update_fan)
+        update_fan(arms, 0)
+        self.add(DashedLine(pivot + UP * 0.5, pivot, color=WHITE), arms, bobs)
+        self.wait(FAN_TIME)
+
+
 if __name__ == "__main__":
     scene = DoublePendulumScene()
     scene.render()
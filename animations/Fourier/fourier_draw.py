@@ -3,7 +3,8 @@
 Structure (one continuous animation, rendered by the ``FourierPortrait`` scene):
 
     1. intro card        -- house-style title (see animations/2024/Intro.py)
-    2. the drawing       -- ~200 rotating vectors trace louis.png from a single
+    2. the drawing       -- rotating vectors (as many as ERROR_PX needs at the
+                            render resolution) trace louis.png from a single
                             closed path (data/louis_path.npy, made by
                             generate_path.py)
     3. the theory        -- the complex Fourier series + coefficients + the DFT
@@ -14,25 +15,34 @@ The individual sections are also exposed as their own scenes (``Intro``,
 ``Drawing``, ``Theory``) so they can be rendered in isolation while iterating.
 
 Env knobs (handy while iterating):
-    FOURIER_QUICK=1   fewer vectors + shorter draw time for a fast test render
+    FOURIER_QUICK=1          fewer vectors + shorter draw time for a fast test render
+    FOURIER_PORTRAIT=<name>  draw data/cache/<name>.npz (from ``generate_path.py
+                             <dir>``) instead of louis_path.npy
 """
 from __future__ import annotations
 
+import functools
 import os
 from pathlib import Path
 
 import numpy as np
 from manim import *
 
+from generate_path import (draw_resolution, epicycle_order, error_curve, load_cache,
+                           vectors_needed)
+
 HERE = Path(__file__).resolve().parent
 DATA = HERE / "data" / "louis_path.npy"
 IMG = HERE / "assets" / "louis.png"
+CACHE = HERE / "data" / "cache"
+PORTRAIT = os.environ.get("FOURIER_PORTRAIT")
 
 QUICK = os.environ.get("FOURIER_QUICK") == "1"
-NUM_VECTORS = 90 if QUICK else 200     # epicycles drawn during the performance
+ERROR_PX = 4.0 if QUICK else 2.0      # RMS drift of the drawing from the path, in output pixels
+MAX_VECTORS = 600                      # cap on epicycles, whatever the error budget asks for
 CIRCLE_COUNT = 28 if QUICK else 50     # how many of them also show their circle
 DRAW_TIME = 9 if QUICK else 24         # seconds for the pen to close the loop
-DRAW_RES = 4000                        # samples of the analytic curve we reveal
+SEGMENT_PX = 2.0                       # length of one revealed-line segment, in output pixels
 
 # palette
 VEC_COLOR = BLUE_B
@@ -44,17 +54,47 @@ ACCENT = YELLOW
 EXP_COLOR = TEAL
 
 
-def load_epicycles(num_vectors: int):
-    """Load the path and return (freqs, coeffs) for the ``num_vectors`` lowest
-    frequencies, ordered 0, +1, -1, +2, -2, ... so partial sums add detail."""
+@functools.cache
+def load_portrait():
+    """(path, freqs, coeffs, image) of the portrait being drawn, with the
+    coefficients ordered 0, +1, -1, +2, -2, ... so partial sums add detail.
+
+    A named portrait comes straight from its cache, already transformed and
+    ordered; the default one is transformed from ``DATA`` here."""
+    if PORTRAIT:
+        data = load_cache(PORTRAIT, CACHE)
+        return data["path"], data["freqs"], data["coeffs"], data["image"]
     z = np.load(DATA)
     n = len(z)
     coeffs = np.fft.fft(z) / n
     freqs = np.round(np.fft.fftfreq(n, d=1.0 / n)).astype(int)
     # order by |frequency|, positive before negative on ties -> nice nesting
-    order = sorted(range(n), key=lambda k: (abs(freqs[k]), -freqs[k]))
-    order = order[:num_vectors]
-    return freqs[order], coeffs[order]
+    order = epicycle_order(freqs)
+    return z, freqs[order], coeffs[order], IMG
+
+
+@functools.cache
+def epicycle_budget():
+    """(vectors, draw_res) for the portrait at the current render resolution:
+    the fewest vectors whose partial sum stays within ``ERROR_PX`` (RMS) of
+    the path, and enough samples of it for ``SEGMENT_PX``-long segments."""
+    z, freqs, coeffs, _ = load_portrait()
+    unit = config.frame_height / config.pixel_height  # one output pixel
+    err = error_curve(z, freqs, coeffs, MAX_VECTORS)
+    m = max(1, vectors_needed(err, ERROR_PX * unit))
+    return m, draw_resolution(freqs[:m], coeffs[:m], SEGMENT_PX * unit)
+
+
+def epicycle_frames(freqs: np.ndarray, coeffs: np.ndarray, frames: int) -> np.ndarray:
+    """The vector chain at every frame: ``(frames + 1, K + 1)`` complex, row ``f``
+    holding the origin and then each vector's tip at t = f / frames.
+
+    One matrix exponential over (time x frequency) and a cumulative sum along
+    the chain, instead of re-summing the series inside every frame update."""
+    ts = np.arange(frames + 1) / frames
+    chain = np.zeros((frames + 1, len(freqs) + 1), dtype=complex)
+    np.cumsum(coeffs * np.exp(2j * np.pi * np.outer(ts, freqs)), axis=1, out=chain[:, 1:])
+    return chain
 
 
 def path_to_corners(z: np.ndarray) -> np.ndarray:
@@ -92,11 +132,12 @@ class _FourierBase(Scene):
 
     # ---- 2: the epicycle drawing ----------------------------------------- #
     def section_draw(self):
-        z = np.load(DATA)
-        freqs, coeffs = load_epicycles(NUM_VECTORS)
+        z, freqs, coeffs, image = load_portrait()
+        num_vectors, draw_res = epicycle_budget()
+        freqs, coeffs = freqs[:num_vectors], coeffs[:num_vectors]
 
         # (a) show the real painting: "an image is just a curve in disguise"
-        img = ImageMobject(str(IMG)).scale_to_fit_height(6.2)
+        img = ImageMobject(str(image)).scale_to_fit_height(6.2)
         caption = Tex("A picture is just a point moving through the plane\\dots") \
             .scale(0.8).to_edge(DOWN)
         self.play(FadeIn(img), FadeIn(caption))
@@ -105,60 +146,74 @@ class _FourierBase(Scene):
 
         # (b) set up the rotating-vector machine
         formula = MathTex(r"f(t)=\sum_{k} c_k\,e^{\,2\pi i k t}").to_edge(UP)
-        count = Tex(f"{NUM_VECTORS} rotating vectors").scale(0.6) \
+        count = Tex(f"{num_vectors} rotating vectors").scale(0.6) \
             .to_corner(DR).set_opacity(0.7)
         self.play(Write(formula), FadeIn(count))
 
+        # Every frame of the performance is known up front: the tracker runs
+        # linearly over DRAW_TIME, so frame f sits at t = f / frames. The
+        # updaters below only look rows up and move a fixed set of mobjects.
+        frames = max(1, round(DRAW_TIME * config.frame_rate))
+        chain = epicycle_frames(freqs, coeffs, frames)
         t = ValueTracker(0.0)
 
-        def pen_point():
-            tt = t.get_value()
-            p = np.sum(coeffs * np.exp(2j * np.pi * freqs * tt))
-            return np.array([p.real, p.imag, 0.0])
+        def frame():
+            return chain[round(t.get_value() * frames)]
 
-        def make_vectors():
-            tt = t.get_value()
-            terms = coeffs * np.exp(2j * np.pi * freqs * tt)
-            tips = np.cumsum(terms)
-            centers = np.concatenate([[0.0 + 0.0j], tips[:-1]])
-            g = VGroup()
-            for k in range(len(freqs)):
-                cen = np.array([centers[k].real, centers[k].imag, 0.0])
-                tip = np.array([tips[k].real, tips[k].imag, 0.0])
-                r = abs(coeffs[k])
-                if k < CIRCLE_COUNT and r > 0.03:
-                    g.add(Circle(radius=r, stroke_width=1.2, color=CIRCLE_COLOR)
-                          .set_stroke(opacity=0.4).move_to(cen))
-                g.add(Line(cen, tip, stroke_width=1.9, color=VEC_COLOR))
-            return g
+        def to_xyz(c):
+            return np.column_stack([c.real, c.imag, np.zeros(len(c))])
+
+        # The vectors form one connected chain from the origin to the pen, so
+        # they are a single polyline; the circles share one mobject too (each
+        # a closed subpath: a unit circle's Bezier points, scaled and shifted).
+        radii = np.abs(coeffs)
+        ringed = np.flatnonzero((np.arange(len(freqs)) < CIRCLE_COUNT) & (radii > 0.03))
+        unit = Circle(radius=1.0).points
+        ring_pts = radii[ringed, None, None] * unit
+
+        arrows = VMobject(stroke_width=1.9, stroke_color=VEC_COLOR)
+        circles = VMobject(stroke_width=1.2, stroke_color=CIRCLE_COLOR).set_stroke(opacity=0.4)
+        pen_dot = Dot(ORIGIN, radius=0.05, color=PEN_COLOR)
+
+        def move_machine(_):
+            c = frame()
+            arrows.set_points_as_corners(to_xyz(c))
+            circles.points = (to_xyz(c[ringed])[:, None, :] + ring_pts).reshape(-1, 3)
+            pen_dot.move_to([c[-1].real, c[-1].imag, 0.0])
+
+        vectors = VGroup(circles, arrows)
+        vectors.add_updater(move_machine)
+        move_machine(vectors)
 
         # The line we reveal is the *exact* analytic curve these vectors trace
         # (the band-limited partial sum), sampled densely -> smooth and crisp at
         # any frame rate, instead of a jagged frame-sampled TracedPath.
-        ts = np.linspace(0.0, 1.0, DRAW_RES, endpoint=False)
+        ts = np.linspace(0.0, 1.0, draw_res, endpoint=False)
         recon = (coeffs[:, None] * np.exp(2j * np.pi * np.outer(freqs, ts))).sum(axis=0)
-        recon_pts = np.column_stack([recon.real, recon.imag, np.zeros(DRAW_RES)])
-        recon_pts = np.vstack([recon_pts, recon_pts[:1]])  # close the loop
+
+        # Its Bezier points are built once; each frame shows a longer prefix of
+        # them (4 points per segment) rather than rebuilding the line.
+        curve = VMobject().set_points_as_corners(path_to_corners(recon)).points
+        per_curve = len(curve) // draw_res
 
         glow = VMobject(stroke_color=GLOW, stroke_width=9).set_stroke(opacity=0.25)
         ink = VMobject(stroke_color=INK, stroke_width=3.2)
 
         def reveal(m):
-            n = int(t.get_value() * (len(recon_pts) - 1)) + 2
-            m.set_points_as_corners(recon_pts[:n])
+            n = int(t.get_value() * draw_res) + 1
+            m.points = curve[:per_curve * n]
 
         for m in (glow, ink):
             reveal(m)
             m.add_updater(reveal)
 
-        vectors = always_redraw(make_vectors)
-        pen_dot = always_redraw(lambda: Dot(pen_point(), radius=0.05, color=PEN_COLOR))
-
         self.add(glow, ink, vectors, pen_dot)
         self.play(t.animate.set_value(1.0), run_time=DRAW_TIME, rate_func=linear)
 
-        for m in (vectors, pen_dot, glow, ink):
+        for m in (vectors, glow, ink):
             m.clear_updaters()
+        for m in (glow, ink):
+            m.points = m.points.copy()  # detach from the shared curve before morphing
 
         # (c) sharpen: morph the band-limited line into the exact outline
         outline = VMobject(stroke_color=INK, stroke_width=3.2)
@@ -167,7 +222,7 @@ class _FourierBase(Scene):
                   Transform(ink, outline), run_time=1.0)
 
         # (d) fade the painting back in behind, to show the match
-        match = ImageMobject(str(IMG)).scale_to_fit_height(6.2).set_opacity(0.0)
+        match = ImageMobject(str(image)).scale_to_fit_height(6.2).set_opacity(0.0)
         self.add(match)
         self.bring_to_back(match)
         self.play(match.animate.set_opacity(0.45), FadeOut(formula), run_time=1.5)
@@ -290,7 +345,7 @@ class _FourierBase(Scene):
         real_form = MathTex(
             r"f(t) = \frac{a_0}{2} + \sum_{n\ge 1}\big[a_n\cos(2\pi n t) + b_n\sin(2\pi n t)\big]"
         ).set_opacity(0.9)
-        kicker = Tex(f"We keep the {NUM_VECTORS} slowest vectors\\,---\\,and the face appears.") \
+        kicker = Tex(f"We keep the {epicycle_budget()[0]} slowest vectors\\,---\\,and the face appears.") \
             .scale(0.85).set_color(ACCENT)
         self._layout_below(title, disc_txt, dft, real_form, kicker, gap=0.55)
 
@@ -6,33 +6,54 @@ which the Manim env already ships) so it runs offline:
 
     1. load  -> grayscale, downscale, gentle blur
     2. Otsu  -> pick the light/dark level that isolates the ink
-    3. marching squares (pure numpy) -> ordered iso-contour loops, which capture
-       *internal* features (eyes, nose, mouth), not just the silhouette
+    3. marching squares (pure numpy, vectorised over the whole grid) -> ordered
+       iso-contour loops, which capture *internal* features (eyes, nose,
+       mouth), not just the silhouette
     4. keep the longest loops, then stitch them into ONE path with a greedy
-       nearest-neighbour tour (the pen travels in short straight hops)
+       nearest-neighbour tour over a KD-tree (the pen travels in short hops)
     5. resample by arc length, center + scale into Manim units, save as complex
 
 Outputs (next to this file):
     data/louis_path.npy   complex128, shape (N,) -- the drawing, in Manim units
-    data/preview.png      sanity check: target path (grey) vs the M-vector
-                          Fourier reconstruction (black)
+    data/preview.png      sanity check: target path (grey) vs the Fourier
+                          reconstruction (black) with the fewest vectors that
+                          stay within PREVIEW_ERROR_PX of it
 
 Run directly (uses assets/louis.png) or pass a path:  python generate_path.py [img]
+
+Batch mode (a directory, or several images) traces them on a process pool and
+writes one cache per image, which ``fourier_draw.py`` loads by name
+(``FOURIER_PORTRAIT=<name>``):
+    data/cache/<name>.npz  path, epicycle-ordered freqs + coeffs, source image
+                           (relative to the cache folder, so the two can move
+                           together) and the content hash it was built from
+    data/cache/<name>.png  preview
+An image whose hash (image bytes + tracing tunables) matches its cache is
+skipped, so re-running over a grown directory only traces the new ones.
+``<name>`` is the image's stem, so two images of a batch may not share one.
+
+    python generate_path.py portraits/ --jobs 8
 """
 from __future__ import annotations
 
-import sys
-from collections import defaultdict
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import numpy as np
 from PIL import Image, ImageDraw
 from scipy.ndimage import gaussian_filter
+from scipy.spatial import cKDTree
 
 HERE = Path(__file__).resolve().parent
 DEFAULT_IMG = HERE / "assets" / "louis.png"
 OUT_NPY = HERE / "data" / "louis_path.npy"
 OUT_PREVIEW = HERE / "data" / "preview.png"
+CACHE_DIR = HERE / "data" / "cache"
+IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".webp"}
 
 # --- tunables --------------------------------------------------------------- #
 MAX_DIM = 360          # downscale the long edge to this before tracing
@@ -40,44 +61,39 @@ BLUR_SIGMA = 1.1       # smooths the staircase edges -> fewer tiny contours
 KEEP_LOOPS = 24        # keep only the N longest iso-contour loops
 MIN_LOOP_PTS = 30      # drop contours shorter than this (noise)
 N_SAMPLES = 2600       # points in the final resampled path (Fourier period)
-PREVIEW_VECTORS = 220  # how many epicycles the preview reconstruction uses
+PREVIEW_ERROR_PX = 1.0  # RMS error budget of the preview reconstruction, in its pixels
+PREVIEW_SIZE = 720     # preview image side, in pixels
 FIT_HALF_H = 3.3       # target half-height in Manim units
 FIT_HALF_W = 6.2       # target half-width in Manim units
 
 
 def otsu_level(gray_u8: np.ndarray) -> float:
     """Classic Otsu threshold on a uint8 image -> the level maximising between
-    class variance (separates the dark ink from the lighter paint)."""
+    class variance (separates the dark ink from the lighter paint).
+
+    Cumulative sums give every candidate level's class weights and means at
+    once; the first level with the largest variance wins, as in a scan."""
     hist = np.bincount(gray_u8.ravel(), minlength=256).astype(float)
     total = gray_u8.size
     sum_total = np.dot(np.arange(256), hist)
-    w_b = 0.0
-    sum_b = 0.0
-    best_var = -1.0
-    best_t = 127
-    for t in range(256):
-        w_b += hist[t]
-        if w_b == 0:
-            continue
-        w_f = total - w_b
-        if w_f == 0:
-            break
-        sum_b += t * hist[t]
+    w_b = np.cumsum(hist)
+    sum_b = np.cumsum(np.arange(256) * hist)
+    w_f = total - w_b
+    valid = (w_b > 0) & (w_f > 0)
+    if not valid.any():
+        return 127.0
+    with np.errstate(divide="ignore", invalid="ignore"):
         m_b = sum_b / w_b
         m_f = (sum_total - sum_b) / w_f
         var = w_b * w_f * (m_b - m_f) ** 2
-        if var > best_var:
-            best_var = var
-            best_t = t
-    return float(best_t)
+    return float(np.argmax(np.where(valid, var, -1.0)))
 
 
-def _cross(a: float, b: float, level: float) -> float:
-    """Fraction along an edge (corner a -> corner b) where the field hits level."""
-    d = b - a
-    if d == 0:
-        return 0.5
-    return min(1.0, max(0.0, (level - a) / d))
+def _cross(a: np.ndarray, b: np.ndarray, level: float) -> np.ndarray:
+    """Fraction along each edge (corner a -> corner b) where the field hits level.
+    Only used on edges whose corners straddle the level, so ``b != a``."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.clip((level - a) / (b - a), 0.0, 1.0)
 
 
 def marching_squares(field: np.ndarray, level: float) -> list[np.ndarray]:
@@ -87,112 +103,166 @@ def marching_squares(field: np.ndarray, level: float) -> list[np.ndarray]:
     trace the ``field == level`` iso-contours. Crossing points on a shared cell
     edge are computed identically from both neighbouring cells, so endpoints
     match exactly and link into clean loops.
+
+    Every cell is classified at once from its corner bits (case index); only
+    the cells the contour passes through get crossing points, and their
+    segments come out in row-major cell order, top/right/bottom/left within a
+    cell, with saddles split by the cell centre.
     """
-    h, w = field.shape
-    segments: list[tuple[tuple[float, float], tuple[float, float]]] = []
-
-    for r in range(h - 1):
-        g_tl_row = field[r]
-        g_bl_row = field[r + 1]
-        for c in range(w - 1):
-            tl = g_tl_row[c]
-            tr = g_tl_row[c + 1]
-            br = g_bl_row[c + 1]
-            bl = g_bl_row[c]
-
-            a_tl = tl >= level
-            a_tr = tr >= level
-            a_br = br >= level
-            a_bl = bl >= level
-            n_above = a_tl + a_tr + a_br + a_bl
-            if n_above == 0 or n_above == 4:
-                continue
-
-            # crossing points on the four edges (only where signs differ)
-            pts = {}
-            if a_tl != a_tr:  # top edge
-                pts["T"] = (c + _cross(tl, tr, level), float(r))
-            if a_tr != a_br:  # right edge
-                pts["R"] = (float(c + 1), r + _cross(tr, br, level))
-            if a_bl != a_br:  # bottom edge
-                pts["B"] = (c + _cross(bl, br, level), float(r + 1))
-            if a_tl != a_bl:  # left edge
-                pts["L"] = (float(c), r + _cross(tl, bl, level))
-
-            keys = list(pts)
-            if len(keys) == 2:
-                segments.append((pts[keys[0]], pts[keys[1]]))
-            elif len(keys) == 4:  # saddle: disambiguate with the cell centre
-                center = 0.25 * (tl + tr + br + bl)
-                if center >= level:
-                    segments.append((pts["T"], pts["R"]))
-                    segments.append((pts["B"], pts["L"]))
-                else:
-                    segments.append((pts["T"], pts["L"]))
-                    segments.append((pts["B"], pts["R"]))
-
-    return _link_segments(segments)
-
-
-def _link_segments(segments) -> list[np.ndarray]:
+    above = field >= level
+    case = (above[:-1, :-1] * 8 + above[:-1, 1:] * 4
+            + above[1:, 1:] * 2 + above[1:, :-1] * 1)
+    r, c = np.nonzero((case != 0) & (case != 15))
+    tl, tr = field[r, c], field[r, c + 1]
+    br, bl = field[r + 1, c + 1], field[r + 1, c]
+    a_tl, a_tr, a_br, a_bl = tl >= level, tr >= level, br >= level, bl >= level
+    rf, cf = r.astype(float), c.astype(float)
+
+    # Crossing point on each edge (only meaningful where the signs differ).
+    edges = (a_tl != a_tr, a_tr != a_br, a_bl != a_br, a_tl != a_bl)  # T, R, B, L
+    px = np.stack([c + _cross(tl, tr, level), cf + 1, c + _cross(bl, br, level), cf])
+    py = np.stack([rf, r + _cross(tr, br, level), rf + 1, r + _cross(tl, bl, level)])
+    present = np.stack(edges)
+    T, R, B, L = range(4)
+
+    saddle = present.all(axis=0)
+    center_up = 0.25 * (tl + tr + br + bl) >= level
+    # First segment: the two crossed edges in T, R, B, L order (saddles: T-R / T-L).
+    first = np.argmax(present, axis=0)
+    second = 3 - np.argmax(present[::-1], axis=0)
+    first = np.where(saddle, T, first)
+    second = np.where(saddle, np.where(center_up, R, L), second)
+    # Saddles add a second segment: B-L / B-R.
+    extra = np.where(center_up, L, R)[saddle]
+
+    cells = np.arange(len(r))
+    start = np.concatenate([first, np.full(saddle.sum(), B)])
+    end = np.concatenate([second, extra])
+    owner = np.concatenate([cells, cells[saddle]])
+    order = np.argsort(owner, kind="stable")
+    start, end, owner = start[order], end[order], owner[order]
+    p0 = np.stack([px[start, owner], py[start, owner]], axis=1)
+    p1 = np.stack([px[end, owner], py[end, owner]], axis=1)
+    return _link_segments(p0, p1)
+
+
+def _round4(v: np.ndarray) -> np.ndarray:
+    """``round(v, 4) * 1e4`` as int64, exactly as Python's correctly rounded
+    ``round`` does it (a plain ``rint(v * 1e4)`` can flip near-ties)."""
+    scaled = v * 1e4
+    k = np.rint(scaled).astype(np.int64)
+    near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if near_tie.any():
+        k[near_tie] = [round(round(x, 4) * 1e4) for x in v[near_tie].tolist()]
+    return k
+
+
+def _link_segments(p0: np.ndarray, p1: np.ndarray) -> list[np.ndarray]:
     """Stitch an unordered segment soup into ordered polylines by walking shared
-    endpoints. Interior crossing points have degree 2 -> clean loops/chains."""
-    def key(p):
-        return (round(p[0], 4), round(p[1], 4))
-
-    adj: dict = defaultdict(list)  # key -> list of (neighbour_key, seg_id)
-    for sid, (p0, p1) in enumerate(segments):
-        k0, k1 = key(p0), key(p1)
-        adj[k0].append((k1, sid))
-        adj[k1].append((k0, sid))
-
-    used: set[int] = set()
+    endpoints. Interior crossing points have degree 2 -> clean loops/chains.
+
+    Endpoints are hashed to node ids (rounded to 4 decimals) in one
+    ``np.unique``; each node's incident segments sit in a CSR block in segment
+    order, so a walk steps to the first unused one in O(1)."""
+    n_seg = len(p0)
+    if n_seg == 0:
+        return []
+    # Endpoint j of segment s is entry 2*s + j.
+    kx = _round4(np.stack([p0[:, 0], p1[:, 0]], axis=1).ravel())
+    ky = _round4(np.stack([p0[:, 1], p1[:, 1]], axis=1).ravel())
+    span = ky.max() - ky.min() + 1
+    keys, node = np.unique((kx - kx.min()) * span + (ky - ky.min()), return_inverse=True)
+    node = node.ravel()
+    coords = np.stack([kx, ky], axis=1) / 1e4
+
+    # Nodes in order of first appearance (the original dict insertion order).
+    first_seen = np.full(len(keys), 2 * n_seg)
+    np.minimum.at(first_seen, node, np.arange(2 * n_seg))
+    node_order = np.argsort(first_seen)
+    node_xy = np.empty((len(keys), 2))
+    node_xy[node] = coords
+
+    # CSR adjacency: entry e belongs to node[e]; neighbour is the other end.
+    entries = np.argsort(node, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(node, minlength=len(keys)))])
+    nbr = node[entries ^ 1].tolist()
+    sid = (entries >> 1).tolist()
+    ptr = offsets[:-1].tolist()
+    stop = offsets[1:].tolist()
+    used = [False] * n_seg
 
     def walk(start):
         path = [start]
         cur = start
         while True:
-            nxt = next(((nb, sid) for nb, sid in adj[cur] if sid not in used), None)
-            if nxt is None:
+            p, end = ptr[cur], stop[cur]
+            while p < end and used[sid[p]]:
+                p += 1
+            ptr[cur] = p
+            if p == end:
                 break
-            nb, sid = nxt
-            used.add(sid)
-            path.append(nb)
-            cur = nb
-        return np.array(path, dtype=float)
+            used[sid[p]] = True
+            cur = nbr[p]
+            path.append(cur)
+        return node_xy[path]
 
     polylines = []
+    degree = (offsets[1:] - offsets[:-1]).tolist()
     # open chains first (contours that run into the image border)
-    for k, nbrs in adj.items():
-        if len(nbrs) == 1 and any(sid not in used for _, sid in nbrs):
+    for k in node_order.tolist():
+        if degree[k] == 1 and not used[sid[offsets[k]]]:
             polylines.append(walk(k))
     # then the remaining closed loops
-    for k, nbrs in adj.items():
-        if any(sid not in used for _, sid in nbrs):
+    for k in node_order.tolist():
+        p, end = ptr[k], stop[k]
+        while p < end and used[sid[p]]:
+            p += 1
+        ptr[k] = p
+        if p < end:
             polylines.append(walk(k))
     return polylines
 
 
+def _hop(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.hypot(*(a - b)))
+
+
 def stitch(loops: list[np.ndarray]) -> np.ndarray:
     """Greedy nearest-neighbour tour over the loops, flipping each so the pen
-    makes the shortest hop. Returns one concatenated (M, 2) path."""
+    makes the shortest hop. Returns one concatenated (M, 2) path.
+
+    A KD-tree over all loop endpoints finds the nearest unvisited loop
+    without scanning every loop at every hop; candidates within a hair of
+    the best distance are re-ranked exactly as the plain scan would (lowest
+    index, then start before end)."""
     loops = sorted(loops, key=lambda p: len(p), reverse=True)
+    ends = np.array([p for lp in loops for p in (lp[0], lp[-1])])
+    tree = cKDTree(ends)
+    n = len(loops)
+    used = np.zeros(n, dtype=bool)
+    used[0] = True
     order_result = [loops[0]]
-    used = {0}
     cur_end = loops[0][-1]
-    while len(used) < len(loops):
+    for _ in range(n - 1):
+        k = 8
+        while True:
+            dist, idx = tree.query(cur_end, k=min(k, 2 * n))
+            free = ~used[np.atleast_1d(idx) // 2]
+            if free.any() or k >= 2 * n:
+                break
+            k *= 4
+        d_best = np.atleast_1d(dist)[free][0]
+        near = tree.query_ball_point(cur_end, d_best * (1 + 1e-9) + 1e-12)
         best = None  # (dist, index, flip)
-        for i, lp in enumerate(loops):
-            if i in used:
-                continue
-            d_start = float(np.hypot(*(lp[0] - cur_end)))
-            d_end = float(np.hypot(*(lp[-1] - cur_end)))
+        for i in sorted({j // 2 for j in near if not used[j // 2]}):
+            d_start = _hop(loops[i][0], cur_end)
+            d_end = _hop(loops[i][-1], cur_end)
             flip = d_end < d_start
             d = min(d_start, d_end)
             if best is None or d < best[0]:
                 best = (d, i, flip)
         _, i, flip = best
-        used.add(i)
+        used[i] = True
         seg = loops[i][::-1] if flip else loops[i]
         order_result.append(seg)
         cur_end = seg[-1]
@@ -231,18 +301,77 @@ def fourier_coeffs(z: np.ndarray):
     return freqs, coeffs
 
 
-def save_preview(z: np.ndarray, freqs, coeffs, m: int) -> None:
-    """Draw the target path (grey) and its m-vector reconstruction (black)."""
-    order = np.argsort(np.abs(freqs))[:m]
+def epicycle_order(freqs: np.ndarray) -> np.ndarray:
+    """Indices ordering frequencies 0, +1, -1, +2, -2, ... (by |k|, positive
+    first), so every prefix is a band-limited partial sum."""
+    return np.lexsort((-freqs, np.abs(freqs)))
+
+
+def error_curve(z: np.ndarray, freqs, coeffs, max_vectors: int | None = None,
+                metric: str = "rms") -> np.ndarray:
+    """Reconstruction error of every truncation: entry m is the distance from
+    ``z`` to the partial sum of its first m epicycles, m = 0 .. max_vectors.
+    ``freqs`` / ``coeffs`` are the full DFT of ``z``, in ``epicycle_order``.
+
+    "rms"  root-mean-square distance over the samples. By Parseval that is the
+           root of the power left in the dropped coefficients, i.e. a reversed
+           cumulative sum of |c_k|^2.
+    "max"  largest pointwise distance, an upper bound on the Hausdorff distance
+           between the two curves. Partial sums are accumulated in blocks of
+           vectors, each block one (vectors x samples) exponential + cumsum.
+    """
+    m = len(freqs) if max_vectors is None else min(max_vectors, len(freqs))
+    if metric == "rms":
+        tail = np.cumsum((np.abs(coeffs) ** 2)[::-1])[::-1]
+        return np.sqrt(np.append(tail, 0.0)[: m + 1])
+    if metric != "max":
+        raise ValueError(f"metric must be 'rms' or 'max', not {metric!r}")
+    t = np.arange(len(z)) / len(z)
+    err = np.empty(m + 1)
+    err[0] = np.abs(z).max()
+    partial = np.zeros(len(z), dtype=complex)
+    for lo in range(0, m, 256):
+        hi = min(lo + 256, m)
+        sums = partial + np.cumsum(coeffs[lo:hi, None] * np.exp(2j * np.pi * np.outer(freqs[lo:hi], t)),
+                                   axis=0)
+        err[lo + 1:hi + 1] = np.abs(sums - z).max(axis=1)
+        partial = sums[-1]
+    return err
+
+
+def vectors_needed(err: np.ndarray, tol: float) -> int:
+    """Fewest vectors from which the error stays within ``tol`` (the error need
+    not fall monotonically); ``len(err) - 1`` if it never gets there."""
+    above = np.flatnonzero(err > tol)
+    return min(int(above[-1]) + 1, len(err) - 1) if above.size else 0
+
+
+def curve_length(freqs, coeffs) -> float:
+    """Arc length of the partial sum, from its analytic speed |z'(t)|."""
+    n = 16 * (int(np.abs(freqs).max(initial=0)) + 1)
+    t = np.arange(n) / n
+    speed = np.abs((2j * np.pi * freqs * coeffs) @ np.exp(2j * np.pi * np.outer(freqs, t)))
+    return float(speed.mean())
+
+
+def draw_resolution(freqs, coeffs, step: float) -> int:
+    """Samples needed to draw the partial sum with segments about ``step`` long."""
+    return max(64, int(np.ceil(curve_length(freqs, coeffs) / step)))
+
+
+def save_preview(z: np.ndarray, freqs, coeffs, out: Path = OUT_PREVIEW) -> int:
+    """Draw the target path (grey) and its reconstruction (black) with the
+    fewest vectors meeting ``PREVIEW_ERROR_PX``; returns that vector count."""
+    size = PREVIEW_SIZE
+    span = max(np.abs(z.real).max(), np.abs(z.imag).max()) * 1.08
+    order = epicycle_order(freqs)
+    freqs, coeffs = freqs[order], coeffs[order]
+    m = max(1, vectors_needed(error_curve(z, freqs, coeffs), PREVIEW_ERROR_PX * 2 * span / size))
     t = np.linspace(0.0, 1.0, 3000, endpoint=False)
-    recon = np.zeros_like(t, dtype=complex)
-    for i in order:
-        recon += coeffs[i] * np.exp(2j * np.pi * freqs[i] * t)
+    recon = coeffs[:m] @ np.exp(2j * np.pi * np.outer(freqs[:m], t))
 
-    size = 720
     img = Image.new("RGB", (size, size), "white")
     draw = ImageDraw.Draw(img)
-    span = max(np.abs(z.real).max(), np.abs(z.imag).max()) * 1.08
 
     def to_px(cz):
         px = (cz.real / span * 0.5 + 0.5) * size
@@ -251,38 +380,130 @@ def save_preview(z: np.ndarray, freqs, coeffs, m: int) -> None:
 
     draw.line(to_px(z) + to_px(z[:1]), fill=(180, 180, 180), width=1)
     draw.line(to_px(recon) + to_px(recon[:1]), fill=(15, 15, 15), width=2)
-    img.save(OUT_PREVIEW)
+    img.save(out)
+    return m
 
 
-def main() -> None:
-    src = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_IMG
-    print(f">> loading {src}")
+def trace_image(src: Path, verbose: bool = True) -> np.ndarray:
+    """The whole pipeline: image file -> resampled complex path in Manim units."""
+    log = print if verbose else (lambda *a, **k: None)
+    log(f">> loading {src}")
     im = Image.open(src).convert("L")
     scale = MAX_DIM / max(im.size)
     im = im.resize((max(1, int(im.width * scale)), max(1, int(im.height * scale))))
     gray = np.asarray(im, dtype=float)
 
     level = otsu_level(np.asarray(im, dtype=np.uint8))
-    print(f">> otsu level = {level:.0f}")
+    log(f">> otsu level = {level:.0f}")
     field = gaussian_filter(gray, BLUR_SIGMA)
 
     loops = marching_squares(field, level)
     loops = [lp for lp in loops if len(lp) >= MIN_LOOP_PTS]
     loops.sort(key=lambda p: len(p), reverse=True)
     loops = loops[:KEEP_LOOPS]
-    print(f">> kept {len(loops)} loops, sizes: {[len(lp) for lp in loops[:8]]}...")
+    log(f">> kept {len(loops)} loops, sizes: {[len(lp) for lp in loops[:8]]}...")
 
     path_xy = stitch(loops)
     path_xy = resample_closed(path_xy, N_SAMPLES)
-    z = to_manim_complex(path_xy)
+    return to_manim_complex(path_xy)
+
+
+# --- batch mode: per-image content-hashed caches ---------------------------- #
+def content_hash(src: Path) -> str:
+    """Hash of the image bytes and every tunable that shapes the cached path."""
+    h = hashlib.sha256(Path(src).read_bytes())
+    settings = dict(max_dim=MAX_DIM, blur=BLUR_SIGMA, keep=KEEP_LOOPS, min_pts=MIN_LOOP_PTS,
+                    samples=N_SAMPLES, fit=(FIT_HALF_H, FIT_HALF_W),
+                    preview=(PREVIEW_ERROR_PX, PREVIEW_SIZE))
+    h.update(json.dumps(settings, sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+
+def cache_path(name: str, cache_dir: Path = CACHE_DIR) -> Path:
+    return Path(cache_dir) / f"{name}.npz"
+
+
+def build_cache(src: Path, cache_dir: Path = CACHE_DIR, force: bool = False) -> tuple[str, str]:
+    """Trace ``src`` into ``cache_dir/<stem>.npz`` (+ ``.png`` preview) unless a
+    cache with the same content hash exists. Returns (name, 'cached'|'built')."""
+    src = Path(src).resolve()
+    name, digest = src.stem, content_hash(src)
+    out = cache_path(name, cache_dir)
+    if not force and out.exists():
+        with np.load(out) as cached:
+            if str(cached["hash"]) == digest:
+                return name, "cached"
+
+    z = trace_image(src, verbose=False)
+    freqs, coeffs = fourier_coeffs(z)
+    order = epicycle_order(freqs)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{name}.{os.getpid()}.npz")
+    np.savez(tmp, path=z, freqs=freqs[order], coeffs=coeffs[order],
+             image=os.path.relpath(src, Path(cache_dir).resolve()), hash=digest)
+    os.replace(tmp, out)
+    save_preview(z, freqs, coeffs, out.with_suffix(".png"))
+    return name, "built"
+
+
+def load_cache(name: str, cache_dir: Path = CACHE_DIR) -> dict:
+    """Arrays of a cached portrait: path, freqs, coeffs (epicycle order), and
+    the source image as a ``Path``."""
+    with np.load(cache_path(name, cache_dir)) as data:
+        arrays = {key: data[key] for key in data.files}
+    arrays["image"] = Path(cache_dir) / str(arrays["image"])
+    return arrays
+
+
+def batch(images: list[Path], cache_dir: Path = CACHE_DIR, jobs: int | None = None,
+          force: bool = False) -> None:
+    by_name: dict[str, list[Path]] = {}
+    for src in images:
+        by_name.setdefault(Path(src).stem, []).append(Path(src))
+    clashes = {name: srcs for name, srcs in by_name.items() if len(srcs) > 1}
+    if clashes:
+        listing = "; ".join(f"{name}: {', '.join(map(str, srcs))}" for name, srcs in clashes.items())
+        raise ValueError(f"images share a cache name, rename them: {listing}")
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(build_cache, src, cache_dir, force) for src in images]
+        for src, fut in zip(images, futures):
+            name, status = fut.result()
+            print(f">> {status:6} {name}  <- {src}")
+    print(f">> {len(images)} portraits in {cache_dir}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Trace images into closed Fourier-drawing paths.")
+    p.add_argument("images", nargs="*", type=Path,
+                   help="one image (-> data/louis_path.npy), or a directory / several images (batch)")
+    p.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    p.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    p.add_argument("--force", action="store_true", help="rebuild caches even if the hash matches")
+    args = p.parse_args()
+
+    if len(args.images) > 1 or (args.images and args.images[0].is_dir()):
+        images = []
+        for entry in args.images:
+            if entry.is_dir():
+                images += sorted(f for f in entry.iterdir() if f.suffix.lower() in IMAGE_EXTS)
+            else:
+                images.append(entry)
+        try:
+            batch(images, args.cache_dir, args.jobs, args.force)
+        except ValueError as exc:
+            p.error(str(exc))
+        return
+
+    src = args.images[0] if args.images else DEFAULT_IMG
+    z = trace_image(src)
 
     OUT_NPY.parent.mkdir(parents=True, exist_ok=True)
     np.save(OUT_NPY, z)
     print(f">> saved {OUT_NPY}  ({len(z)} points)")
 
     freqs, coeffs = fourier_coeffs(z)
-    save_preview(z, freqs, coeffs, PREVIEW_VECTORS)
-    print(f">> saved {OUT_PREVIEW}  (reconstruction with {PREVIEW_VECTORS} vectors)")
+    m = save_preview(z, freqs, coeffs)
+    print(f">> saved {OUT_PREVIEW}  (reconstruction with {m} vectors)")
 
 
 if __name__ == "__main__":
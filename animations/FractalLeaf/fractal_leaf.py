@@ -2,15 +2,15 @@
 
 The whole shape is produced by :func:`fractal_leaf`, whose *star* parameter is
 the branching angle ``angle_deg``.  Because the topology only depends on
-``depth``, two trees of equal depth share the same submobject structure and can
-be smoothly ``Transform``-ed into one another — this is what makes the angle
-sweep morph cleanly.
+``depth``, every branch endpoint is a closed-form function of the angle
+(:func:`branch_levels`), and :func:`bend_leaf` re-points an existing tree for a
+new angle in place — this is what lets the angle sweep run continuously.
 
 ``FractalLeaf`` narrates three phases:
 
     1. the leaf is *constructed* branch level by branch level,
     2. the branching angle ``theta`` is *explained* on a small tree,
-    3. ``theta`` is *swept* from 15 deg to 90 deg (step 5 deg) to show how
+    3. ``theta`` is *swept* continuously from 15 deg to 90 deg to show how
        wildly the final shape changes.
 
 Render (low quality, fast):
@@ -30,8 +30,9 @@ import numpy as np
 # --------------------------------------------------------------------------- #
 ANGLE_HERO = 23.0        # branching angle (deg) of the "hero" leaf
 DEPTH_HERO = 9           # recursion depth of the hero / construction leaf
-DEPTH_SWEEP = 8          # depth used while sweeping the angle (kept lighter)
+DEPTH_SWEEP = 11         # depth of the continuously swept leaf
 LENGTH_RATIO = 0.72      # each child is this fraction of its parent's length
+LEAF_BANDS = 48          # leaves are drawn in this many colour slices
 BACKGROUND = "#000000"   # match the black reference background
 
 TRUNK_BLUE = "#1f3b73"   # deep blue trunk
@@ -48,6 +49,37 @@ LEAF_PALETTE = [
 # --------------------------------------------------------------------------- #
 # The fractal itself
 # --------------------------------------------------------------------------- #
+def branch_levels(angle_deg=ANGLE_HERO, depth=DEPTH_HERO, trunk_length=2.0,
+                  length_ratio=LENGTH_RATIO, direction=DOWN):
+    """Every branch of the tree as arrays, one ``(starts, ends)`` pair per level.
+
+    Level ``L`` has ``2**L`` branches of length ``trunk_length * length_ratio**L``.
+    Branch ``k`` there is the child of branch ``k // 2`` on level ``L - 1``. It
+    turns by ``+angle`` when ``k`` is even and ``-angle`` when odd, so within a
+    level the branches run in the recursion's pre-order (left -> right). Each
+    level is one vectorised step from the last: no recursion, no mobjects.
+    """
+    angle = angle_deg * DEGREES
+    direction = np.asarray(direction, dtype=float)
+    heading = np.array([np.arctan2(direction[1], direction[0])])
+    starts = np.zeros((1, 3))
+    levels = []
+    for level in range(depth + 1):
+        if level:
+            starts = np.repeat(levels[-1][1], 2, axis=0)
+            heading = np.repeat(heading, 2) + np.tile([angle, -angle], len(heading))
+        length = trunk_length * length_ratio ** level
+        ends = starts + length * np.column_stack([np.cos(heading), np.sin(heading), np.zeros(len(heading))])
+        levels.append((starts, ends))
+    return levels
+
+
+def segment_points(starts, ends):
+    """Bezier points drawing each start -> end as its own straight subpath."""
+    thirds = np.array([0.0, 1 / 3, 2 / 3, 1.0])[None, :, None]
+    return (starts[:, None] + (ends - starts)[:, None] * thirds).reshape(-1, 3)
+
+
 def fractal_leaf(
     angle_deg=ANGLE_HERO,
     depth=DEPTH_HERO,
@@ -61,6 +93,7 @@ def fractal_leaf(
     stroke_taper=0.78,
     min_stroke=0.6,
     direction=DOWN,
+    leaf_bands=LEAF_BANDS,
 ):
     """Build an upside-down fractal (binary) tree as a :class:`VGroup`.
 
@@ -69,68 +102,96 @@ def fractal_leaf(
     origin and grows along ``direction`` (``DOWN`` by default → the canopy hangs
     below, so the whole thing reads as a leaf/frond).
 
+    Geometry comes from :func:`branch_levels`; each level is a single
+    :class:`VMobject` (one straight subpath per branch, one colour and width),
+    and the leaves are ``leaf_bands`` filled VMobjects, one per slice of the
+    palette, so a depth-14 tree is still only a few dozen mobjects.
+
     The returned VGroup carries helper attributes:
 
-        tree.branches -- VGroup of every branch Line (pre-order)
-        tree.leaves   -- VGroup of every tip Dot (ordered left -> right)
-        tree.levels   -- list[VGroup]; branches grouped by depth level
+        tree.branches -- VGroup of the level VMobjects
+        tree.leaves   -- VGroup of the leaf bands (ordered left -> right)
+        tree.levels   -- list[VMobject]; the branches of each depth level, in
+                         pre-order (``tree.levels[L].points[4*k:4*k+4]`` is branch k)
         tree.root     -- the point the trunk starts from (ORIGIN before placing)
+        tree.params, tree.leaf_radius -- what :func:`bend_leaf` rebuilds from
     """
     if leaf_palette is None:
         leaf_palette = LEAF_PALETTE
 
-    angle = angle_deg * DEGREES
-    branches = VGroup()
-    leaves = VGroup()
-    levels = [VGroup() for _ in range(depth + 1)]
-
-    def grow(start, heading, length, level):
-        end = start + heading * length
+    levels = []
+    for level in range(depth + 1):
         color = interpolate_color(
             ManimColor(trunk_color),
             ManimColor(tip_color),
             0.0 if depth == 0 else level / depth,
         )
         width = max(base_stroke * (stroke_taper ** level), min_stroke)
-        branch = Line(start, end, color=color, stroke_width=width)
-        branches.add(branch)
-        levels[level].add(branch)
-
-        if level == depth:                       # a twig tip → drop a leaf
-            leaves.add(Dot(end, radius=leaf_radius))
-            return
-
-        # First child turns one way, second the other; recurse.
-        grow(end, rotate_vector(heading, angle), length * length_ratio, level + 1)
-        grow(end, rotate_vector(heading, -angle), length * length_ratio, level + 1)
-
-    grow(ORIGIN, np.array(direction, dtype=float), trunk_length, 0)
-
-    # Colour the leaves across the palette (pre-order ≈ left → right).
-    colors = color_gradient(leaf_palette, max(len(leaves), 2))
-    for dot, col in zip(leaves, colors, strict=False):
-        dot.set_color(col)
-
+        levels.append(VMobject(stroke_color=color, stroke_width=width))
+
+    # Leaves at the twig tips, coloured across the palette left -> right. All
+    # leaves of one palette slice share a mobject (a subpath per dot).
+    bands = min(leaf_bands, 2 ** depth)
+    colors = color_gradient(leaf_palette, max(bands, 2))
+    leaves = VGroup(*(
+        VMobject(fill_color=colors[band], fill_opacity=1.0, stroke_width=0)
+        for band in range(bands)
+    ))
+
+    branches = VGroup(*levels)
     tree = VGroup(branches, leaves)
     tree.branches = branches
     tree.leaves = leaves
     tree.levels = levels
     tree.root = ORIGIN
+    tree.params = dict(depth=depth, trunk_length=trunk_length,
+                       length_ratio=length_ratio, direction=direction)
+    tree.leaf_radius = leaf_radius
+    return bend_leaf(tree, angle_deg)
+
+
+_UNIT_CIRCLE = None
+
+
+def bend_leaf(tree, angle_deg, origin=ORIGIN):
+    """Re-point every branch and leaf of ``tree`` for a new branching angle,
+    in place, with the trunk starting at ``origin``.
+
+    Only the arrays from :func:`branch_levels` are recomputed; the mobjects,
+    their styles and their point counts stay, so an updater driven by a
+    ``ValueTracker`` can sweep the angle continuously.
+    """
+    global _UNIT_CIRCLE
+    if _UNIT_CIRCLE is None:
+        _UNIT_CIRCLE = Circle(radius=1.0).points
+    origin = np.asarray(origin, dtype=float)
+    geometry = branch_levels(angle_deg, **tree.params)
+    for branch, (starts, ends) in zip(tree.levels, geometry, strict=True):
+        branch.points = segment_points(starts + origin, ends + origin)
+    tips = geometry[-1][1] + origin
+    for dots, chunk in zip(tree.leaves, np.array_split(tips, len(tree.leaves)), strict=True):
+        dots.points = (chunk[:, None] + tree.leaf_radius * _UNIT_CIRCLE[None]).reshape(-1, 3)
+    tree.root = origin
     return tree
 
 
+def leaf_height(angle_deg, depth, length_ratio=LENGTH_RATIO):
+    """Height of a unit-trunk tree, straight from the branch arrays."""
+    ys = np.concatenate([
+        np.concatenate([starts[:, 1], ends[:, 1]])
+        for starts, ends in branch_levels(angle_deg, depth, 1.0, length_ratio)
+    ])
+    return ys.max() - ys.min()
+
+
 def fit_trunk_length(target_height, angle_deg, depth, length_ratio=LENGTH_RATIO):
     """Trunk length (screen units) so a tree of this angle/depth is ~target tall.
 
     Every coordinate scales linearly with ``trunk_length``, so we measure a
-    unit-trunk probe once and rescale.  Using a *fixed* trunk length across the
+    unit-trunk tree once and rescale.  Using a *fixed* trunk length across the
     sweep keeps the trunk the same size on screen while only the angle changes.
     """
-    probe = fractal_leaf(
-        angle_deg=angle_deg, depth=depth,
-        trunk_length=1.0, length_ratio=length_ratio, leaf_radius=0.0,
-    )
-    return target_height / max(probe.height, 1e-6)
+    return target_height / max(leaf_height(angle_deg, depth, length_ratio), 1e-6)
 
 
 # --------------------------------------------------------------------------- #
@@ -195,15 +256,15 @@ class FractalLeaf(Scene):
 
         self.play(Create(tree.branches), FadeIn(tree.leaves, scale=0.5))
 
-        trunk = tree.levels[0][0]
-        child = tree.levels[1][0]
+        trunk = tree.levels[0]
+        child_end = tree.levels[1].points[3]   # end of the first child branch
         node = trunk.get_end()
         trunk_dir = normalize(trunk.get_end() - trunk.get_start())
 
         # A dashed line continuing "straight ahead" so theta reads as the
         # deviation of a child from its parent's direction.
         cont = DashedLine(node, node + trunk_dir * 1.5, color=GREY_B, stroke_width=3)
-        arc = Angle(cont, Line(node, child.get_end()), radius=0.75, color=YELLOW)
+        arc = Angle(cont, Line(node, child_end), radius=0.75, color=YELLOW)
         label_pt = arc.point_from_proportion(0.5)
         theta = Text("θ", font_size=42, color=YELLOW).move_to(
             node + (label_pt - node) * 1.55
@@ -229,16 +290,27 @@ class FractalLeaf(Scene):
         trunk_len = fit_trunk_length(6.2, angles[0], DEPTH_SWEEP)
         root_target = UP * 3.4
 
-        def make(a):
-            return fractal_leaf(
-                angle_deg=a, depth=DEPTH_SWEEP, trunk_length=trunk_len
-            ).shift(root_target)
+        # One tree, re-pointed every frame from the tracked angle.
+        theta = ValueTracker(angles[0])
+        tree = fractal_leaf(
+            angle_deg=angles[0], depth=DEPTH_SWEEP, trunk_length=trunk_len
+        )
+        bend_leaf(tree, angles[0], root_target)
+        tree.add_updater(lambda t: bend_leaf(t, theta.get_value(), root_target))
 
         def label_for(a):
             return Text(f"θ = {a}°", font_size=44, color=TIP_BLUE).to_corner(UR)
 
-        tree = make(angles[0])
         label = label_for(angles[0])
+        shown = [angles[0]]
+
+        def relabel(mob):
+            a = int(round(theta.get_value()))
+            if a != shown[0]:            # re-typeset only when the number changes
+                shown[0] = a
+                mob.become(label_for(a))
+
+        label.add_updater(relabel)
         caption = Text(
             "Same trunk — a very different leaf", font_size=26, color=GREY_B
         ).to_edge(DOWN)
@@ -246,24 +318,26 @@ class FractalLeaf(Scene):
         self.play(FadeIn(tree), FadeIn(label), FadeIn(caption))
         self.wait(0.8)
 
-        for a in angles[1:]:
+        # Glide between the landmark angles and linger on each; the pace
+        # matches the old 0.55 s per 5° step.
+        start = angles[0]
+        for landmark in (30, 45, 60, 90):
             self.play(
-                Transform(tree, make(a)),
-                Transform(label, label_for(a)),
-                run_time=0.55, rate_func=smooth,
+                theta.animate.set_value(landmark),
+                run_time=0.55 * (landmark - start) / 5, rate_func=smooth,
             )
-            if a in (30, 45, 60, 90):     # linger on the landmark angles
-                self.wait(0.5)
+            self.wait(0.5)
+            start = landmark
         self.wait(1.2)
 
         # A quick sweep back down, just because it's satisfying.
-        for a in reversed(angles[:-1]):
-            self.play(
-                Transform(tree, make(a)),
-                Transform(label, label_for(a)),
-                run_time=0.28,
-            )
+        self.play(
+            theta.animate.set_value(angles[0]),
+            run_time=0.28 * (len(angles) - 1), rate_func=smooth,
+        )
         self.wait(1.0)
+        tree.clear_updaters()
+        label.clear_updaters()
         self.play(FadeOut(VGroup(tree, label, caption)))
 
     # -- outro ------------------------------------------------------------- #
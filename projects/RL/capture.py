@@ -0,0 +1,122 @@
+"""Video capture that keeps encoding off the game / training loop.
+
+``VideoRecorder.grab(surface)`` takes a zero-copy view of the surface's
+pixel buffer (``Surface.get_buffer``), copies it into one of a fixed pool of
+preallocated frame buffers (a plain memcpy, well under a millisecond at
+1200x800), and queues it.  A background thread does the channel reordering
+and the ``cv2.VideoWriter`` encoding; OpenCV releases the GIL while it works,
+so the main thread carries on drawing or training.
+
+When the encoder falls behind and every buffer is queued, ``policy`` decides:
+``'block'`` waits for a free buffer (every frame is kept), ``'drop'`` skips
+the frame and counts it in ``dropped``.
+
+If encoding fails, the thread stops and its exception is raised from the next
+``grab`` or ``close``.
+"""
+
+import queue
+import sys
+import threading
+
+import cv2
+import numpy as np
+import pygame
+
+
+class VideoRecorder:
+    def __init__(self, path, fps, size, queue_size=64, policy='block', fourcc='XVID'):
+        if policy not in ('block', 'drop'):
+            raise ValueError(f"policy must be 'block' or 'drop', not {policy!r}")
+        self.size = size
+        self.policy = policy
+        self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+        self.written = 0
+        self.dropped = 0
+        self._free = queue.Queue()
+        self._frames = queue.Queue()
+        self._queue_size = queue_size
+        self._layout = None
+        self._error = None
+        self._thread = threading.Thread(target=self._encode, name='video-encoder', daemon=True)
+        self._thread.start()
+
+    def grab(self, surface):
+        """Queue the current contents of ``surface`` (must be ``size``); False if dropped."""
+        self._check()
+        if self._layout is None:
+            self._setup(surface)
+        try:
+            buffer = self._free.get(block=self.policy == 'block')
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        if buffer is None:  # Woken by a failed encoder
+            self._check()
+        if self._layout == 'raw':
+            raw = np.frombuffer(surface.get_buffer(), dtype=np.uint8).reshape(self.size[1], surface.get_pitch())
+            np.copyto(buffer, raw[:, :buffer.shape[1] * buffer.shape[2]].reshape(buffer.shape))
+        else:
+            # pixels3d only maps 24/32-bit surfaces; array3d copies from any depth.
+            np.copyto(buffer, pygame.surfarray.array3d(surface).transpose(1, 0, 2))
+        self._frames.put(buffer)
+        return True
+
+    def close(self):
+        """Encode everything queued, then finish the file."""
+        self._frames.put(None)
+        self._thread.join()
+        self.writer.release()
+        self._check()
+
+    def release(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _setup(self, surface):
+        """Pick the copy path and channel order from the first surface grabbed."""
+        if surface.get_size() != tuple(self.size):
+            raise ValueError(f"surface is {surface.get_size()}, recorder expects {tuple(self.size)}")
+        width, height = self.size
+        nbytes = surface.get_bytesize()
+        if nbytes in (3, 4):
+            # Byte offset of each channel within a pixel.
+            shifts = surface.get_shifts()[:3]
+            if sys.byteorder == 'little':
+                self._bgr = [shifts[2] // 8, shifts[1] // 8, shifts[0] // 8]
+            else:
+                self._bgr = [nbytes - 1 - s // 8 for s in (shifts[2], shifts[1], shifts[0])]
+            self._layout, shape = 'raw', (height, width, nbytes)
+        else:
+            self._bgr, self._layout, shape = [2, 1, 0], 'rgb', (height, width, 3)
+        for _ in range(self._queue_size):
+            self._free.put(np.empty(shape, dtype=np.uint8))
+
+    def _check(self):
+        if self._error is not None:
+            raise self._error
+
+    def _encode(self):
+        try:
+            while True:
+                buffer = self._frames.get()
+                if buffer is None:
+                    break
+                if self._bgr == [0, 1, 2] and buffer.shape[2] == 4:
+                    frame = cv2.cvtColor(buffer, cv2.COLOR_BGRA2BGR)
+                elif self._bgr == [2, 1, 0]:
+                    frame = cv2.cvtColor(buffer[..., :3] if buffer.shape[2] == 4 else buffer,
+                                         cv2.COLOR_RGB2BGR)
+                else:
+                    frame = np.ascontiguousarray(buffer[..., self._bgr])
+                self._free.put(buffer)
+                self.writer.write(frame)
+                self.written += 1
+        except Exception as exc:
+            self._error = exc
+            self._free.put(None)  # Release a grab blocked on a free buffer
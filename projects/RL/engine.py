@@ -0,0 +1,505 @@
+"""Headless, tick-based core of the footsoldier-vs-monsters game.
+
+The game rules of ``footsoldier.py`` / ``monsters.py`` without pygame or the
+wall clock.  One tick is one genome action (one frame at ``FPS``):
+
+* cooldowns count ticks, not ``time.time()`` seconds;
+* an episode lasts ``SIMULATION_TIME * FPS`` ticks (what ``clock.tick(FPS)``
+  allowed in ``SIMULATION_TIME`` seconds);
+* no display or sprite sheets are needed.
+
+A genome is therefore scored thousands of times faster than real time, and
+the same genome and seed always give the same fitness.  ``run`` can also
+record a ``Trace`` of every tick.  ``pose`` copies one tick of it onto the
+pygame ``Footsoldier`` / ``Monster`` sprites, so a video is just a replay of
+the recorded run (see ``gen.py``).
+
+``MonsterStore`` / ``Arena`` are the same rules over struct-of-arrays state,
+stepping many soldiers (each against its own monsters) at once;
+``run_batch`` plays a whole population that way and ``Evaluator`` spreads
+it over worker processes.
+"""
+
+import multiprocessing
+import os
+import random
+from dataclasses import dataclass
+
+import numpy as np
+
+FPS = 20
+SIMULATION_TIME = 30
+WORLD_WIDTH = 1200
+WORLD_HEIGHT = 800
+ENCOUNTER_RADIUS = 200
+
+ACTIONS = ['left', 'right', 'up', 'down', 'attack']
+LEFT, RIGHT, UP, DOWN, ATTACK = range(len(ACTIONS))
+DIRECTIONS = ['left', 'right', 'up', 'down']
+
+# Footsoldier
+SOLDIER_START = (100, 100)
+SOLDIER_SIZE = 50
+SOLDIER_HEALTH = 100
+SOLDIER_SPEED = 5
+SOLDIER_ATTACK_RANGE = 30
+SOLDIER_ATTACK_POWER = 10
+SOLDIER_COOLDOWN = 1 * FPS
+
+# Monsters (same stats as monsters.Monster)
+MONSTER_SIZE = 50
+MONSTER_COOLDOWN = 1 * FPS
+MONSTER_TYPES = {
+    'strong': dict(health=200, attack_power=15, attack_range=100, speed=2,
+                   exp=10, gold=10, detection_range=150),
+    'weak': dict(health=20, attack_power=5, attack_range=80, speed=1,
+                 exp=10, gold=25, detection_range=100),
+}
+
+
+def encode(genome):
+    """Action names -> compact int8 codes (indices into ``ACTIONS``)."""
+    index = {a: i for i, a in enumerate(ACTIONS)}
+    return np.array([index[a] for a in genome], dtype=np.int8)
+
+
+def spawn_monsters(seed, count=20, strong_every=5):
+    """Monster layout exactly as ``Robot.spawn_monsters`` draws it."""
+    rng = random.Random(seed)
+    return [(rng.randint(0, WORLD_WIDTH), rng.randint(0, WORLD_HEIGHT),
+             'strong' if i % strong_every == 0 else 'weak') for i in range(count)]
+
+
+def _overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """``pygame.Rect.colliderect`` for non-empty rects."""
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+class Soldier:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+        self.direction = RIGHT
+        self.health = SOLDIER_HEALTH
+        self.alive = True
+        self.gold = 0
+        self.exp = 0
+        self.last_attack = None
+
+    def move(self, action):
+        if action == LEFT:
+            self.x = max(self.x - SOLDIER_SPEED, 0)
+            self.direction = LEFT
+        elif action == RIGHT:
+            self.x = min(self.x + SOLDIER_SPEED, WORLD_WIDTH - SOLDIER_SIZE)
+            self.direction = RIGHT
+        elif action == UP:
+            self.y = max(self.y - SOLDIER_SPEED, 0)
+        elif action == DOWN:
+            self.y = min(self.y + SOLDIER_SPEED, WORLD_HEIGHT - SOLDIER_SIZE)
+
+    def attack_rect(self):
+        s, r = SOLDIER_SIZE, SOLDIER_ATTACK_RANGE
+        return {
+            RIGHT: (self.x + s, self.y, r, s),
+            LEFT: (self.x - r, self.y, r, s),
+            UP: (self.x, self.y - r, s, r),
+            DOWN: (self.x, self.y + s, s, r),
+        }[self.direction]
+
+    def attack(self, monsters, tick):
+        """Swing if off cooldown; return (swung, hit anything)."""
+        if self.last_attack is not None and tick - self.last_attack < SOLDIER_COOLDOWN:
+            return False, False
+        self.last_attack = tick
+        rect = self.attack_rect()
+        hit = False
+        for m in monsters:
+            if m.alive and _overlap(*rect, m.x, m.y, MONSTER_SIZE, MONSTER_SIZE):
+                m.take_damage(SOLDIER_ATTACK_POWER, self)
+                hit = True
+        return True, hit
+
+    def take_damage(self, amount):
+        if self.alive:
+            self.health -= amount
+            if self.health <= 0:
+                self.health = 0
+                self.alive = False
+
+
+class Creature:
+    def __init__(self, x, y, monster_type):
+        self.x, self.y = x, y
+        self.monster_type = monster_type
+        self.stats = MONSTER_TYPES[monster_type]
+        self.health = self.stats['health']
+        self.alive = True
+        self.last_attack = None
+
+    def take_damage(self, amount, soldier):
+        if self.alive:
+            self.health -= amount
+            if self.health <= 0:
+                self.alive = False
+                self.health = 0
+                soldier.gold += self.stats['gold']
+                soldier.exp += self.stats['exp']
+
+    def act(self, soldier, tick):
+        """``Monster.handle_event``: chase inside detection range, bite inside attack range."""
+        st, half = self.stats, MONSTER_SIZE // 2
+        px, py = soldier.x + SOLDIER_SIZE // 2, soldier.y + SOLDIER_SIZE // 2
+        d2 = (self.x + half - px) ** 2 + (self.y + half - py) ** 2
+        if d2 > st['detection_range'] ** 2:
+            return
+        # move_towards compares the monster's corner with the player's centre.
+        if self.x < px:
+            self.x += st['speed']
+        elif self.x > px:
+            self.x -= st['speed']
+        if self.y < py:
+            self.y += st['speed']
+        elif self.y > py:
+            self.y -= st['speed']
+        if d2 <= st['attack_range'] ** 2:
+            if self.last_attack is None or tick - self.last_attack >= MONSTER_COOLDOWN:
+                d2 = (self.x + half - px) ** 2 + (self.y + half - py) ** 2
+                if d2 <= st['attack_range'] ** 2:
+                    soldier.take_damage(st['attack_power'])
+                self.last_attack = tick
+
+
+# Per-type stat columns for the struct-of-arrays store below.
+MONSTER_KINDS = list(MONSTER_TYPES)
+_STAT = {k: np.array([MONSTER_TYPES[t][k] for t in MONSTER_KINDS]) for k in MONSTER_TYPES['weak']}
+
+
+class MonsterStore:
+    """Struct-of-arrays monsters for ``arenas`` independent copies of one layout.
+
+    Every per-monster field is an ``(arenas, M)`` array and the per-type
+    stats are ``(M,)`` columns, so chasing, biting and being struck are a
+    handful of array operations for all monsters of all arenas at once.
+    ``health == 0`` marks a dead monster.
+    """
+
+    def __init__(self, layout, arenas=1):
+        xs, ys, types = zip(*layout) if layout else ((), (), ())
+        self.kind = np.array([MONSTER_KINDS.index(t) for t in types], dtype=np.intp)
+        for stat, column in _STAT.items():
+            setattr(self, stat, column[self.kind])
+        self.detection2 = self.detection_range ** 2
+        self.range2 = self.attack_range ** 2
+        self.x0, self.y0 = np.array(xs, dtype=np.int64), np.array(ys, dtype=np.int64)
+        shape = (arenas, len(self.kind))
+        self.x = np.broadcast_to(self.x0, shape).copy()
+        self.y = np.broadcast_to(self.y0, shape).copy()
+        self.hp = np.broadcast_to(self.health, shape).copy()
+        self.last_attack = np.full(shape, -MONSTER_COOLDOWN, dtype=np.int64)
+
+    def reset(self, idx, tick=0):
+        """Put arenas ``idx`` back to the initial layout (as if starting at ``tick``)."""
+        self.x[idx] = self.x0
+        self.y[idx] = self.y0
+        self.hp[idx] = self.health
+        self.last_attack[idx] = tick - MONSTER_COOLDOWN
+
+    @property
+    def alive(self):
+        return self.hp > 0
+
+    def act(self, px, py, tick, active):
+        """Chase / bite soldiers centred at ``(px, py)``; damage dealt per arena.
+
+        ``Monster.handle_event`` for every live monster of every ``active``
+        arena: step towards the soldier inside ``detection_range`` and, if it
+        was also inside ``attack_range`` and off cooldown, bite if still in
+        range after the step.  Soldiers don't move while monsters act, so
+        the order monsters act in doesn't matter.
+        """
+        half = MONSTER_SIZE // 2
+        px, py = px[:, None], py[:, None]
+        d2 = (self.x + half - px) ** 2 + (self.y + half - py) ** 2
+        chase = active[:, None] & (self.hp > 0) & (d2 <= self.detection2)
+        # move_towards compares the monster's corner with the soldier's centre.
+        self.x += chase * self.speed * np.sign(px - self.x)
+        self.y += chase * self.speed * np.sign(py - self.y)
+        bite = chase & (d2 <= self.range2) & (tick - self.last_attack >= MONSTER_COOLDOWN)
+        self.last_attack[bite] = tick
+        d2 = (self.x + half - px) ** 2 + (self.y + half - py) ** 2
+        return ((bite & (d2 <= self.range2)) * self.attack_power).sum(axis=1)
+
+    def struck(self, rect, swing, damage):
+        """Apply a swing of ``rect = (x, y, w, h)`` (arrays) per arena.
+
+        Returns whether each swing hit anything, and the gold and exp of the
+        monsters it killed.
+        """
+        rx, ry, rw, rh = (np.asarray(r)[:, None] for r in rect)
+        hit = (swing[:, None] & (self.hp > 0)
+               & (rx < self.x + MONSTER_SIZE) & (self.x < rx + rw)
+               & (ry < self.y + MONSTER_SIZE) & (self.y < ry + rh))
+        self.hp -= hit * damage
+        died = hit & (self.hp <= 0)
+        np.maximum(self.hp, 0, out=self.hp)
+        return hit.any(axis=1), (died * self.gold).sum(axis=1), (died * self.exp).sum(axis=1)
+
+    def nearest(self, x, y, alive_only=True):
+        """Index and squared distance of each arena's nearest monster to ``(x, y)``.
+
+        Distances are corner to corner, like the encounter test; arenas
+        without a (live) monster get index -1.
+        """
+        d2 = ((self.x - np.asarray(x)[..., None]) ** 2
+              + (self.y - np.asarray(y)[..., None]) ** 2).astype(float)
+        if alive_only:
+            d2[self.hp <= 0] = np.inf
+        if d2.shape[1] == 0:
+            return np.full(len(d2), -1), np.full(len(d2), np.inf)
+        idx = np.argmin(d2, axis=1)
+        best = d2[np.arange(len(d2)), idx]
+        return np.where(np.isfinite(best), idx, -1), best
+
+    def within(self, x, y, radius):
+        """Monsters (dead ones too) whose corner is closer than ``radius`` to ``(x, y)``."""
+        return ((self.x - np.asarray(x)[..., None]) ** 2
+                + (self.y - np.asarray(y)[..., None]) ** 2 < radius ** 2)
+
+
+class Arena:
+    """``arenas`` soldiers, each against its own copy of the monster layout.
+
+    Soldier state is one array per field; ``step`` advances every arena by
+    one tick of the same rules as ``Soldier`` / ``Creature``.
+    """
+
+    def __init__(self, arenas, seed=34, n_monsters=20, layout=None):
+        self.monsters = MonsterStore(spawn_monsters(seed, n_monsters) if layout is None else layout,
+                                     arenas)
+        self.x = np.full(arenas, SOLDIER_START[0], dtype=np.int64)
+        self.y = np.full(arenas, SOLDIER_START[1], dtype=np.int64)
+        self.direction = np.full(arenas, RIGHT, dtype=np.int64)
+        self.health = np.full(arenas, SOLDIER_HEALTH, dtype=np.int64)
+        self.gold = np.zeros(arenas, dtype=np.int64)
+        self.exp = np.zeros(arenas, dtype=np.int64)
+        self.last_attack = np.full(arenas, -SOLDIER_COOLDOWN, dtype=np.int64)
+        self.hits = np.zeros(arenas, dtype=np.int64)
+        self.ticks = np.zeros(arenas, dtype=np.int64)
+        self.tick = 0
+
+    @property
+    def alive(self):
+        return self.health > 0
+
+    def reset(self, idx):
+        """Start arenas ``idx`` afresh, mid-run (e.g. vectorised RL episodes)."""
+        self.monsters.reset(idx, self.tick)
+        self.x[idx], self.y[idx] = SOLDIER_START
+        self.direction[idx] = RIGHT
+        self.health[idx] = SOLDIER_HEALTH
+        self.gold[idx] = self.exp[idx] = self.hits[idx] = self.ticks[idx] = 0
+        self.last_attack[idx] = self.tick - SOLDIER_COOLDOWN
+
+    def step(self, actions, active=None):
+        """One tick of ``actions`` (codes, one per arena); dead soldiers sit out.
+
+        Returns whether each soldier swung (attack off cooldown).
+        """
+        actions = np.asarray(actions)
+        active = self.alive if active is None else active & self.alive
+        tick = self.tick
+        attack = active & (actions == ATTACK)
+        swing = attack & (tick - self.last_attack >= SOLDIER_COOLDOWN)
+        self.last_attack[swing] = tick
+        hit, gold, exp = self.monsters.struck(self.attack_rect(), swing, SOLDIER_ATTACK_POWER)
+        self.hits += hit
+        self.gold += gold
+        self.exp += exp
+
+        move = active & ~attack
+        left, right = move & (actions == LEFT), move & (actions == RIGHT)
+        up, down = move & (actions == UP), move & (actions == DOWN)
+        self.x = np.clip(self.x + SOLDIER_SPEED * (right.astype(np.int64) - left), 0, WORLD_WIDTH - SOLDIER_SIZE)
+        self.y = np.clip(self.y + SOLDIER_SPEED * (down.astype(np.int64) - up), 0, WORLD_HEIGHT - SOLDIER_SIZE)
+        self.direction[left] = LEFT
+        self.direction[right] = RIGHT
+
+        half = SOLDIER_SIZE // 2
+        damage = self.monsters.act(self.x + half, self.y + half, tick, active)
+        self.health = np.maximum(self.health - damage, 0)
+        self.ticks += active
+        self.tick += 1
+        return swing
+
+    def attack_rect(self):
+        s, r = SOLDIER_SIZE, SOLDIER_ATTACK_RANGE
+        d = self.direction
+        horizontal = (d == LEFT) | (d == RIGHT)
+        x = np.select([d == RIGHT, d == LEFT], [self.x + s, self.x - r], self.x)
+        y = np.select([d == UP, d == DOWN], [self.y - r, self.y + s], self.y)
+        return x, y, np.where(horizontal, r, s), np.where(horizontal, s, r)
+
+    def kills(self):
+        return (~self.monsters.alive).sum(axis=1)
+
+    def encounters(self, radius=ENCOUNTER_RADIUS):
+        return self.monsters.within(self.x, self.y, radius).sum(axis=1)
+
+    def fitness(self):
+        """``gen.py`` fitness of every arena (see ``run``)."""
+        return self.gold + self.encounters() + 30 * self.kills()
+
+
+def run_batch(genomes, seed=34, n_monsters=20, max_ticks=SIMULATION_TIME * FPS):
+    """``run`` for every row of a ``(P, L)`` genome matrix at once; ``Result`` list."""
+    genomes = np.asarray(genomes)[:, :max_ticks]
+    arena = Arena(len(genomes), seed, n_monsters)
+    for tick in range(genomes.shape[1]):
+        if not arena.alive.any():
+            break
+        arena.step(genomes[:, tick])
+    fields = zip(arena.fitness().tolist(), arena.ticks.tolist(), arena.hits.tolist(),
+                 arena.kills().tolist(), arena.encounters().tolist(), arena.gold.tolist(),
+                 arena.alive.tolist())
+    return [Result(*f) for f in fields]
+
+
+@dataclass
+class Trace:
+    """Per-tick state of a recorded run (tick ``t`` = after action ``t``)."""
+
+    monster_types: list
+    actions: np.ndarray     # (T,) int8
+    soldier: np.ndarray     # (T, 7) x, y, direction, health, gold, exp, swung
+    monsters: np.ndarray    # (T, M, 3) x, y, health (0 = dead)
+
+
+@dataclass
+class Result:
+    fitness: int
+    ticks: int
+    hits: int
+    kills: int
+    encounters: int
+    gold: int
+    alive: bool
+    trace: Trace = None
+
+
+def run(genome, seed=34, n_monsters=20, max_ticks=SIMULATION_TIME * FPS,
+        monsters_act=True, record=False):
+    """Play ``genome`` (action codes) for at most ``max_ticks`` ticks.
+
+    Fitness follows ``gen.py``: gold, +1 per monster within
+    ``ENCOUNTER_RADIUS`` at the end, +30 per monster killed.
+    """
+    soldier = Soldier(*SOLDIER_START)
+    monsters = [Creature(x, y, t) for x, y, t in spawn_monsters(seed, n_monsters)]
+    genome = np.asarray(genome)[:max_ticks]
+    if record:
+        actions = genome.astype(np.int8)
+        soldier_log = np.zeros((len(genome), 7), dtype=np.int32)
+        monster_log = np.zeros((len(genome), len(monsters), 3), dtype=np.int32)
+
+    hits = ticks = 0
+    for tick, action in enumerate(genome.tolist()):
+        if not soldier.alive:
+            break
+        swung = False
+        if action == ATTACK:
+            swung, hit = soldier.attack(monsters, tick)
+            hits += hit
+        else:
+            soldier.move(action)
+        if monsters_act:
+            for m in monsters:
+                if m.alive:
+                    m.act(soldier, tick)
+        ticks = tick + 1
+        if record:
+            soldier_log[tick] = (soldier.x, soldier.y, soldier.direction, soldier.health,
+                                 soldier.gold, soldier.exp, swung)
+            monster_log[tick] = [(m.x, m.y, m.health) for m in monsters]
+
+    kills = sum(not m.alive for m in monsters)
+    encounters = sum((soldier.x - m.x) ** 2 + (soldier.y - m.y) ** 2 < ENCOUNTER_RADIUS ** 2
+                     for m in monsters)
+    trace = None
+    if record:
+        trace = Trace([m.monster_type for m in monsters], actions[:ticks],
+                      soldier_log[:ticks], monster_log[:ticks])
+    return Result(fitness=soldier.gold + encounters + 30 * kills, ticks=ticks, hits=hits,
+                  kills=kills, encounters=encounters, gold=soldier.gold,
+                  alive=soldier.alive, trace=trace)
+
+
+def pose(trace, tick, player, monsters):
+    """Set pygame ``Footsoldier`` / ``Monster`` sprites to the state at ``tick``."""
+    x, y, direction, health, gold, exp, swung = trace.soldier[tick].tolist()
+    player.position.x, player.position.y = x, y
+    player.direction = DIRECTIONS[direction]
+    player.health, player.gold, player.exp = health, gold, exp
+    player.alive = health > 0
+    if swung:
+        player.current_action = 'attack'
+        player.current_frame = 0
+    elif trace.actions[tick] != ATTACK:
+        player.current_action = 'run'
+    for monster, (mx, my, mh) in zip(monsters, trace.monsters[tick].tolist()):
+        monster.position.x, monster.position.y = mx, my
+        monster.health = mh
+        monster.alive = mh > 0
+
+
+class Evaluator:
+    """Scores populations of genomes on a pool of worker processes.
+
+    Workers are started once with the episode settings (``run_batch``
+    keywords).  After that each worker gets one int8 block of the population
+    matrix, plays it with ``run_batch`` and sends back trace-less ``Result``
+    summaries.  With ``processes=1`` genomes are scored in this process.
+    """
+
+    def __init__(self, processes=None, **settings):
+        self.settings = settings
+        self.processes = processes or os.cpu_count() or 1
+        self._pool = None
+        if self.processes > 1:
+            ctx = multiprocessing.get_context('spawn')
+            self._pool = ctx.Pool(self.processes, initializer=_init_worker, initargs=(settings,))
+
+    def map(self, genomes):
+        """``Result`` of every genome (rows of a ``(P, L)`` array), in order."""
+        genomes = np.asarray(genomes, dtype=np.int8)
+        if self._pool is None:
+            return run_batch(genomes, **self.settings)
+        blocks = np.array_split(genomes, self.processes)
+        return [r for block in self._pool.map(_run_worker, blocks, chunksize=1) for r in block]
+
+    def fitness(self, genomes):
+        return np.array([r.fitness for r in self.map(genomes)])
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is not None and self._pool is not None:
+            self._pool.terminate()  # Don't wait on in-flight work after an error or Ctrl-C
+        self.close()
+
+
+_settings = {}
+
+
+def _init_worker(settings):
+    _settings.update(settings)
+
+
+def _run_worker(genomes):
+    return run_batch(genomes, **_settings)
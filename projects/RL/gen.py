@@ -3,13 +3,13 @@ import os
 import pygame
 from footsoldier import *
 from monsters import Monster
-import random
-import time
-import copy
+import argparse
+import json
 import cv2
 import numpy as np
 
-pygame.init()
+import engine
+from capture import VideoRecorder
 
 GAME_WIDTH = 1200
 GAME_HEIGHT = 800
@@ -18,21 +18,38 @@ BACKGROUND_COLOR = (50, 50, 50)
 SIMULATION_TIME = 30
 POPULATION_SIZE = 3
 NUM_GENERATIONS = 50
+GENOME_LENGTH = 4000
+ELITE_COUNT = 2  # Best genomes copied unchanged into the next generation
+TOURNAMENT_SIZE = 3
+CROSSOVER_POINTS = 2  # 0: uniform crossover
+MUTATION_RATE = 0.1
 GENERATIONS_TO_CAPTURE = [1, 3, 5, 10, 20, 35, 50]  # Specific generations to capture video
-ENCOUNTER_RADIUS = 200
+MONSTER_SEED = 34  # Every robot fights the same monster layout
 
-screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT))
-pygame.display.set_caption("Footsoldier Melee Simulation")
-clock = pygame.time.Clock()
-font = pygame.font.Font(None, 36)  # Font for displaying text
-
-# Load the tile image
-tile_image = pygame.image.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "tile.png")).convert()
-
-# Pre-render the full background on a larger surface
 WORLD_WIDTH = 1200
 WORLD_HEIGHT = 800
-background_surface = pygame.Surface((WORLD_WIDTH, WORLD_HEIGHT))
+PROCESSES = None  # Worker processes for fitness evaluation (None: one per CPU)
+
+# The display is only needed to draw replays, so it is opened on first use;
+# evaluation (including the worker processes) never touches it.
+screen = clock = font = background_surface = None
+
+def init_display():
+    global screen, clock, font, background_surface
+    if screen is not None:
+        return
+    pygame.init()
+    screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT))
+    pygame.display.set_caption("Footsoldier Melee Simulation")
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 36)  # Font for displaying text
+
+    # Load the tile image
+    tile_image = pygame.image.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), "tile.png")).convert()
+
+    # Pre-render the full background on a larger surface
+    background_surface = pygame.Surface((WORLD_WIDTH, WORLD_HEIGHT))
+    draw_full_background(background_surface, tile_image)
 
 def draw_full_background(surface, tile_image):
     tile_width = tile_image.get_width()
@@ -42,94 +59,31 @@ def draw_full_background(surface, tile_image):
         for x in range(0, WORLD_WIDTH, tile_width):
             surface.blit(tile_image, (x, y))
 
-# Generate the full background
-draw_full_background(background_surface, tile_image)
-
-class Robot:
-    def __init__(self, robot_id):
-        self.robot_id = robot_id
-        self.genome = [random.choice(['left', 'right', 'up', 'down', 'attack']) for _ in range(4000)]  # Placeholder genome
-        self.fitness = 0
-        self.player = Footsoldier((100, 100), screen)  
-        self.monsters = self.spawn_monsters(seed=34)  # Each robot has its own monster set
-        self.encountered_monsters = set()
-
-    def spawn_monsters(self, seed):
-        random.seed(seed)
-        return [Monster(position=(random.randint(0, WORLD_WIDTH), random.randint(0, WORLD_HEIGHT)),
-                        monster_type='strong' if i % 5 == 0 else 'weak') for i in range(20)]
-
-    def evaluate_fitness(self):
-        self.fitness += self.player.gold
-        for monster in self.monsters:
-            distance_to_monster = np.linalg.norm(np.array(self.player.position) - np.array(monster.position))
-            if distance_to_monster < ENCOUNTER_RADIUS:  # Consider an encounter if within 50 pixels
-                if monster not in self.encountered_monsters:
-                    self.encountered_monsters.add(monster)
-                    self.fitness += 1  # Reward for encountering a new monster
-
-            if not monster.alive:
-                self.fitness += 30 
-
-    def simulate(self, capture_video=False, out=None, generation=None, render=True):
-        start_time = time.time()
-        running = True
-
-        for action in self.genome:
-            if time.time() - start_time > SIMULATION_TIME or not self.player.alive:
-                break
-
-            if action == 'attack':
-                self.player.attack(monsters=self.monsters)
-            else:
-                self.player.move(action)
-                
-            if render:
-                camera_x, camera_y = center_camera_on_player(self.player.position)
-
-                screen.blit(background_surface, (0, 0), (camera_x, camera_y, GAME_WIDTH, GAME_HEIGHT))
-                self.player.draw(camera_x, camera_y)
-
-                # Draw monsters
-                for monster in self.monsters:
-                    if monster.alive:
-                        monster.handle_event(None, self.player)
-                        monster.draw(screen, camera_x, camera_y)
-
-                # Display generation and robot ID
-                text_surface = font.render(f"Generation: {generation + 1}  Robot ID: {self.robot_id}", True, (255, 255, 255))
-                screen.blit(text_surface, (10, 10))
-
-                pygame.display.flip()
-
-            if capture_video:
-                # Capture the frame
-                frame = pygame.surfarray.array3d(screen)
-                frame = np.rot90(frame)
-                frame = np.flipud(frame)
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                out.write(frame)
-
-            clock.tick(FPS)
-
-        self.evaluate_fitness()
-
-    def copy_without_surface(self):
-        """Returns a deepcopy of the robot without copying the pygame.Surface objects."""
-        new_robot = Robot(self.robot_id)
-        new_robot.genome = copy.deepcopy(self.genome)
-        new_robot.fitness = self.fitness
-        # Reinitialize player and monsters without copying surfaces
-        new_robot.player = Footsoldier(self.player.position, screen)
-        new_robot.player.gold = self.player.gold
-        new_robot.player.alive = self.player.alive
-
-        new_robot.monsters = []
-        for monster in self.monsters:
-            new_monster = Monster(monster.position, monster.monster_type)
-            new_monster.alive = monster.alive
-            new_robot.monsters.append(new_monster)
-        return new_robot
+def replay(trace, robot_id, generation, out=None):
+    """Draw a recorded run tick by tick, handing each frame to ``out`` (a ``VideoRecorder``) if given."""
+    init_display()
+    player = Footsoldier(engine.SOLDIER_START, screen)
+    monsters = [Monster((0, 0), monster_type) for monster_type in trace.monster_types]
+
+    for tick in range(len(trace.actions)):
+        engine.pose(trace, tick, player, monsters)
+        camera_x, camera_y = center_camera_on_player(player.position)
+
+        screen.blit(background_surface, (0, 0), (camera_x, camera_y, GAME_WIDTH, GAME_HEIGHT))
+        player.draw(camera_x, camera_y)
+        for monster in monsters:
+            monster.draw(screen, camera_x, camera_y)
+
+        # Display generation and robot ID
+        text_surface = font.render(f"Generation: {generation + 1}  Robot ID: {robot_id}", True, (255, 255, 255))
+        screen.blit(text_surface, (10, 10))
+
+        pygame.display.flip()
+
+        if out is not None:
+            out.grab(screen)  # Encoded on the recorder's thread
+        else:
+            clock.tick(FPS)  # Watching live: play back at game speed
 
 def center_camera_on_player(player_position):
     camera_x = player_position.x - GAME_WIDTH // 2
@@ -141,70 +95,98 @@ def center_camera_on_player(player_position):
 
     return camera_x, camera_y
 
-def genetic_algorithm():
-    # Set up video capture for all selected generations
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')
-    out = cv2.VideoWriter('robot_animation.avi', fourcc, FPS, (GAME_WIDTH, GAME_HEIGHT))
-
-    # Initialize population with random genomes
-    population = [Robot(robot_id=i) for i in range(POPULATION_SIZE)]
-
-    for generation in range(NUM_GENERATIONS):
-        print(f"Generation {generation + 1}")
-        capture_video = (generation + 1) in GENERATIONS_TO_CAPTURE
-        if capture_video:
-            random_robot = population[0] # Select a random robot to capture its run
-
-        for robot in population:
-            if capture_video and robot == random_robot:
-                robot.simulate(capture_video=True, out=out, generation=generation, render=True)
-            else:
-                robot.simulate(generation=generation, render=False)  
-            print(f"Robot {robot.robot_id} Fitness: {robot.fitness}")
-
-        population.sort(key=lambda r: r.fitness, reverse=True)
-        best_fitness = population[0].fitness
-        print(f"Best fitness in generation {generation + 1}: {best_fitness}")
-        if generation == 0:
-            next_generation = []
-            next_generation.append(population[0].copy_without_surface())
-            next_generation.append(population[1].copy_without_surface())
-
-            for i in range(2, POPULATION_SIZE):
-                parent = random.choice(next_generation[:2])
-                child_genome = mutate(copy.deepcopy(parent.genome))
-                new_robot = Robot(robot_id=i)
-                new_robot.genome = child_genome
-                next_generation.append(new_robot)
-        else:
-            next_generation = []
-            next_generation.extend(robot.copy_without_surface() for robot in population[:2])
-
-            # Breed new individuals from the top performers
-            while len(next_generation) < POPULATION_SIZE:
-                parent1, parent2 = random.sample(next_generation[:2], 2)
-                child_genome = crossover(parent1.genome, parent2.genome)
-                child_genome = mutate(child_genome)
-                new_robot = Robot(robot_id=len(next_generation))
-                new_robot.genome = child_genome
-                next_generation.append(new_robot)
-
-        population = next_generation
-
-    out.release()
-
-def crossover(genome1, genome2):
-    crossover_point = random.randint(0, len(genome1) - 1)
-    return genome1[:crossover_point] + genome2[crossover_point:]
-
-def mutate(genome):
-    MUTATION_RATE = 0.1
-    for i in range(len(genome)):
-        if random.random() < MUTATION_RATE:
-            genome[i] = random.choice(['left', 'right', 'up', 'down', 'attack'])
-    return genome
+def genetic_algorithm(population_size=POPULATION_SIZE, generations=NUM_GENERATIONS, seed=0,
+                      checkpoint=None, resume=None, processes=PROCESSES):
+    """Evolve a ``(population_size, GENOME_LENGTH)`` int8 population.
+
+    With ``checkpoint`` the population is saved after every generation;
+    ``resume`` continues from such a file (its population size wins).
+    """
+    if resume:
+        start, population, rng = load_checkpoint(resume)
+    else:
+        start, rng = 0, np.random.default_rng(seed)
+        population = rng.integers(0, len(engine.ACTIONS), (population_size, GENOME_LENGTH), dtype=np.int8)
+
+    out = None
+    with engine.Evaluator(processes, seed=MONSTER_SEED, max_ticks=SIMULATION_TIME * FPS) as evaluator:
+        for generation in range(start, generations):
+            print(f"Generation {generation + 1}")
+            fitness = evaluator.fitness(population)
+            best = int(np.argmax(fitness))
+            print(f"Best fitness in generation {generation + 1}: {fitness[best]}  (mean {fitness.mean():.1f})")
+
+            if (generation + 1) in GENERATIONS_TO_CAPTURE:
+                if out is None:
+                    # Set up video capture for all selected generations
+                    out = VideoRecorder('robot_animation.avi', FPS, (GAME_WIDTH, GAME_HEIGHT))
+                # Re-run the best robot with recording on and replay it into the video
+                result = engine.run(population[best], seed=MONSTER_SEED,
+                                    max_ticks=SIMULATION_TIME * FPS, record=True)
+                replay(result.trace, best, generation, out)
+
+            population = next_generation(rng, population, fitness)
+            if checkpoint:
+                save_checkpoint(checkpoint, generation + 1, population, rng)
+
+    if out is not None:
+        out.close()
+    return population
+
+def next_generation(rng, population, fitness):
+    """Elites, then children of tournament-selected parents (crossover + mutation)."""
+    elite = population[np.argsort(-fitness, kind='stable')[:ELITE_COUNT]]
+    n = len(population) - len(elite)
+    parents1 = population[tournament(rng, fitness, n)]
+    parents2 = population[tournament(rng, fitness, n)]
+    children = mutate(rng, crossover(rng, parents1, parents2))
+    return np.concatenate([elite, children])
+
+def tournament(rng, fitness, n, size=TOURNAMENT_SIZE):
+    """Indices of ``n`` winners, each the fittest of ``size`` random entrants."""
+    entrants = rng.integers(0, len(fitness), (n, size))
+    return entrants[np.arange(n), np.argmax(fitness[entrants], axis=1)]
+
+def crossover(rng, parents1, parents2, points=CROSSOVER_POINTS):
+    """Row-wise children: ``points``-point crossover, or uniform for ``points=0``."""
+    n, length = parents1.shape
+    if points:
+        # Each cut toggles which parent the genes come from from there on.
+        toggles = np.zeros((n, length), dtype=np.int8)
+        np.add.at(toggles, (np.arange(n)[:, None], rng.integers(1, length, (n, points))), 1)
+        from_second = np.cumsum(toggles, axis=1, dtype=np.int16) % 2 == 1
+    else:
+        from_second = rng.random((n, length)) < 0.5
+    return np.where(from_second, parents2, parents1)
+
+def mutate(rng, genomes, rate=MUTATION_RATE):
+    """Replace each gene with a random action with probability ``rate`` (in place)."""
+    mask = rng.random(genomes.shape) < rate
+    genomes[mask] = rng.integers(0, len(engine.ACTIONS), np.count_nonzero(mask), dtype=np.int8)
+    return genomes
+
+def save_checkpoint(path, generation, population, rng):
+    """Population, next generation number and RNG state as one ``.npz`` file."""
+    np.savez_compressed(path, generation=generation, population=population,
+                        rng_state=json.dumps(rng.bit_generator.state))
+
+def load_checkpoint(path):
+    """``(generation, population, rng)`` saved by ``save_checkpoint``."""
+    with np.load(path) as data:
+        rng = np.random.default_rng()
+        rng.bit_generator.state = json.loads(str(data['rng_state']))
+        return int(data['generation']), data['population'], rng
 
 if __name__ == '__main__':
-    genetic_algorithm()
+    parser = argparse.ArgumentParser(description="Evolve footsoldier action sequences")
+    parser.add_argument('--population', type=int, default=POPULATION_SIZE)
+    parser.add_argument('--generations', type=int, default=NUM_GENERATIONS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=PROCESSES)
+    parser.add_argument('--checkpoint', help="save the population here after every generation (.npz)")
+    parser.add_argument('--resume', help="continue from a checkpoint")
+    args = parser.parse_args()
+    genetic_algorithm(args.population, args.generations, args.seed,
+                      args.checkpoint, args.resume, args.processes)
     pygame.quit()
-    cv2.destroyAllWindows()
\ No newline at end of file
+    cv2.destroyAllWindows()
@@ -1,6 +1,7 @@
-import pygame
-import random
+import argparse
+import copy
 import time
+
 import cv2
 import numpy as np
 import torch
@@ -8,65 +9,37 @@ import torch.nn as nn
 import torch.optim as optim
 import torch.nn.functional as F
 
-# Initialize Pygame and set up display
-pygame.init()
+import engine
+from capture import VideoRecorder
 
 GAME_WIDTH = 1200
 GAME_HEIGHT = 800
-FPS = 20
+FPS = engine.FPS
 SIMULATION_TIME = 30
-NUM_GENERATIONS = 50
+MAX_TICKS = SIMULATION_TIME * FPS
+NUM_GENERATIONS = 50  # Training epochs, one episode length of vector steps each
 GENERATIONS_TO_CAPTURE = [1, 3, 5, 10, 20, 35, 50]  # Specific generations to capture video
-ENCOUNTER_RADIUS = 200
-
-screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT))
-pygame.display.set_caption("Footsoldier Melee Simulation")
-clock = pygame.time.Clock()
-font = pygame.font.Font(None, 36)
-
-# Dummy classes to replace the external modules for this example
-class Footsoldier:
-    def __init__(self, position, screen):
-        self.position = position
-        self.health = 100
-        self.alive = True
-        self.gold = 0
-        self.screen = screen
-
-    def move(self, direction):
-        if direction == 'left':
-            self.position[0] -= 10
-        elif direction == 'right':
-            self.position[0] += 10
-        elif direction == 'up':
-            self.position[1] -= 10
-        elif direction == 'down':
-            self.position[1] += 10
-
-    def attack(self, monsters):
-        for monster in monsters:
-            if np.linalg.norm(np.array(self.position) - np.array(monster.position)) < 50:
-                monster.alive = False
-
-    def draw(self, camera_x, camera_y):
-        pygame.draw.circle(self.screen, (0, 255, 0), (self.position[0] - camera_x, self.position[1] - camera_y), 10)
-
-class Monster:
-    def __init__(self, position, monster_type):
-        self.position = position
-        self.health = 50 if monster_type == 'weak' else 100
-        self.alive = True
-
-    def draw(self, screen, camera_x, camera_y):
-        if self.alive:
-            pygame.draw.circle(screen, (255, 0, 0), (self.position[0] - camera_x, self.position[1] - camera_y), 10)
+MONSTER_SEED = 34
+
+# DQN
+STATE_SIZE = 8
+NUM_ENVS = 32  # Arenas stepped together; all of them feed the one learner
+BUFFER_SIZE = 200_000
+BATCH_SIZE = 256
+WARMUP = 5_000  # Transitions collected before learning starts
+UPDATES_PER_STEP = 1  # Gradient steps per vector step (of NUM_ENVS transitions)
+GAMMA = 0.99
+LEARNING_RATE = 1e-3
+TARGET_SYNC = 1_000  # Gradient steps between target network updates
+EPSILON_START, EPSILON_END, EPSILON_DECAY = 1.0, 0.05, 300_000  # Decay over env steps
+
 
 class NeuralNet(nn.Module):
     def __init__(self):
         super(NeuralNet, self).__init__()
-        self.fc1 = nn.Linear(8, 64)
+        self.fc1 = nn.Linear(STATE_SIZE, 64)
         self.fc2 = nn.Linear(64, 32)
-        self.fc3 = nn.Linear(32, 5)  # 5 possible actions
+        self.fc3 = nn.Linear(32, len(engine.ACTIONS))  # 5 possible actions
 
     def forward(self, x):
         x = F.relu(self.fc1(x))
@@ -74,125 +47,183 @@ class NeuralNet(nn.Module):
         x = self.fc3(x)
         return x
 
-class Robot:
-    def __init__(self, robot_id, model=None):
-        self.robot_id = robot_id
-        self.fitness = 0
-        self.player = Footsoldier([100, 100], screen)  
-        self.monsters = self.spawn_monsters(seed=34)  
-        self.encountered_monsters = set()
 
+def get_state(arena):
+    """``(arenas, STATE_SIZE)`` float32 observation of every arena.
+
+    Own position and health, the nearest live monster (health fraction,
+    offset, present flag) and the fraction of monsters within the encounter
+    radius, all scaled to about ``[-1, 1]``.
+    """
+    monsters = arena.monsters
+    idx, _ = monsters.nearest(arena.x, arena.y)
+    rows, j, found = np.arange(len(idx)), np.maximum(idx, 0), idx >= 0
+    return np.stack([
+        arena.x / engine.WORLD_WIDTH,
+        arena.y / engine.WORLD_HEIGHT,
+        arena.health / engine.SOLDIER_HEALTH,
+        found * monsters.hp[rows, j] / monsters.health[j],
+        found * (monsters.x[rows, j] - arena.x) / engine.WORLD_WIDTH,
+        found * (monsters.y[rows, j] - arena.y) / engine.WORLD_HEIGHT,
+        found,
+        arena.encounters() / max(len(monsters.kind), 1),
+    ], axis=1).astype(np.float32)
+
+
+class ReplayBuffer:
+    """Transitions in preallocated ring arrays; batches are added and sampled whole."""
+
+    def __init__(self, capacity=BUFFER_SIZE, state_size=STATE_SIZE):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, states, actions, rewards, next_states, dones):
+        idx = (self.head + np.arange(len(states))) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+        self.head = (self.head + len(states)) % self.capacity
+        self.size = min(self.size + len(states), self.capacity)
+
+    def sample(self, batch_size, rng):
+        """Tensors ``(states, actions, rewards, next_states, dones)`` of a random batch."""
+        idx = rng.integers(0, self.size, batch_size)
+        return tuple(torch.from_numpy(a[idx]) for a in
+                     (self.states, self.actions, self.rewards, self.next_states, self.dones))
+
+
+class Learner:
+    """DQN on minibatches from a ``ReplayBuffer``, with a periodically synced target network."""
+
+    def __init__(self, model=None, lr=LEARNING_RATE, gamma=GAMMA, target_sync=TARGET_SYNC):
         self.model = model if model else NeuralNet()
-
-        self.optimizer = optim.Adam(self.model.parameters(), lr=0.001)
-        self.criterion = nn.MSELoss()
-
-    def spawn_monsters(self, seed):
-        random.seed(seed)
-        return [Monster(position=(random.randint(0, GAME_WIDTH), random.randint(0, GAME_HEIGHT)),
-                        monster_type='strong' if i % 5 == 0 else 'weak') for i in range(20)]
-
-    def evaluate_fitness(self):
-        self.fitness += self.player.gold
-        for monster in self.monsters:
-            distance_to_monster = np.linalg.norm(np.array(self.player.position) - np.array(monster.position))
-            if distance_to_monster < ENCOUNTER_RADIUS and monster not in self.encountered_monsters:
-                self.encountered_monsters.add(monster)
-                self.fitness += 1
-            if not monster.alive:
-                self.fitness += 30 
-
-    def simulate(self, capture_video=False, out=None, generation=None):
-        start_time = time.time()
-        state = self.get_state()
-
-        for _ in range(4000):
-            if time.time() - start_time > SIMULATION_TIME or not self.player.alive:
-                break
-
-            action = self.choose_action(state)
-            self.perform_action(action)
-            new_state = self.get_state()
-            reward = self.calculate_reward()
-            self.optimize_model(state, action, reward, new_state)
-
-            state = new_state
-
-            if capture_video:
-                frame = pygame.surfarray.array3d(screen)
-                frame = np.rot90(frame)
-                frame = np.flipud(frame)
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                out.write(frame)
-
-            clock.tick(FPS)
-
-        self.evaluate_fitness()
-
-    def get_state(self):
-        player_x, player_y = self.player.position
-        nearest_monster = min(self.monsters, key=lambda m: np.linalg.norm(np.array(self.player.position) - np.array(m.position)))
-        monster_x, monster_y = nearest_monster.position
-        return np.array([player_x, player_y, self.player.health, nearest_monster.health,
-                         monster_x, monster_y, nearest_monster.alive, len(self.encountered_monsters)])
-
-    def choose_action(self, state):
-        state = torch.FloatTensor(state)
+        self.target = copy.deepcopy(self.model).requires_grad_(False)
+        self.optimizer = optim.Adam(self.model.parameters(), lr=lr)
+        self.gamma = gamma
+        self.target_sync = target_sync
+        self.updates = 0
+
+    def act(self, states, epsilon, rng):
+        """Epsilon-greedy actions for a batch of states (one forward pass)."""
+        with torch.no_grad():
+            greedy = self.model(torch.from_numpy(states)).argmax(dim=1).numpy()
+        explore = rng.random(len(states)) < epsilon
+        return np.where(explore, rng.integers(0, len(engine.ACTIONS), len(states)), greedy)
+
+    def learn(self, batch):
+        """One gradient step; returns the (detached) Huber loss."""
+        states, actions, rewards, next_states, dones = batch
+        q_values = self.model(states).gather(1, actions[:, None]).squeeze(1)
         with torch.no_grad():
-            action_values = self.model(state)
-        return torch.argmax(action_values).item()
-
-    def perform_action(self, action):
-        actions = ['left', 'right', 'up', 'down', 'attack']
-        chosen_action = actions[action]
-        if chosen_action == 'attack':
-            self.player.attack(monsters=self.monsters)
-        else:
-            self.player.move(chosen_action)
-
-    def calculate_reward(self):
-        reward = 0
-        for monster in self.monsters:
-            if not monster.alive:
-                reward += 30
-        return reward
-
-    def optimize_model(self, state, action, reward, next_state):
-        state = torch.FloatTensor(state)
-        next_state = torch.FloatTensor(next_state)
-        reward = torch.FloatTensor([reward])
-        action = torch.LongTensor([action])
-
-        q_values = self.model(state)
-        next_q_values = self.model(next_state)
-
-        target_q_value = reward + 0.99 * torch.max(next_q_values)
-        expected_q_value = q_values[action]
-
-        loss = self.criterion(expected_q_value, target_q_value)
+            target_q_values = rewards + self.gamma * (1.0 - dones) * self.target(next_states).max(dim=1).values
+        loss = F.smooth_l1_loss(q_values, target_q_values)
 
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
 
-def train_neural_network():
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')
-    out = cv2.VideoWriter('robot_training.avi', fourcc, FPS, (GAME_WIDTH, GAME_HEIGHT))
-
-    model = NeuralNet()
-
-    for generation in range(NUM_GENERATIONS):
+        self.updates += 1
+        if self.updates % self.target_sync == 0:
+            self.target.load_state_dict(self.model.state_dict())
+        return loss.detach()
+
+
+def epsilon(env_steps):
+    frac = min(env_steps / EPSILON_DECAY, 1.0)
+    return EPSILON_START + frac * (EPSILON_END - EPSILON_START)
+
+
+def play_greedy(model):
+    """Greedy episode in a fresh arena; returns its action codes and fitness."""
+    arena = engine.Arena(1, seed=MONSTER_SEED)
+    actions = []
+    with torch.no_grad():
+        while arena.alive[0] and arena.tick < MAX_TICKS:
+            action = model(torch.from_numpy(get_state(arena))).argmax(dim=1).numpy()
+            arena.step(action)
+            actions.append(action[0])
+    return np.array(actions, dtype=np.int8), int(arena.fitness()[0])
+
+
+def train_neural_network(generations=NUM_GENERATIONS, num_envs=NUM_ENVS, seed=0):
+    """Train one learner on ``num_envs`` arenas stepped together.
+
+    Acting and learning are decoupled: every vector step adds ``num_envs``
+    transitions to the buffer, then the learner takes ``UPDATES_PER_STEP``
+    minibatch steps regardless of how many arenas there are.  Arenas whose
+    soldier died or ran out of time restart in place.
+    """
+    torch.manual_seed(seed)
+    rng = np.random.default_rng(seed)
+    learner = Learner()
+    buffer = ReplayBuffer()
+    arena = engine.Arena(num_envs, seed=MONSTER_SEED)
+    state, score = get_state(arena), arena.fitness()
+    env_steps = 0
+    out = None
+
+    for generation in range(generations):
         print(f"Generation {generation + 1}")
-        capture_video = (generation + 1) in GENERATIONS_TO_CAPTURE
-
-        robot = Robot(robot_id=0, model=model)
-        robot.simulate(capture_video=capture_video, out=out, generation=generation)
-
-        print(f"Robot Fitness: {robot.fitness}")
+        start, steps0, updates0 = time.perf_counter(), env_steps, learner.updates
+        losses, returns = [], []
+        for _ in range(MAX_TICKS):
+            actions = learner.act(state, epsilon(env_steps), rng)
+            arena.step(actions)
+            new_score = arena.fitness()
+            dead = ~arena.alive
+            next_state = get_state(arena)
+            # Reward is the fitness gained this tick; only death cuts off bootstrapping.
+            buffer.add(state, actions, new_score - score, next_state, dead)
+            env_steps += num_envs
+
+            done = np.flatnonzero(dead | (arena.ticks >= MAX_TICKS))
+            if done.size:
+                returns.extend(new_score[done].tolist())
+                arena.reset(done)
+                next_state, new_score = get_state(arena), arena.fitness()
+            state, score = next_state, new_score
+
+            if len(buffer) >= WARMUP:
+                for _ in range(UPDATES_PER_STEP):
+                    losses.append(learner.learn(buffer.sample(BATCH_SIZE, rng)))
+        elapsed = time.perf_counter() - start
+
+        greedy_actions, fitness = play_greedy(learner.model)
+        loss = torch.stack(losses).mean().item() if losses else float('nan')
+        mean_return = np.mean(returns) if returns else float('nan')
+        print(f"Robot Fitness: {fitness}  (episode mean {mean_return:.1f}, epsilon {epsilon(env_steps):.2f}, "
+              f"loss {loss:.3f})")
+        print(f"  {(env_steps - steps0) / elapsed:,.0f} env-steps/s  "
+              f"{(learner.updates - updates0) / elapsed:,.0f} grad-steps/s")
+
+        if (generation + 1) in GENERATIONS_TO_CAPTURE:
+            import gen  # Display and sprites are only needed for the video
+            if out is None:
+                out = VideoRecorder('robot_training.avi', FPS, (GAME_WIDTH, GAME_HEIGHT))
+            trace = engine.run(greedy_actions, seed=MONSTER_SEED, max_ticks=MAX_TICKS, record=True).trace
+            gen.replay(trace, 0, generation, out)
+
+    if out is not None:
+        out.close()
+    return learner.model
 
-    out.release()
 
 if __name__ == '__main__':
-    train_neural_network()
-    pygame.quit()
+    parser = argparse.ArgumentParser(description="Train a DQN footsoldier")
+    parser.add_argument('--generations', type=int, default=NUM_GENERATIONS)
+    parser.add_argument('--envs', type=int, default=NUM_ENVS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    train_neural_network(args.generations, args.envs, args.seed)
     cv2.destroyAllWindows()
@@ -4,14 +4,17 @@ import copy
 import pygame
 from footsoldier import Footsoldier
 from monsters import Monster
-import time
 import cv2 
 import multiprocessing
+import numpy as np
+
+import engine
 
 # Screen and world dimensions
 WORLD_WIDTH = 1200
 WORLD_HEIGHT = 800
 SIMULATION_TIME = 60 
+MONSTER_SEED = 34
 GAME_WIDTH = 1200
 GAME_HEIGHT = 800
 screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT))
@@ -24,7 +27,7 @@ MUTATION_RATE = 0.1
 NUM_GENERATIONS = 50
 
 # Possible actions for the bot
-ACTIONS = ['left', 'right', 'up', 'down', 'attack']
+ACTIONS = engine.ACTIONS
 # Pre-render the full background on a larger surface
 background_surface = pygame.Surface((WORLD_WIDTH, WORLD_HEIGHT))
 
@@ -49,32 +52,20 @@ def center_camera_on_player(player_position):
 class Robot:
     def __init__(self, robot_id):
         self.robot_id = robot_id
-        self.genome = [random.choice(ACTIONS) for _ in range(GENOME_LENGTH)]
+        self.genome = np.random.randint(len(ACTIONS), size=GENOME_LENGTH, dtype=np.int8)  # Action codes
         self.fitness = 0
         self.player = Footsoldier((100, 100), screen)  
-        self.monsters = self.spawn_monsters(seed=34)  
+        self.monsters = self.spawn_monsters(seed=MONSTER_SEED)  
         self.generation = 1
 
-    def evaluate_fitness(self, seed):
-        random.seed(seed)
-        start_time = time.time()
-        
-        for action in self.genome:
-            if time.time() - start_time > SIMULATION_TIME:
-                break
-
-            if not self.player.alive:
-                break
-
-            if action == 'attack':
-                hit = self.player.attack(monsters=self.monsters)
-                if hit:
-                    self.fitness += 1
-            else:
-                self.player.move(action)
-
-        # Add any leftover gold as fitness
-        self.fitness += self.player.gold
+    def evaluate_fitness(self):
+        """Play the genome on the headless engine: +1 per hit plus the gold collected."""
+        result = engine.run(self.genome, seed=MONSTER_SEED, n_monsters=len(self.monsters),
+                            max_ticks=SIMULATION_TIME * engine.FPS, record=True)
+        self.fitness = result.hits + result.gold
+        # Leave the sprites where the run ended, for simulate_frame.
+        if result.ticks:
+            engine.pose(result.trace, result.ticks - 1, self.player, self.monsters)
 
     def simulate_frame(self, screen):
         if self.player is None:
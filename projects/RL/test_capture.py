@@ -0,0 +1,56 @@
+"""``VideoRecorder`` hands the encoder the right BGR bytes at every surface depth."""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+import pytest
+
+from capture import VideoRecorder
+
+SIZE = (6, 4)
+
+
+class FrameSink:
+    """Stands in for ``cv2.VideoWriter``: keeps every frame it is given."""
+
+    def __init__(self):
+        self.frames = []
+
+    def write(self, frame):
+        self.frames.append(frame.copy())
+
+    def release(self):
+        pass
+
+
+def painted_surface(depth):
+    surface = pygame.Surface(SIZE, depth=depth)
+    colours = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 255), (0, 0, 0), (255, 255, 0)]
+    if depth == 8:
+        surface.set_palette(colours + [(0, 0, 0)] * (256 - len(colours)))
+    for x in range(SIZE[0]):
+        for y in range(SIZE[1]):
+            surface.set_at((x, y), colours[(x + y) % len(colours)])
+    return surface
+
+
+@pytest.mark.parametrize('depth', [8, 16, 24, 32])
+def test_grab_encodes_bgr_at_any_depth(tmp_path, depth):
+    pygame.init()
+    surface = painted_surface(depth)
+    expected = pygame.surfarray.array3d(surface).transpose(1, 0, 2)[..., ::-1]
+
+    recorder = VideoRecorder(str(tmp_path / 'out.avi'), 30, SIZE, queue_size=2)
+    recorder.writer.release()
+    recorder.writer = FrameSink()
+    sink = recorder.writer
+    for _ in range(3):
+        assert recorder.grab(surface)
+    recorder.close()
+
+    assert recorder.written == 3
+    for frame in sink.frames:
+        np.testing.assert_array_equal(frame, expected)